@@ -0,0 +1,137 @@
+"""Batch-size autotuning for the upstream ``model`` calls made by ``rtwt``.
+
+The best ``BATCH_SIZE`` depends on the mesh, the domain and the memory the
+upstream model has on its GPU, so a single client-side constant is either
+slow or out of memory somewhere.  With ``RTWT_AUTOTUNE=1`` the model runs a
+short calibration :func:`sweep` the first time it sees a (model tag,
+domain) pair without a client ``BATCH_SIZE``: one upstream call per
+candidate batch size on the same sample of points, smallest first, stopping
+at the first candidate that fails or leaves too little device memory free.
+:func:`select_batch_size` then picks the fastest candidate, and
+:class:`BatchSizeProfiles` persists the choice so later requests (and
+restarts) reuse it.
+
+The sweep only needs an awaitable ``run(batch_size)``, so it can be driven
+by a stand-in upstream model; ``aeronim/tools/autotune_batch_size.py`` does
+that to exercise the selection without a GPU.  This module has no Triton or
+Warp dependency for the same reason.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+DEFAULT_CANDIDATES = (16_000, 32_000, 64_000, 128_000, 256_000, 512_000)
+# Candidates within this fraction of the best throughput count as equally
+# fast; the smallest of them wins because it needs the least memory.
+_THROUGHPUT_TOLERANCE = 0.05
+_PROFILE_VERSION = 1
+
+
+def profile_key(model_tag: str, domain: str) -> str:
+    """Return the profile key for *model_tag* on the *domain* grid (see ``metrics.domain_label``)."""
+    return f"{model_tag}@{domain}"
+
+
+async def sweep(
+    run: Callable[[int], Awaitable[None]],
+    candidates: list[int],
+    num_points: int,
+    fits: Callable[[], bool] | None = None,
+) -> list[tuple[int, float | None]]:
+    """Time ``await run(batch_size)`` for each candidate, smallest first.
+
+    Every call must evaluate the same *num_points* points.  The smallest
+    candidate is run once untimed first, so one-off start-up costs do not
+    count against it; a failure there is re-raised, as it is not a memory
+    limit.  A later failure, or *fits* returning ``False`` after a call,
+    marks that candidate as not fitting and ends the sweep, since larger
+    batches need more memory.  Returns ``(batch_size, points_per_second)``
+    pairs, with ``None`` throughput for the candidate that did not fit.
+    """
+    candidates = sorted({int(c) for c in candidates if int(c) > 0})
+    if not candidates:
+        return []
+    await run(candidates[0])
+
+    trials: list[tuple[int, float | None]] = []
+    for batch_size in candidates:
+        start = time.perf_counter()
+        try:
+            await run(batch_size)
+        except Exception:
+            trials.append((batch_size, None))
+            break
+        elapsed = time.perf_counter() - start
+        if fits is not None and not fits():
+            trials.append((batch_size, None))
+            break
+        trials.append((batch_size, num_points / max(elapsed, 1e-9)))
+    return trials
+
+
+def select_batch_size(trials: list[tuple[int, float | None]]) -> int | None:
+    """Return the smallest batch size within ``_THROUGHPUT_TOLERANCE`` of the best throughput.
+
+    Returns ``None`` if no candidate fit.
+    """
+    fitting = [(batch_size, throughput) for batch_size, throughput in trials if throughput is not None]
+    if not fitting:
+        return None
+    best = max(throughput for _batch_size, throughput in fitting)
+    return min(batch_size for batch_size, throughput in fitting if throughput >= best * (1.0 - _THROUGHPUT_TOLERANCE))
+
+
+class BatchSizeProfiles:
+    """Tuned batch sizes by :func:`profile_key`, persisted as JSON at *path*.
+
+    Without a *path* profiles only live as long as the model instance.  The
+    file is rewritten atomically on every update, merged with the profiles
+    other model instances have written to it since; an unreadable or
+    incompatible file is ignored and replaced on the next update.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self._path = path
+        self._profiles: dict[str, dict] = {} if path is None else self._read(path)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _read(path: Path) -> dict[str, dict]:
+        if not path.is_file():
+            return {}
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != _PROFILE_VERSION:
+            return {}
+        return data.get("profiles", {})
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def get(self, key: str) -> int | None:
+        """Return the tuned batch size for *key*, or ``None`` if it has not been tuned."""
+        profile = self._profiles.get(key)
+        return None if profile is None else int(profile["batch_size"])
+
+    def put(self, key: str, batch_size: int, trials: list[tuple[int, float | None]]) -> None:
+        """Record *batch_size* (chosen from *trials*) for *key* and persist all profiles."""
+        with self._lock:
+            self._profiles[key] = {
+                "batch_size": int(batch_size),
+                "trials": [[int(b), None if t is None else round(t, 1)] for b, t in trials],
+                "tuned": datetime.now(timezone.utc).isoformat(),
+            }
+            if self._path is None:
+                return
+            self._profiles = {**self._read(self._path), **self._profiles}
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"version": _PROFILE_VERSION, "profiles": self._profiles}, indent=2))
+            tmp.replace(self._path)
@@ -0,0 +1,178 @@
+"""Thread-safe caches used by the ``rtwt`` model for parsed parameters, results and other reusable state."""
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .logging import get_logger
+
+logger = get_logger()
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by entry count and/or total size in bytes.
+
+    *sizeof* returns the size of a value in bytes and is only consulted when
+    *max_bytes* is set.  *on_evict* is called with ``(key, value)`` for every
+    entry pushed out by the budget, outside the internal lock.  ``hits`` /
+    ``misses`` count ``get`` outcomes so callers can log cache effectiveness.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Any], int] | None = None,
+        on_evict: Callable[[Hashable, Any], None] | None = None,
+    ):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda _value: 0)
+        self._on_evict = on_evict
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the cached values as reported by *sizeof*."""
+        return self._nbytes
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the value for *key* (marking it most recently used), or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or replace *key*, evicting least recently used entries to stay within budget."""
+        size = self._sizeof(value) if self._max_bytes is not None else 0
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._nbytes += size
+            while self._entries and self._over_budget():
+                evicted_key, (evicted_value, evicted_size) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_size
+                evicted.append((evicted_key, evicted_value))
+        if self._on_evict is not None:
+            for evicted_key, evicted_value in evicted:
+                self._on_evict(evicted_key, evicted_value)
+
+    def stats(self) -> str:
+        """Return a short human-readable summary for logging."""
+        return f"{self.hits} hits / {self.misses} misses, {len(self._entries)} entries"
+
+    def _over_budget(self) -> bool:
+        if self._max_entries is not None and len(self._entries) > self._max_entries:
+            return True
+        return self._max_bytes is not None and self._nbytes > self._max_bytes
+
+
+class ResultCache:
+    """Byte-budgeted in-memory LRU of response buffers that spills evictions to disk.
+
+    Entries map output names to NumPy arrays.  When *spill_dir* is set,
+    entries evicted from memory are written there as uncompressed ``.npz``
+    files; a memory miss falls back to the spill directory and promotes the
+    entry back into memory.  The spill directory is itself kept under
+    *max_spill_bytes* by deleting the least recently used files.
+    """
+
+    def __init__(self, max_bytes: int, spill_dir: Path | None = None, max_spill_bytes: int = 0):
+        self._memory = LRUCache(
+            max_bytes=max_bytes,
+            sizeof=lambda buffers: sum(array.nbytes for array in buffers.values()),
+            on_evict=self._spill,
+        )
+        self._spill_dir = spill_dir
+        self._max_spill_bytes = max_spill_bytes
+        self._spill_lock = threading.Lock()
+        if self._spill_dir is not None:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+        self.disk_hits = 0
+
+    def get(self, key: str) -> dict[str, np.ndarray] | None:
+        """Return the cached buffers for *key* from memory or the spill directory, or ``None``."""
+        buffers = self._memory.get(key)
+        if buffers is not None or self._spill_dir is None:
+            return buffers
+
+        path = self._spill_path(key)
+        try:
+            with np.load(path) as npz:
+                buffers = {name: npz[name] for name in npz.files}
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable result cache entry {path}: {exc}")
+            return None
+        self.disk_hits += 1
+        self._memory.put(key, buffers)
+        return buffers
+
+    def put(self, key: str, buffers: dict[str, np.ndarray]) -> None:
+        """Store *buffers* under *key* in the in-memory tier."""
+        self._memory.put(key, buffers)
+
+    def stats(self) -> str:
+        """Return a short human-readable summary for logging."""
+        return (
+            f"{self._memory.stats()} ({self._memory.nbytes / (1024 * 1024):,.1f} MB), "
+            f"{self.disk_hits} disk hits"
+        )
+
+    def _spill_path(self, key: str) -> Path:
+        assert self._spill_dir is not None
+        return self._spill_dir / f"{key}.npz"
+
+    def _spill(self, key: str, buffers: dict[str, np.ndarray]) -> None:
+        if self._spill_dir is None:
+            return
+        path = self._spill_path(key)
+        with self._spill_lock:
+            try:
+                if not path.exists():
+                    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                    with tmp.open("wb") as f:
+                        np.savez(f, **buffers)
+                    tmp.replace(path)
+                self._trim_spill_dir()
+            except OSError as exc:
+                logger.warning(f"Failed to spill result cache entry {path}: {exc}")
+
+    def _trim_spill_dir(self) -> None:
+        entries = []
+        for path in self._spill_dir.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self._max_spill_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
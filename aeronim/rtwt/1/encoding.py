@@ -0,0 +1,91 @@
+"""Reduced-precision payloads for the ``rtwt`` NanoVDB outputs.
+
+With the default ``float32`` precision every ``nvdb_*`` output is a
+serialised NanoVDB grid.  The reduced precisions instead return the dense
+voxel values in a compact form, prefixed with a fixed header describing the
+grid, and the client rebuilds the NanoVDB grid locally:
+
+* ``float16``     — IEEE half floats.
+* ``quantized16`` — unsigned 16-bit fixed point, ``value = q * scale + offset``
+  with one scale / offset per grid.
+
+Header layout (little endian): magic ``RTWTENC1``, precision code (``u8``),
+component count (``u8``), two padding bytes, ``dims`` (``3 x i32``), IJK
+``origin`` (``3 x i32``), ``voxel_size`` (``3 x f32``), ``scale`` and
+``offset`` (``f32``).  The Kit extension ``omni.rtwt.inference`` carries a
+mirror of the decoder; keep the two in sync.
+"""
+
+import struct
+
+import numpy as np
+
+PRECISIONS = ("float32", "float16", "quantized16")
+
+_MAGIC = b"RTWTENC1"
+_HEADER = struct.Struct("<8sBB2x3i3i3fff")
+_PRECISION_CODES = {"float16": 1, "quantized16": 2}
+_QUANTIZED_MAX = np.iinfo(np.uint16).max
+
+
+def is_encoded(buffer: np.ndarray) -> bool:
+    """Return ``True`` if *buffer* is a reduced-precision payload rather than a NanoVDB grid."""
+    return buffer.size >= _HEADER.size and buffer[: len(_MAGIC)].tobytes() == _MAGIC
+
+
+def encode_dense(
+    values: np.ndarray, precision: str, dims: tuple[int, int, int], origin: tuple[int, int, int], voxel_size
+) -> np.ndarray:
+    """Encode dense ``float32`` *values* (``(N,)`` or ``(N, 3)``) as a ``uint8`` payload."""
+    values = np.asarray(values, dtype=np.float32)
+    components = 3 if values.ndim == 2 and values.shape[1] == 3 else 1
+    scale, offset = 1.0, 0.0
+    if precision == "float16":
+        payload = values.astype(np.float16)
+    elif precision == "quantized16":
+        lo = float(values.min()) if values.size else 0.0
+        hi = float(values.max()) if values.size else 0.0
+        scale = (hi - lo) / _QUANTIZED_MAX if hi > lo else 1.0
+        offset = lo
+        payload = np.rint((values - np.float32(offset)) / np.float32(scale)).astype(np.uint16)
+    else:
+        raise ValueError(f"Unsupported reduced precision '{precision}'; expected one of {PRECISIONS[1:]}")
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _PRECISION_CODES[precision],
+        components,
+        *(int(v) for v in dims),
+        *(int(v) for v in origin),
+        *(float(v) for v in voxel_size),
+        scale,
+        offset,
+    )
+    out = np.empty(_HEADER.size + payload.nbytes, dtype=np.uint8)
+    out[: _HEADER.size] = np.frombuffer(header, dtype=np.uint8)
+    out[_HEADER.size :] = payload.reshape(-1).view(np.uint8)
+    return out
+
+
+def decode_dense(buffer: np.ndarray) -> tuple[np.ndarray, tuple, tuple, tuple]:
+    """Decode a payload produced by :func:`encode_dense`.
+
+    Returns ``(values, dims, origin, voxel_size)`` with *values* as
+    ``float32`` of shape ``(N,)`` or ``(N, 3)``.
+    """
+    buffer = np.ascontiguousarray(buffer).view(np.uint8).reshape(-1)
+    magic, code, components, *rest = _HEADER.unpack_from(buffer[: _HEADER.size].tobytes())
+    if magic != _MAGIC:
+        raise ValueError("Not a reduced-precision rtwt payload")
+    dims, origin, voxel_size, (scale, offset) = tuple(rest[0:3]), tuple(rest[3:6]), tuple(rest[6:9]), rest[9:11]
+
+    data = buffer[_HEADER.size :]
+    if code == _PRECISION_CODES["float16"]:
+        values = data.view(np.float16).astype(np.float32)
+    elif code == _PRECISION_CODES["quantized16"]:
+        values = data.view(np.uint16).astype(np.float32) * np.float32(scale) + np.float32(offset)
+    else:
+        raise ValueError(f"Unknown rtwt payload precision code {code}")
+    if components > 1:
+        values = values.reshape(-1, components)
+    return values, dims, origin, voxel_size
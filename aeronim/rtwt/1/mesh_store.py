@@ -0,0 +1,162 @@
+"""Precomputed, memory-mappable mesh tensors for the ``rtwt`` model.
+
+``aeronim/tools/build_mesh_store.py`` converts every surface mesh under the
+model root into one binary bundle holding the five tensors the upstream
+model needs (``vertices``, ``faces``, ``centers``, ``surface_normals``,
+``surface_areas``) plus the SHA-256 of the source file, and writes an
+``index.json`` mapping model tags to bundles.  The model then maps bundles
+with ``np.memmap`` instead of parsing meshes with trimesh, so cold starts are
+cheap and every model instance shares the same pages through the OS page
+cache.
+
+Bundle layout: a fixed header (magic ``RTWTMESH`` followed by the ASCII hex
+SHA-256 of the source mesh), then each tensor at the offset recorded in the
+index, aligned to ``_ALIGNMENT`` bytes.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .logging import get_logger
+
+logger = get_logger()
+
+INDEX_NAME = "index.json"
+TENSOR_NAMES = ("vertices", "faces", "centers", "surface_normals", "surface_areas")
+
+_MAGIC = b"RTWTMESH"
+_HEADER_SIZE = 128
+_ALIGNMENT = 64
+_INDEX_VERSION = 1
+
+
+def file_sha256(path: Path) -> str:
+    """Return the SHA-256 hex digest of the file at *path*."""
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def compute_mesh_tensors(mesh_path: Path) -> dict[str, np.ndarray]:
+    """Load *mesh_path* with trimesh and derive the tensors the upstream model expects."""
+    import trimesh
+
+    mesh = trimesh.load_mesh(str(mesh_path), process=False)
+    return {
+        "vertices": np.asarray(mesh.vertices, dtype=np.float32),
+        "faces": np.asarray(mesh.faces, dtype=np.int32),
+        "centers": np.asarray(mesh.triangles_center, dtype=np.float32),
+        "surface_normals": np.asarray(mesh.face_normals, dtype=np.float32),
+        "surface_areas": np.asarray(mesh.area_faces, dtype=np.float32),
+    }
+
+
+def write_bundle(path: Path, tensors: dict[str, np.ndarray], sha256: str) -> dict:
+    """Write *tensors* to a bundle at *path* and return its tensor layout for the index."""
+    layout = {}
+    offset = _HEADER_SIZE
+    for name in TENSOR_NAMES:
+        array = np.ascontiguousarray(tensors[name])
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        layout[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset += array.nbytes
+
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write((_MAGIC + sha256.encode("ascii")).ljust(_HEADER_SIZE, b"\0"))
+        for name in TENSOR_NAMES:
+            f.seek(layout[name]["offset"])
+            f.write(np.ascontiguousarray(tensors[name]).tobytes())
+    tmp.replace(path)
+    return layout
+
+
+def write_index(store_dir: Path, entries: dict[str, dict]) -> None:
+    """Write the ``index.json`` describing *entries* (model tag → bundle entry)."""
+    path = store_dir / INDEX_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": _INDEX_VERSION, "meshes": entries}, indent=2, sort_keys=True))
+    tmp.replace(path)
+
+
+class MeshStore:
+    """Read-only view of a mesh store directory produced by ``build_mesh_store.py``.
+
+    An entry is only served while the source mesh under *model_root* still
+    matches the size and mtime recorded when the bundle was built (or the
+    source is absent, for store-only deployments); otherwise the caller falls
+    back to loading the mesh itself.
+    """
+
+    def __init__(self, store_dir: Path, model_root: Path):
+        self._store_dir = store_dir
+        self._model_root = model_root
+        with (store_dir / INDEX_NAME).open() as f:
+            index = json.load(f)
+        if index.get("version") != _INDEX_VERSION:
+            raise ValueError(f"Unsupported mesh store version {index.get('version')} in {store_dir}")
+        self._entries: dict[str, dict] = index["meshes"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sha256(self, model_tag: str) -> str | None:
+        """Return the content hash recorded for *model_tag*, or ``None`` if it is not served by the store."""
+        entry = self._entry(model_tag)
+        return None if entry is None else entry["sha256"]
+
+    def open(self, model_tag: str) -> dict[str, np.ndarray] | None:
+        """Memory-map the bundle for *model_tag*, or return ``None`` if it is not served by the store."""
+        entry = self._entry(model_tag)
+        if entry is None:
+            return None
+        path = self._store_dir / entry["file"]
+        with path.open("rb") as f:
+            header = f.read(_HEADER_SIZE)
+        if header[: len(_MAGIC)] != _MAGIC or header[len(_MAGIC) :].rstrip(b"\0").decode("ascii") != entry["sha256"]:
+            logger.warning(f"Mesh bundle {path} does not match its index entry; ignoring it")
+            return None
+        return {
+            name: np.memmap(
+                path, dtype=np.dtype(spec["dtype"]), mode="r", offset=spec["offset"], shape=tuple(spec["shape"])
+            )
+            for name, spec in entry["tensors"].items()
+        }
+
+    def _entry(self, model_tag: str) -> dict | None:
+        entry = self._entries.get(Path(model_tag).as_posix())
+        if entry is None:
+            return None
+        try:
+            stat = (self._model_root / model_tag).stat()
+        except FileNotFoundError:
+            return entry
+        except OSError:
+            return None
+        if stat.st_size != entry["source_size"] or int(stat.st_mtime) != entry["source_mtime"]:
+            logger.warning(f"Mesh store entry for '{model_tag}' is stale; loading the mesh directly")
+            return None
+        return entry
+
+
+def build_entry(model_root: Path, mesh_path: Path, store_dir: Path) -> tuple[str, dict]:
+    """Write the bundle for *mesh_path* into *store_dir* and return ``(model_tag, index_entry)``."""
+    sha256 = file_sha256(mesh_path)
+    file_name = f"{sha256}.bin"
+    bundle_path = store_dir / file_name
+    tensors = compute_mesh_tensors(mesh_path)
+    layout = write_bundle(bundle_path, tensors, sha256)
+    stat = os.stat(mesh_path)
+    return mesh_path.relative_to(model_root).as_posix(), {
+        "file": file_name,
+        "sha256": sha256,
+        "source_size": stat.st_size,
+        "source_mtime": int(stat.st_mtime),
+        "tensors": layout,
+    }
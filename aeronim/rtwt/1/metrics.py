@@ -0,0 +1,185 @@
+"""Per-stage Prometheus metrics for the ``rtwt`` model.
+
+Metrics are registered through ``pb_utils.MetricFamily`` so they are served
+by Triton's own metrics endpoint (``:8002/metrics``) next to the built-in
+inference metrics.  Stage timings are histograms labelled by ``stage``,
+``model_tag`` and ``domain`` (the IJK voxel dimensions, e.g. ``301x81x71``),
+so p95 regressions can be alerted on per mesh and resolution:
+
+* ``rtwt_stage_duration_seconds`` — ``usd_parse``, ``mesh_load``,
+  ``occupancy`` (interior mask, when culling), ``point_cloud``,
+  ``upstream``, ``upstream_wait`` (time queued for an upstream slot),
+  ``upstream_surface`` (surface outputs) and one stage per encoded grid
+  (``nvdb_velocity``, ``nvdb_velocity_magnitude``, ``nvdb_pressure``).  Slab
+  stages are summed per request; progressive previews carry a
+  ``/<factor>`` domain suffix.
+* ``rtwt_request_duration_seconds`` — end-to-end time per request.
+* ``rtwt_response_bytes`` — total size of the returned buffers.
+* ``rtwt_requests_total`` — requests by ``outcome`` (``computed``,
+  ``cache_hit``, ``expired``, ``cancelled``, ``rejected``, ``error``).
+* ``rtwt_coalesced_requests_total`` — requests that awaited a computation
+  already in flight for the same configuration instead of repeating it.
+* ``rtwt_queue_depth`` / ``rtwt_queue_wait_seconds`` — requests waiting for
+  a scheduler slot and how long they waited, by ``priority``;
+  ``rtwt_active_computations`` — computations holding a slot
+  (``rtwt_progressive`` only).
+* ``rtwt_mesh_cache_entries`` / ``rtwt_mesh_cache_bytes`` — mesh cache size.
+* ``rtwt_warp_device_memory_bytes`` — memory in use on the Warp device.
+
+``RTWT_METRICS=0`` disables registration; every method is then a no-op.
+"""
+
+import threading
+
+import triton_python_backend_utils as pb_utils
+import warp as wp
+
+from .logging import get_logger
+
+logger = get_logger()
+
+_DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0]
+_BYTES_BUCKETS = [float(1024**2 * 2**n) for n in range(0, 12)]  # 1 MiB .. 2 GiB
+
+
+def domain_label(dims) -> str:
+    """Return the ``domain`` label for a grid of *dims* voxels, e.g. ``301x81x71``."""
+    return "x".join(str(int(n)) for n in dims)
+
+
+class RtwtMetrics:
+    """Registers the ``rtwt`` metric families and records observations into them.
+
+    Metric instances are created lazily per label set and reused, as Triton
+    expects.  All methods are safe to call from the worker pool.
+    """
+
+    def __init__(self, model_name: str, enabled: bool = True):
+        self._model_name = model_name
+        self._metrics: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        self.enabled = False
+        if not enabled:
+            return
+        try:
+            self._stage_duration = pb_utils.MetricFamily(
+                name="rtwt_stage_duration_seconds",
+                description="Duration of each rtwt pipeline stage",
+                kind=pb_utils.MetricFamily.HISTOGRAM,
+            )
+            self._request_duration = pb_utils.MetricFamily(
+                name="rtwt_request_duration_seconds",
+                description="End-to-end duration of rtwt requests",
+                kind=pb_utils.MetricFamily.HISTOGRAM,
+            )
+            self._response_bytes = pb_utils.MetricFamily(
+                name="rtwt_response_bytes",
+                description="Total size of the buffers returned per rtwt response",
+                kind=pb_utils.MetricFamily.HISTOGRAM,
+            )
+            self._requests = pb_utils.MetricFamily(
+                name="rtwt_requests_total",
+                description="rtwt requests by outcome",
+                kind=pb_utils.MetricFamily.COUNTER,
+            )
+            self._coalesced = pb_utils.MetricFamily(
+                name="rtwt_coalesced_requests_total",
+                description="rtwt requests served by a computation already in flight",
+                kind=pb_utils.MetricFamily.COUNTER,
+            )
+            self._mesh_cache_entries = pb_utils.MetricFamily(
+                name="rtwt_mesh_cache_entries",
+                description="Surface meshes held in the rtwt mesh cache",
+                kind=pb_utils.MetricFamily.GAUGE,
+            )
+            self._mesh_cache_bytes = pb_utils.MetricFamily(
+                name="rtwt_mesh_cache_bytes",
+                description="Bytes of surface-mesh tensors held in the rtwt mesh cache",
+                kind=pb_utils.MetricFamily.GAUGE,
+            )
+            self._queue_depth = pb_utils.MetricFamily(
+                name="rtwt_queue_depth",
+                description="rtwt requests waiting for a scheduler slot",
+                kind=pb_utils.MetricFamily.GAUGE,
+            )
+            self._queue_wait = pb_utils.MetricFamily(
+                name="rtwt_queue_wait_seconds",
+                description="Time rtwt requests waited for a scheduler slot",
+                kind=pb_utils.MetricFamily.HISTOGRAM,
+            )
+            self._active_computations = pb_utils.MetricFamily(
+                name="rtwt_active_computations",
+                description="rtwt computations holding a scheduler slot",
+                kind=pb_utils.MetricFamily.GAUGE,
+            )
+            self._warp_memory = pb_utils.MetricFamily(
+                name="rtwt_warp_device_memory_bytes",
+                description="Memory in use on the Warp device used for NanoVDB conversion",
+                kind=pb_utils.MetricFamily.GAUGE,
+            )
+        except Exception as exc:
+            logger.warning(f"Prometheus metrics unavailable ({exc}); continuing without them")
+            return
+        self.enabled = True
+
+    def observe_stage(self, stage: str, seconds: float, model_tag: str, domain: str) -> None:
+        """Record one *stage* duration for *model_tag* on the *domain* grid."""
+        if self.enabled:
+            labels = {"stage": stage, "model_tag": model_tag, "domain": domain}
+            self._metric(self._stage_duration, labels, _DURATION_BUCKETS).observe(seconds)
+
+    def observe_request(self, outcome: str, seconds: float, model_tag: str, domain: str, nbytes: int = 0) -> None:
+        """Count a finished request and record its duration and (for successes) response size."""
+        if not self.enabled:
+            return
+        labels = {"model_tag": model_tag, "domain": domain}
+        self._metric(self._requests, {**labels, "outcome": outcome}).increment(1)
+        self._metric(self._request_duration, {**labels, "outcome": outcome}, _DURATION_BUCKETS).observe(seconds)
+        if nbytes:
+            self._metric(self._response_bytes, labels, _BYTES_BUCKETS).observe(float(nbytes))
+
+    def count_coalesced(self) -> None:
+        """Count a request coalesced onto a computation already in flight."""
+        if self.enabled:
+            self._metric(self._coalesced, {}).increment(1)
+
+    def update_mesh_cache(self, entries: int, nbytes: int) -> None:
+        """Publish the current mesh cache size."""
+        if self.enabled:
+            self._metric(self._mesh_cache_entries, {}).set(float(entries))
+            self._metric(self._mesh_cache_bytes, {}).set(float(nbytes))
+
+    def update_scheduler(self, queue_depths: dict[str, int], active: int) -> None:
+        """Publish the scheduler queue depth per priority and the number of active computations."""
+        if self.enabled:
+            for priority, depth in queue_depths.items():
+                self._metric(self._queue_depth, {"priority": priority}).set(float(depth))
+            self._metric(self._active_computations, {}).set(float(active))
+
+    def observe_queue_wait(self, priority: str, seconds: float) -> None:
+        """Record how long a request of *priority* waited for a scheduler slot."""
+        if self.enabled:
+            self._metric(self._queue_wait, {"priority": priority}, _DURATION_BUCKETS).observe(seconds)
+
+    def update_warp_memory(self, device: str) -> None:
+        """Publish the memory in use on *device* (CUDA only; CPU devices are skipped)."""
+        if not self.enabled:
+            return
+        warp_device = wp.get_device(device)
+        if warp_device.is_cuda:
+            used = warp_device.total_memory - warp_device.free_memory
+            self._metric(self._warp_memory, {"device": str(warp_device)}).set(float(used))
+
+    def _metric(self, family, labels: dict[str, str], buckets: list[float] | None = None):
+        key = (id(family), tuple(sorted(labels.items())))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                labels = {"model": self._model_name, **labels}
+                if buckets is None:
+                    metric = family.Metric(labels=labels)
+                else:
+                    metric = family.Metric(labels=labels, buckets=buckets)
+                self._metrics[key] = metric
+        return metric
+
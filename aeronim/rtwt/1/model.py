@@ -1,39 +1,188 @@
 """Triton Python backend model for the RTWT (Real-Time Wind Tunnel) inference pipeline.
 
-Each Triton request supplies a serialised USD layer that describes the simulation
-state (mesh selection, domain extents, stream velocity).  This model:
-
-1. Parses the USD layer to extract inference parameters.
-2. Loads (and caches) the corresponding surface mesh.
-3. Builds a structured point-cloud over the volumetric domain.
-4. Forwards the geometry and parameters to the upstream "model" Triton ensemble.
-5. Converts the raw velocity / pressure outputs into NanoVDB GPU buffers and
-   returns them alongside the domain extents.
+Each Triton request supplies either a serialised USD layer that describes the
+simulation state (mesh selection, domain extents, stream velocity) or the same
+parameters as typed input tensors.  This model:
+
+1. Parses the USD layer to extract inference parameters (skipped when the
+   parameters are supplied directly).
+2. Loads (and caches) the corresponding surface mesh, memory-mapping it from
+   the precomputed mesh store when available.
+3. Streams a structured point-cloud over the volumetric domain in IJK slabs,
+   forwarding each slab with the geometry and parameters to the upstream
+   "model" Triton ensemble and gathering the results into preallocated buffers.
+4. Uploads the raw velocity / pressure outputs to the Warp device once,
+   derives the velocity magnitude there, converts the requested fields into
+   NanoVDB buffers and returns them alongside the domain extents.
+
+Final NanoVDB buffers are kept in a byte-budgeted result cache (optionally
+spilling to disk) so a repeated configuration is served without touching the
+upstream model or Warp.
+
+The same code also serves the decoupled ``rtwt_progressive`` model, which
+streams coarse previews of a request before its full-resolution result.
+
+Requests handed to one ``execute`` call are processed concurrently: CPU-heavy
+stages (USD parsing, mesh loading, slab generation, NanoVDB encoding) run on a
+bounded thread pool so that one request's upstream wait overlaps another's
+pre/post-processing.  Triton runs the ``execute`` coroutines of the decoupled
+``rtwt_progressive`` side by side.  It waits for a non-decoupled model's
+``execute`` to return before calling it again, so ``rtwt`` overlaps
+concurrent requests across its instances (``instance_group`` in its
+config) instead; each instance is a separate process with its own pool and
+caches.  ``rtwt`` cannot be made decoupled, because the HTTP endpoint Kit
+uses by default does not serve decoupled models, and batching would add a
+batch dimension to every input.
 """
 
+import asyncio
+import contextlib
+import functools
+import hashlib
+import json
+import math
 import os
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import dav
 import numpy as np
-import trimesh
 import triton_python_backend_utils as pb_utils
 import warp as wp
 from pxr import Gf, Sdf, Usd
 
+from .autotune import DEFAULT_CANDIDATES, BatchSizeProfiles, profile_key, select_batch_size, sweep
+from .cache import LRUCache, ResultCache
+from .encoding import PRECISIONS, encode_dense
 from .logging import get_logger, setup_logger
+from .mesh_store import MeshStore, compute_mesh_tensors, file_sha256
+from .metrics import RtwtMetrics, domain_label
+from .occupancy import interior_mask
+from .outputs import NANOVDB_OUTPUTS, SURFACE_OUTPUTS, check_upstream_config, select_outputs
+from .scheduler import DEFAULT_CLIENT_ID, PRIORITIES, FairScheduler, SchedulerSaturated
+from .sparse import to_sparse_nanovdb_buffer
 
 logger = get_logger()
 
-_UPSTREAM_OUTPUTS = ["velocity", "pressure", "ERROR_MESSAGE"]
-_NANOVDB_OUTPUTS = {
-    "velocity": "nvdb_velocity",
-    "velocity_magnitude": "nvdb_velocity_magnitude",
-    "pressure": "nvdb_pressure",
+# Each upstream call receives at most BATCH_SIZE * RTWT_CHUNK_BATCHES points;
+# 0 disables chunking and sends the whole domain in one call.
+_DEFAULT_CHUNK_BATCHES = 16
+_DEFAULT_CPU_WORKERS = 4
+_DEFAULT_MAX_INFLIGHT_UPSTREAM = 2
+# Scheduler limits: concurrent computations (overall and per CLIENT_ID) and
+# queued requests (of a priority or higher, and per CLIENT_ID).
+_DEFAULT_MAX_ACTIVE_REQUESTS = 4
+_DEFAULT_CLIENT_MAX_ACTIVE_REQUESTS = 2
+_DEFAULT_MAX_QUEUED_REQUESTS = 64
+_DEFAULT_CLIENT_MAX_QUEUED_REQUESTS = 16
+_DEFAULT_PARAM_CACHE_SIZE = 64
+_DEFAULT_RESULT_CACHE_BYTES = 2 * 1024**3
+_DEFAULT_RESULT_CACHE_DIR_BYTES = 20 * 1024**3
+_DEFAULT_MESH_CACHE_BYTES = 1024**3
+# Upstream batch size used when the client sends no BATCH_SIZE and no tuned
+# profile exists for the (model tag, domain) pair.
+_DEFAULT_BATCH_SIZE = 128_000
+# Calibration stops once less than this much memory is free on the Warp device.
+_DEFAULT_AUTOTUNE_MIN_FREE_BYTES = 1024**3
+_DEFAULT_OCCUPANCY_CACHE_BYTES = 512 * 1024**2
+# Warm-up converts a sub-domain of at most this many voxels per axis and sends
+# at most this many points upstream, so it stays cheap for the finest presets.
+_WARMUP_MAX_DIM = 16
+_WARMUP_POINTS = 1024
+# Voxel layers inferred in slice-plane mode when SLICE_THICKNESS is absent; two
+# layers bracket the plane so trilinear sampling on it stays inside the slab.
+_DEFAULT_SLICE_THICKNESS = 2
+# Air density used to turn the sparse tolerance into a pressure tolerance
+# relative to the freestream dynamic pressure q = 0.5 * rho * U^2.
+_AIR_DENSITY = 1.225
+# Upstream field each NanoVDB output is derived from.
+_UPSTREAM_FIELDS = {
+    "nvdb_velocity": "velocity",
+    "nvdb_velocity_magnitude": "velocity",
+    "nvdb_pressure": "pressure",
 }
 
 
+class UpstreamModelError(RuntimeError):
+    """Raised when the upstream ``model`` reports an error through ``ERROR_MESSAGE``."""
+
+
+class DeadlineExceeded(RuntimeError):
+    """Raised when a request's ``DEADLINE_MS`` passes before its work is done."""
+
+
+class RequestCancelled(DeadlineExceeded):
+    """Raised when the client cancels a request before its work is done."""
+
+
+class _Deadline:
+    """When a request's work stops being wanted: its ``DEADLINE_MS`` passes or its client cancels it.
+
+    Triton reports cancellation for gRPC requests (a cancelled call or
+    stream); HTTP has no cancellation, so only the timestamp applies there.
+    """
+
+    __slots__ = ("timestamp", "_request")
+
+    def __init__(self, timestamp: float | None, request=None):
+        self.timestamp = timestamp
+        self._request = request
+
+    def check(self, stage: str) -> None:
+        """Raise ``RequestCancelled`` or ``DeadlineExceeded`` if the work from *stage* on is no longer wanted."""
+        if self._request is not None and self._request.is_cancelled():
+            raise RequestCancelled(f"Request cancelled by the client before {stage}; request abandoned")
+        if self.timestamp is not None and (late := time.time() - self.timestamp) > 0.0:
+            raise DeadlineExceeded(f"Deadline exceeded by {late:.1f} s before {stage}; request abandoned")
+
+
+class _Flight:
+    """A computation in flight under a single-flight key (see ``TritonPythonModel._single_flight``).
+
+    Holds the future of its result and the previews published so far, which
+    are replayed to every listener that joins later.  A listener that raises
+    (e.g. because its client has gone) is dropped; the others still receive
+    the previews.
+    """
+
+    __slots__ = ("future", "previews", "listeners")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.previews: list[tuple[int, dict[str, np.ndarray]]] = []
+        self.listeners: list = []
+
+    def subscribe(self, listener) -> None:
+        """Replay the previews so far to *listener* and send it every later one."""
+        for preview in self.previews:
+            if not self._send(listener, *preview):
+                return
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener) -> None:
+        """Stop sending previews to *listener*."""
+        with contextlib.suppress(ValueError):
+            self.listeners.remove(listener)
+
+    def publish(self, refinement_factor: int, buffers: dict[str, np.ndarray]) -> None:
+        """Send a preview to every listener and keep it for those that join later."""
+        self.previews.append((refinement_factor, buffers))
+        for listener in list(self.listeners):
+            if not self._send(listener, refinement_factor, buffers):
+                self.listeners.remove(listener)
+
+    @staticmethod
+    def _send(listener, refinement_factor: int, buffers: dict[str, np.ndarray]) -> bool:
+        try:
+            listener(refinement_factor, buffers)
+        except Exception as exc:
+            logger.warning(f"Failed to send a factor {refinement_factor} preview; sending no more to it: {exc}")
+            return False
+        return True
+
+
 def _extract_int(request, name: str) -> int:
     """Return the first element of a named input tensor as a Python int."""
     tensor = pb_utils.get_input_tensor_by_name(request, name)
@@ -46,41 +195,414 @@ def _extract_str(request, name: str) -> str:
     return tensor.as_numpy().ravel()[0].decode("utf-8")
 
 
+def _extract_optional(request, name: str) -> np.ndarray | None:
+    """Return a named input tensor as a flat NumPy array, or ``None`` if it was not supplied."""
+    tensor = pb_utils.get_input_tensor_by_name(request, name)
+    return None if tensor is None else tensor.as_numpy().ravel()
+
+
+def _extract_deadline(request) -> _Deadline:
+    """Return the ``_Deadline`` of *request*: its ``DEADLINE_MS``, if any, and its cancellation."""
+    deadline_ms = _extract_optional(request, "DEADLINE_MS")
+    return _Deadline(None if deadline_ms is None else int(deadline_ms[0]) / 1000.0, request)
+
+
+def _extract_client(request) -> tuple[str, str]:
+    """Return the request's ``(CLIENT_ID, PRIORITY)``, defaulting to an anonymous interactive client."""
+    client_id = _extract_optional(request, "CLIENT_ID")
+    priority = _extract_optional(request, "PRIORITY")
+    return (
+        DEFAULT_CLIENT_ID if client_id is None else client_id[0].decode("utf-8") or DEFAULT_CLIENT_ID,
+        PRIORITIES[0] if priority is None else priority[0].decode("utf-8"),
+    )
+
+
+def _check_deadline(deadline: _Deadline | None, stage: str) -> None:
+    """Raise ``DeadlineExceeded`` (or ``RequestCancelled``) if *deadline* says to abandon the work before *stage*."""
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def _extract_direct_params(request) -> tuple[float, str, np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None:
+    """Return the parameter-only fast-path inputs, or ``None`` if ``STREAM_VELOCITY`` is absent.
+
+    When present, ``MODEL_TAG``, ``DOMAIN_ORIGIN``, ``DOMAIN_SPACING``,
+    ``DOMAIN_EXTENT_MIN`` and ``DOMAIN_EXTENT_MAX`` are required too; the
+    tuple matches ``TritonPythonModel._extract_params_from_stage``.
+    """
+    stream_velocity = _extract_optional(request, "STREAM_VELOCITY")
+    if stream_velocity is None:
+        return None
+
+    arrays = {
+        name: _extract_optional(request, name)
+        for name in ("DOMAIN_ORIGIN", "DOMAIN_SPACING", "DOMAIN_EXTENT_MIN", "DOMAIN_EXTENT_MAX")
+    }
+    missing = [name for name, value in arrays.items() if value is None]
+    if _extract_optional(request, "MODEL_TAG") is None:
+        missing.insert(0, "MODEL_TAG")
+    if missing:
+        raise ValueError(f"STREAM_VELOCITY supplied without required inputs: {', '.join(missing)}")
+
+    return (
+        float(stream_velocity[0]),
+        _extract_str(request, "MODEL_TAG"),
+        arrays["DOMAIN_ORIGIN"].astype(np.float32, copy=False),
+        arrays["DOMAIN_SPACING"].astype(np.float32, copy=False),
+        arrays["DOMAIN_EXTENT_MIN"].astype(np.int32, copy=False),
+        arrays["DOMAIN_EXTENT_MAX"].astype(np.int32, copy=False),
+    )
+
+
+def _extract_slice(request) -> tuple[int, float, int] | None:
+    """Return ``(axis, position, thickness)`` for a slice-plane request, or ``None`` if ``SLICE_AXIS`` is absent."""
+    axis = _extract_optional(request, "SLICE_AXIS")
+    if axis is None:
+        return None
+    position = _extract_optional(request, "SLICE_POSITION")
+    if position is None:
+        raise ValueError("SLICE_AXIS supplied without required input SLICE_POSITION")
+    thickness = _extract_optional(request, "SLICE_THICKNESS")
+    thickness = _DEFAULT_SLICE_THICKNESS if thickness is None else int(thickness[0])
+    if int(axis[0]) not in (0, 1, 2):
+        raise ValueError(f"SLICE_AXIS must be 0, 1 or 2, got {int(axis[0])}")
+    if thickness < 1:
+        raise ValueError(f"SLICE_THICKNESS must be at least 1, got {thickness}")
+    return int(axis[0]), float(position[0]), thickness
+
+
+def _slice_params(params: tuple, axis: int, position: float, thickness: int) -> tuple:
+    """Restrict the domain of *params* to *thickness* voxel layers around a plane.
+
+    The plane lies at world coordinate *position* along *axis*.  The slab
+    starts at the layer at or below the plane (the nearest one for a single
+    layer), is centred on it as far as the thickness allows, and is clamped
+    to the original extents.  Returns a new parameter tuple; *params* is not
+    modified.
+    """
+    stream_velocity, model_tag, origin, spacing, extent_min, extent_max = params
+    lower, upper = int(extent_min[axis]), int(extent_max[axis])
+    thickness = min(thickness, upper - lower + 1)
+    index = (position - float(origin[axis])) / float(spacing[axis])
+    first = (round(index) if thickness == 1 else math.floor(index)) - (thickness - 1) // 2
+    first = min(max(first, lower), upper - thickness + 1)
+
+    slice_min, slice_max = extent_min.copy(), extent_max.copy()
+    slice_min[axis] = first
+    slice_max[axis] = first + thickness - 1
+    return stream_velocity, model_tag, origin, spacing, slice_min, slice_max
+
+
+def _has_volume_outputs(requested_outputs: list[str]) -> bool:
+    """Return True if any of *requested_outputs* needs the volume (``nvdb_*``) pipeline."""
+    return any(name in NANOVDB_OUTPUTS.values() for name in requested_outputs)
+
+
+def _make_response(buffers: dict[str, np.ndarray], refinement_factor: int | None = None):
+    """Wrap output arrays (NanoVDB buffers and extents) in a successful ``InferenceResponse``.
+
+    *refinement_factor* is only set by the progressive (decoupled) variant,
+    whose config declares the ``REFINEMENT_FACTOR`` output.
+    """
+    outputs = [pb_utils.Tensor("ERROR_MESSAGE", np.array([""], dtype=np.object_))]
+    outputs.extend(pb_utils.Tensor(name, array) for name, array in buffers.items())
+    if refinement_factor is not None:
+        outputs.append(pb_utils.Tensor("REFINEMENT_FACTOR", np.array([refinement_factor], dtype=np.int32)))
+    return pb_utils.InferenceResponse(output_tensors=outputs)
+
+
+def _nbytes(buffers: dict[str, np.ndarray]) -> int:
+    """Return the total size of the output arrays in *buffers*."""
+    return sum(array.nbytes for array in buffers.values())
+
+
+def _metric_labels(params: tuple) -> tuple[str, str]:
+    """Return the ``(model_tag, domain)`` metric labels for a parameter tuple."""
+    _stream_velocity, model_tag, _origin, _spacing, extent_min, extent_max = params
+    return model_tag, domain_label(_domain_dims(extent_min, extent_max))
+
+
+def _error_response(message: str):
+    """Return an ``InferenceResponse`` carrying only *message* in ``ERROR_MESSAGE``."""
+    return pb_utils.InferenceResponse(
+        output_tensors=[pb_utils.Tensor("ERROR_MESSAGE", np.array([message], dtype=np.object_))]
+    )
+
+
 _SUBLAYER_PATH = "/opt/stages/BaseCAEVariants.usda"
 
 
-def _load_stage_from_string(usd_string: str) -> Usd.Stage:
+def _load_stage_from_string(usd_string: str, base_layer: Sdf.Layer | None = None) -> Usd.Stage:
     """Parse a USD layer from a string and open it as a stage.
 
-    The layer's sublayer list is replaced with a fixed path to the mounted
-    BaseCAEVariants.usda so that variant-set composition resolves correctly
-    inside the container regardless of where the caller serialised the layer.
+    The layer's sublayer list is replaced with the mounted BaseCAEVariants.usda
+    so that variant-set composition resolves correctly inside the container
+    regardless of where the caller serialised the layer.  When *base_layer* is
+    given (the already-open BaseCAEVariants layer), it is reused through the
+    layer registry instead of being resolved and read again.
     """
     layer = Sdf.Layer.CreateAnonymous(".usda")
     layer.ImportFromString(usd_string)
     # Redirect sublayers to the mounted filesystem path so composition resolves
-    layer.subLayerPaths = [_SUBLAYER_PATH]
+    layer.subLayerPaths = [base_layer.identifier if base_layer else _SUBLAYER_PATH]
     return Usd.Stage.Open(layer, load=Usd.Stage.LoadNone)
 
 
-def _to_nanovdb_buffer(data: np.ndarray, dims: wp.vec3i, origin: wp.vec3i, voxel_size: wp.vec3f, bg_value) -> np.ndarray:
-    """Convert a NumPy array to a serialised NanoVDB buffer via Warp + DAV.
+def _domain_dims(extent_min: np.ndarray, extent_max: np.ndarray) -> wp.vec3i:
+    """Return the voxel count of the inclusive IJK range ``[extent_min, extent_max]``."""
+    return wp.vec3i(
+        int(extent_max[0] - extent_min[0] + 1),
+        int(extent_max[1] - extent_min[1] + 1),
+        int(extent_max[2] - extent_min[2] + 1),
+    )
+
 
-    Scalar fields (shape ``(N,)`` or ``(N, 1)``) are stored as ``float32``
-    grids; vector fields (shape ``(N, 3)``) are stored as ``vec3f`` grids.
-    The returned array is a flat ``uint8`` byte buffer ready to be wrapped in
-    a ``pb_utils.Tensor``.
+def _build_point_slab(
+    origin: np.ndarray,
+    spacing: np.ndarray,
+    extent_min: np.ndarray,
+    dims: wp.vec3i,
+    start: int,
+    stop: int,
+    index: np.ndarray | None = None,
+) -> np.ndarray:
+    """Build world-space XYZ coordinates for flat voxel indices ``[start, stop)``.
+
+    Flat indices follow Fortran (IJK-major) order over the domain, i.e.
+    ``index = i + ni * (j + nj * k)`` relative to *extent_min*, which is the
+    ordering the NanoVDB conversion expects.  Returns a ``float32`` array of
+    shape ``(stop - start, 3)``, or ``(len(index), 3)`` when an explicit
+    *index* subset of the slab is given.
     """
-    if data.ndim == 2 and data.shape[1] == 3:
-        wp_array = wp.array(data, dtype=wp.vec3f, device="cuda", copy=False)
-    else:
-        wp_array = wp.array(data.reshape(-1), dtype=wp.float32, device="cuda", copy=False)
+    ni, nj = int(dims[0]), int(dims[1])
+    if index is None:
+        index = np.arange(start, stop, dtype=np.int64)
+    points = np.empty((index.shape[0], 3), dtype=np.float32)
+    points[:, 0] = origin[0] + (index % ni + extent_min[0]).astype(np.float32) * spacing[0]
+    points[:, 1] = origin[1] + (index // ni % nj + extent_min[1]).astype(np.float32) * spacing[1]
+    points[:, 2] = origin[2] + (index // (ni * nj) + extent_min[2]).astype(np.float32) * spacing[2]
+    return points
+
+
+@wp.kernel
+def _velocity_magnitude_kernel(velocity: wp.array(dtype=wp.vec3f), magnitude: wp.array(dtype=wp.float32)):
+    tid = wp.tid()
+    magnitude[tid] = wp.length(velocity[tid])
+
+
+def _resolve_warp_device(name: str) -> str:
+    """Return *name* if Warp can use it, falling back to ``"cpu"`` when CUDA is unavailable."""
+    if name.startswith("cuda") and not wp.is_cuda_available():
+        logger.warning(f"Warp device '{name}' is unavailable; falling back to 'cpu'")
+        return "cpu"
+    return name
+
 
+def _to_nanovdb_buffer(
+    wp_array: wp.array, dims: wp.vec3i, origin: wp.vec3i, voxel_size: wp.vec3f, bg_value, device: str
+) -> np.ndarray:
+    """Convert a device-resident Warp array to a serialised NanoVDB buffer via DAV.
+
+    Scalar fields (``float32`` arrays) become ``float`` grids and vector fields
+    (``vec3f`` arrays) become ``vec3f`` grids.  The returned array is a flat
+    ``uint8`` byte buffer ready to be wrapped in a ``pb_utils.Tensor``.
+    """
     field = dav.Field.from_array(wp_array, dav.AssociationType.VERTEX)
-    nvdb_field = field.to_nanovdb(dims=dims, origin=origin, voxel_size=voxel_size, bg_value=bg_value, device="cuda")
+    nvdb_field = field.to_nanovdb(dims=dims, origin=origin, voxel_size=voxel_size, bg_value=bg_value, device=device)
     return nvdb_field.get_data().array().numpy()
 
 
+def _encode_nanovdb_outputs(
+    fields: dict[str, np.ndarray],
+    requested_outputs: list[str],
+    dims: wp.vec3i,
+    spacing: np.ndarray,
+    extent_min: np.ndarray,
+    device: str,
+    stream_velocity: float = 0.0,
+    sparse_tolerance: float = 0.0,
+    precision: str = "float32",
+    timings: dict[str, float] | None = None,
+    interior: np.ndarray | None = None,
+) -> dict[str, np.ndarray]:
+    """Convert the raw upstream fields into the requested NanoVDB output buffers.
+
+    *fields* holds the ``velocity`` and/or ``pressure`` arrays returned by the
+    upstream model.  Each field is uploaded to *device* once; derived scalars
+    (velocity magnitude) are computed there by a Warp kernel, and every grid
+    is built from the device-resident arrays.  Outputs not listed in
+    *requested_outputs* are skipped entirely.
+
+    A positive *sparse_tolerance* enables freestream-aware sparse encoding
+    (CUDA devices only): voxels within ``sparse_tolerance * U`` of the
+    freestream velocity ``(U, 0, 0)``, or within ``sparse_tolerance * q`` of
+    zero gauge pressure, are left inactive and the freestream value becomes
+    the grid background.
+
+    A *precision* other than ``float32`` returns the dense values as a
+    reduced-precision payload (see ``encoding.py``) instead of a NanoVDB grid;
+    sparse encoding does not apply then.  Returns a dict mapping each
+    requested ``nvdb_*`` output name to its ``uint8`` buffer; when *timings*
+    is given, the encode time of each grid is recorded in it under the same
+    name.
+
+    *interior* is the flat mask of voxels culled inside the car body (see
+    ``occupancy.py``).  On CUDA those voxels are set to the grid background
+    and tiles holding nothing else are left unallocated, even without a
+    sparse tolerance; elsewhere they are written densely as zeros.
+    """
+    voxel_size = wp.vec3f(float(spacing[0]), float(spacing[1]), float(spacing[2]))
+    origin_ijk = wp.vec3i(int(extent_min[0]), int(extent_min[1]), int(extent_min[2]))
+    sparse = sparse_tolerance > 0.0 and stream_velocity > 0.0 and precision == "float32"
+    if sparse and not wp.get_device(device).is_cuda:
+        logger.warning(f"Sparse NanoVDB encoding needs a CUDA device; writing dense grids on '{device}'")
+        sparse = False
+    cull = interior is not None and precision == "float32" and wp.get_device(device).is_cuda
+    if interior is not None and precision == "float32" and not cull:
+        logger.warning(f"Interior culling needs a CUDA device to drop tiles; writing dense grids on '{device}'")
+
+    num_points = int(dims[0]) * int(dims[1]) * int(dims[2])
+    speed = float(stream_velocity)
+    dynamic_pressure = 0.5 * _AIR_DENSITY * speed * speed
+
+    def encode_grid(name, wp_array, bg_value, freestream, scale):
+        start = time.perf_counter()
+        if precision != "float32":
+            buffer = encode_dense(wp_array.numpy(), precision, tuple(dims), tuple(origin_ijk), tuple(voxel_size))
+        elif not sparse and not cull:
+            buffer = _to_nanovdb_buffer(
+                wp_array, dims=dims, origin=origin_ijk, voxel_size=voxel_size, bg_value=bg_value, device=device
+            )
+        else:
+            # Without a sparse tolerance only voxels exactly at the background (the culled interior) stay inactive.
+            buffer, active_voxels = to_sparse_nanovdb_buffer(
+                wp_array,
+                dims,
+                origin_ijk,
+                voxel_size,
+                freestream if sparse else bg_value,
+                sparse_tolerance * scale if sparse else 0.0,
+                device,
+            )
+            logger.info(
+                f"Sparse {name}: {active_voxels:,} / {num_points:,} voxels active "
+                f"({num_points / max(active_voxels, 1):,.1f}x compression)"
+            )
+        if timings is not None:
+            timings[name] = time.perf_counter() - start
+        return buffer
+
+    if cull and sparse and "velocity" in fields:
+        # Culled voxels hold zeros; move them to the freestream background so their tiles can stay inactive.
+        fields["velocity"][interior] = (speed, 0.0, 0.0)
+
+    buffers = {}
+    if "velocity" in fields:
+        velocity = wp.array(fields["velocity"], dtype=wp.vec3f, device=device, copy=False)
+        if NANOVDB_OUTPUTS["velocity"] in requested_outputs:
+            buffers[NANOVDB_OUTPUTS["velocity"]] = encode_grid(
+                NANOVDB_OUTPUTS["velocity"], velocity, wp.vec3f(0.0, 0.0, 0.0), wp.vec3f(speed, 0.0, 0.0), speed
+            )
+        if NANOVDB_OUTPUTS["velocity_magnitude"] in requested_outputs:
+            velocity_magnitude = wp.empty(velocity.shape[0], dtype=wp.float32, device=device)
+            wp.launch(
+                _velocity_magnitude_kernel,
+                dim=velocity.shape[0],
+                inputs=[velocity],
+                outputs=[velocity_magnitude],
+                device=device,
+            )
+            buffers[NANOVDB_OUTPUTS["velocity_magnitude"]] = encode_grid(
+                NANOVDB_OUTPUTS["velocity_magnitude"], velocity_magnitude, 0.0, speed, speed
+            )
+    if NANOVDB_OUTPUTS["pressure"] in requested_outputs:
+        pressure = wp.array(fields["pressure"].reshape(-1), dtype=wp.float32, device=device, copy=False)
+        buffers[NANOVDB_OUTPUTS["pressure"]] = encode_grid(
+            NANOVDB_OUTPUTS["pressure"], pressure, 0.0, 0.0, dynamic_pressure
+        )
+    return buffers
+
+
+@contextlib.contextmanager
+def _warm_up_step(description: str):
+    """Time a warm-up step and log its duration; failures are logged and suppressed."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as exc:
+        logger.warning(f"Warm-up: {description} failed after {time.perf_counter() - start:.2f} s: {exc}")
+    else:
+        logger.info(f"Warm-up: {description} took {time.perf_counter() - start:.2f} s")
+
+
+def _make_upstream_request(
+    mesh_tensors: dict[str, np.ndarray],
+    stream_velocity: float,
+    stencil_size: int,
+    batch_size: int,
+    point_cloud: np.ndarray | None,
+    upstream_fields: list[str],
+):
+    """Build the BLS request that evaluates *point_cloud* with the upstream ``model``.
+
+    Without a *point_cloud* the request runs the upstream ``surface`` mode,
+    which predicts per-face fields on the mesh alone.
+    """
+    inputs = [
+        pb_utils.Tensor("vertices", mesh_tensors["vertices"]),
+        pb_utils.Tensor("faces", mesh_tensors["faces"]),
+        pb_utils.Tensor("centers", mesh_tensors["centers"]),
+        pb_utils.Tensor("surface_normals", mesh_tensors["surface_normals"]),
+        pb_utils.Tensor("surface_areas", mesh_tensors["surface_areas"]),
+        pb_utils.Tensor("STREAM_VELOCITY", np.array([stream_velocity], dtype=np.float32)),
+        pb_utils.Tensor("STENCIL_SIZE", np.array([stencil_size], dtype=np.int32)),
+        pb_utils.Tensor("BATCH_SIZE", np.array([batch_size], dtype=np.int32)),
+    ]
+    if point_cloud is None:
+        inputs.append(pb_utils.Tensor("INFERENCE_MODE", np.array(["surface"], dtype=np.object_)))
+    else:
+        inputs.append(pb_utils.Tensor("POINT_CLOUD", point_cloud))
+        inputs.append(pb_utils.Tensor("INFERENCE_MODE", np.array(["volume_custom"], dtype=np.object_)))
+    return pb_utils.InferenceRequest(
+        model_name="model", requested_output_names=[*upstream_fields, "ERROR_MESSAGE"], inputs=inputs
+    )
+
+
+def _read_upstream_fields(result, upstream_fields: list[str]) -> dict[str, np.ndarray]:
+    """Extract *upstream_fields* from an upstream response, raising on upstream errors."""
+    if result.has_error():
+        raise pb_utils.TritonModelException(result.error().message())
+
+    upstream_error = pb_utils.get_output_tensor_by_name(result, "ERROR_MESSAGE")
+    if upstream_error is not None:
+        err_value = upstream_error.as_numpy().ravel()[0].decode("utf-8")
+        if err_value:
+            raise UpstreamModelError(err_value)
+
+    fields = {}
+    if "velocity" in upstream_fields:
+        velocity = pb_utils.get_output_tensor_by_name(result, "velocity").as_numpy()
+        if velocity.ndim == 3 and velocity.shape[0] == 1:
+            velocity = velocity.squeeze(0)
+        fields["velocity"] = velocity
+    if "pressure" in upstream_fields:
+        pressure = pb_utils.get_output_tensor_by_name(result, "pressure").as_numpy()
+        if pressure.ndim == 3 and pressure.shape[0] == 1:
+            pressure = pressure.squeeze(0)
+        if pressure.ndim == 2 and pressure.shape[1] == 1:
+            pressure = pressure.squeeze(1)
+        fields["pressure"] = pressure
+    for name in upstream_fields:
+        if name in SURFACE_OUTPUTS.values():
+            values = pb_utils.get_output_tensor_by_name(result, name).as_numpy()
+            if values.ndim == 3 and values.shape[0] == 1:
+                values = values.squeeze(0)
+            if values.ndim == 2 and values.shape[1] == 1:
+                values = values.squeeze(1)
+            fields[name] = np.ascontiguousarray(values, dtype=np.float32)
+    return fields
+
+
 class TritonPythonModel:
     """Triton Python backend entry-point for the ``rtwt`` model.
 
@@ -89,168 +611,769 @@ class TritonPythonModel:
     """
 
     def initialize(self, args: dict):
-        """Set up logging, initialise Warp, and prepare the mesh cache."""
+        """Set up logging, initialise Warp, and prepare the mesh cache and worker pool."""
         setup_logger(int(args["model_instance_device_id"]), args["model_name"])
         wp.init()
+        model_config = json.loads(args["model_config"])
+        self._decoupled = pb_utils.using_decoupled_model_transaction_policy(model_config)
+        self._output_names = [output["name"] for output in model_config["output"]]
+        self._check_upstream_config(
+            os.environ.get("RTWT_UPSTREAM_CONFIG") or Path(args["model_repository"]).parent / "model" / "config.pbtxt"
+        )
+        self._progressive_factors = sorted(
+            {int(f) for f in os.environ.get("RTWT_PROGRESSIVE_FACTORS", "4").split(",") if f.strip() and int(f) > 1},
+            reverse=True,
+        )
+        self._warp_device = _resolve_warp_device(os.environ.get("RTWT_WARP_DEVICE", "cuda"))
+        self._sparse_tolerance = float(os.environ.get("RTWT_SPARSE_TOLERANCE", 0.0))
+        self._precision = os.environ.get("RTWT_PRECISION", "float32")
+        if self._precision not in PRECISIONS:
+            logger.warning(f"Unsupported RTWT_PRECISION '{self._precision}'; using float32")
+            self._precision = "float32"
 
         self._model_root = Path(os.environ.get("RTWT_MODEL_ROOT", "/opt/data"))
-        self._mesh_cache: dict[Path, dict[str, np.ndarray]] = {}
+        self._mesh_cache = LRUCache(
+            max_bytes=int(os.environ.get("RTWT_MESH_CACHE_BYTES", _DEFAULT_MESH_CACHE_BYTES)),
+            sizeof=lambda tensors: sum(array.nbytes for array in tensors.values()),
+        )
+        self._mesh_hashes: dict[Path, str] = {}
+        self._mesh_store = self._open_mesh_store(os.environ.get("RTWT_MESH_STORE", ""))
+        self._cull_interior = os.environ.get("RTWT_CULL_INTERIOR", "0") == "1"
+        self._occupancy_cache = LRUCache(
+            max_bytes=int(os.environ.get("RTWT_OCCUPANCY_CACHE_BYTES", _DEFAULT_OCCUPANCY_CACHE_BYTES)),
+            sizeof=lambda mask: mask.nbytes,
+        )
+        self._chunk_batches = int(os.environ.get("RTWT_CHUNK_BATCHES", _DEFAULT_CHUNK_BATCHES))
+
+        cpu_workers = int(os.environ.get("RTWT_CPU_WORKERS", _DEFAULT_CPU_WORKERS))
+        self._cpu_pool = ThreadPoolExecutor(max_workers=max(cpu_workers, 1), thread_name_prefix="rtwt-cpu")
+        max_inflight = int(os.environ.get("RTWT_MAX_INFLIGHT_UPSTREAM", _DEFAULT_MAX_INFLIGHT_UPSTREAM))
+        self._upstream_slots = asyncio.Semaphore(max(max_inflight, 1))
+        # Single-flight: key -> computation in flight for it.  Requests only overlap within an instance on
+        # rtwt_progressive; an rtwt instance serves one request at a time, so it only coalesces autotuning.
+        self._inflight: dict[str, _Flight] = {}
+        self._metrics = RtwtMetrics(args["model_name"], enabled=os.environ.get("RTWT_METRICS", "1") != "0")
+
+        self._autotune = os.environ.get("RTWT_AUTOTUNE", "0") == "1"
+        self._autotune_candidates = sorted(
+            {int(c) for c in os.environ.get("RTWT_AUTOTUNE_CANDIDATES", "").split(",") if c.strip()}
+            or DEFAULT_CANDIDATES
+        )
+        self._autotune_min_free_bytes = int(
+            os.environ.get("RTWT_AUTOTUNE_MIN_FREE_BYTES", _DEFAULT_AUTOTUNE_MIN_FREE_BYTES)
+        )
+        # Each rtwt instance serves one request at a time; Triton's priority queue orders them (see its config).
+        self._scheduler = None
+        if self._decoupled:
+            self._scheduler = FairScheduler(
+                max_active=int(os.environ.get("RTWT_MAX_ACTIVE_REQUESTS", _DEFAULT_MAX_ACTIVE_REQUESTS)),
+                client_max_active=int(
+                    os.environ.get("RTWT_CLIENT_MAX_ACTIVE_REQUESTS", _DEFAULT_CLIENT_MAX_ACTIVE_REQUESTS)
+                ),
+                max_queue=int(os.environ.get("RTWT_MAX_QUEUED_REQUESTS", _DEFAULT_MAX_QUEUED_REQUESTS)),
+                client_max_queue=int(
+                    os.environ.get("RTWT_CLIENT_MAX_QUEUED_REQUESTS", _DEFAULT_CLIENT_MAX_QUEUED_REQUESTS)
+                ),
+                metrics=self._metrics,
+            )
+        profile_path = os.environ.get("RTWT_AUTOTUNE_PROFILE", "")
+        self._batch_profiles = BatchSizeProfiles(Path(profile_path) if profile_path else None)
+
+        # Keep BaseCAEVariants.usda open for the lifetime of the model so every
+        # request composes against the same in-memory sublayer.
+        self._base_layer = Sdf.Layer.FindOrOpen(_SUBLAYER_PATH)
+        if self._base_layer is None:
+            logger.warning(f"Could not open sublayer {_SUBLAYER_PATH}; it will be resolved per request")
+        param_cache_size = int(os.environ.get("RTWT_PARAM_CACHE_SIZE", _DEFAULT_PARAM_CACHE_SIZE))
+        self._param_cache = LRUCache(max_entries=max(param_cache_size, 0))
+
+        result_cache_dir = os.environ.get("RTWT_RESULT_CACHE_DIR", "")
+        self._result_cache = ResultCache(
+            max_bytes=int(os.environ.get("RTWT_RESULT_CACHE_BYTES", _DEFAULT_RESULT_CACHE_BYTES)),
+            spill_dir=Path(result_cache_dir) if result_cache_dir else None,
+            max_spill_bytes=int(os.environ.get("RTWT_RESULT_CACHE_DIR_BYTES", _DEFAULT_RESULT_CACHE_DIR_BYTES)),
+        )
 
         logger.info(f"Using RTWT model root: {self._model_root}")
+        logger.info(f"Chunk size: {self._chunk_batches} x BATCH_SIZE points per upstream call")
+        logger.info(f"CPU workers: {cpu_workers}, max in-flight upstream calls: {max_inflight}")
+        logger.info(f"Warp device: {self._warp_device}")
+        if self._decoupled:
+            logger.info(f"Scheduler: {self._scheduler}")
+            logger.info(f"Progressive refinement factors: {self._progressive_factors} then full resolution")
+        if self._sparse_tolerance > 0.0:
+            logger.info(f"Sparse NanoVDB encoding enabled (tolerance {self._sparse_tolerance})")
+        if self._cull_interior:
+            logger.info("Interior voxel culling enabled")
+        if self._metrics.enabled:
+            logger.info("Prometheus stage metrics enabled")
+        if self._autotune or len(self._batch_profiles):
+            logger.info(
+                f"Batch-size autotuning {'enabled' if self._autotune else 'disabled'} "
+                f"({len(self._batch_profiles)} tuned profile(s), candidates {self._autotune_candidates})"
+            )
+
+        warmup_manifest = os.environ.get("RTWT_WARMUP_MANIFEST", "")
+        if warmup_manifest:
+            self._warm_up(Path(warmup_manifest))
+
+    def _warm_up(self, manifest_path: Path) -> None:
+        """Preload meshes and exercise NanoVDB conversion and the upstream model before serving.
+
+        *manifest_path* is a JSON file of the form::
+
+            {
+              "model_tags": ["low_res/detailed_car_500/aero_suv_low.ply"],
+              "domains": [
+                {"origin": [0, 0, 0], "spacing": [0.036, 0.036, 0.036],
+                 "extent_min": [-50, -40, -10], "extent_max": [250, 40, 60]}
+              ],
+              "velocities": [30.0],
+              "stencil_size": 1
+            }
+
+        Every listed mesh is loaded into the mesh cache, each domain runs a dry
+        NanoVDB conversion on a small sub-domain (compiling the Warp / DAV
+        kernels), and the first tag, domain and velocity drive one small
+        upstream call.  Each step is timed; a failing step is logged and
+        skipped so a bad manifest never prevents the model from loading.
+        """
+        total_start = time.perf_counter()
+        try:
+            manifest = json.loads(manifest_path.read_text())
+            model_tags = [str(tag) for tag in manifest.get("model_tags", [])]
+            domains = [
+                (
+                    np.asarray(domain["origin"], dtype=np.float32),
+                    np.asarray(domain["spacing"], dtype=np.float32),
+                    np.asarray(domain["extent_min"], dtype=np.int32),
+                    np.asarray(domain["extent_max"], dtype=np.int32),
+                )
+                for domain in manifest.get("domains", [])
+            ]
+            velocities = [float(velocity) for velocity in manifest.get("velocities", [])]
+            stencil_size = int(manifest.get("stencil_size", 1))
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning(f"Warm-up: could not read manifest {manifest_path}: {exc}")
+            return
+
+        for model_tag in model_tags:
+            with _warm_up_step(f"mesh {model_tag}"):
+                self._get_mesh_tensors(model_tag)
+                self._get_mesh_hash(model_tag)
+
+        stream_velocity = velocities[0] if velocities else 0.0
+        for index, (_origin, spacing, extent_min, extent_max) in enumerate(domains):
+            sub_max = np.minimum(extent_max, extent_min + _WARMUP_MAX_DIM - 1)
+            dims = _domain_dims(extent_min, sub_max)
+            num_points = int(dims[0]) * int(dims[1]) * int(dims[2])
+            fields = {
+                "velocity": np.zeros((num_points, 3), dtype=np.float32),
+                "pressure": np.zeros(num_points, dtype=np.float32),
+            }
+            with _warm_up_step(f"NanoVDB conversion (domain {index})"):
+                _encode_nanovdb_outputs(
+                    fields,
+                    list(NANOVDB_OUTPUTS.values()),
+                    dims,
+                    spacing,
+                    extent_min,
+                    self._warp_device,
+                    stream_velocity,
+                    self._sparse_tolerance,
+                )
+
+        if model_tags and domains and velocities:
+            origin, spacing, extent_min, extent_max = domains[0]
+            dims = _domain_dims(extent_min, extent_max)
+            num_points = min(_WARMUP_POINTS, int(dims[0]) * int(dims[1]) * int(dims[2]))
+            with _warm_up_step(f"upstream call ({num_points} points)"):
+                points = _build_point_slab(origin, spacing, extent_min, dims, 0, num_points)
+                # BLS from initialize has no event loop to await on; use the blocking API.
+                infer_request = _make_upstream_request(
+                    self._get_mesh_tensors(model_tags[0]),
+                    stream_velocity,
+                    stencil_size,
+                    num_points,
+                    points,
+                    ["velocity", "pressure"],
+                )
+                _read_upstream_fields(infer_request.exec(), ["velocity", "pressure"])
+
+        logger.info(f"Warm-up complete in {time.perf_counter() - total_start:.2f} s")
+
+    def _check_upstream_config(self, path: str | Path) -> None:
+        """Fail to load if the upstream ``model`` config at *path* lacks a tensor ``rtwt`` relies on.
+
+        See ``outputs.check_upstream_config``.  An unreadable config, or one
+        whose tensor lists Triton auto-completes, is only logged, as the
+        upstream model then reports a mismatch per request instead.
+        """
+        path = Path(path)
+        try:
+            config = path.read_text()
+        except OSError as exc:
+            logger.warning(f"Cannot read the upstream model config {path}; not checking it: {exc}")
+            return
+        missing, unchecked = check_upstream_config(config)
+        if missing:
+            raise RuntimeError(
+                f"Upstream model config {path} lacks {', '.join(missing)}, which rtwt relies on "
+                "(INFERENCE_MODE and the surface fields come from the DoMINO surface mode)"
+            )
+        if unchecked:
+            logger.warning(f"Upstream model config {path} declares no {' or '.join(unchecked)} list; not checking it")
+        else:
+            logger.info(f"Upstream model config {path} declares every tensor rtwt relies on")
+
+    def _open_mesh_store(self, store_dir: str) -> MeshStore | None:
+        """Open the precomputed mesh store at *store_dir*, or return ``None`` if unset or unreadable."""
+        if not store_dir:
+            return None
+        try:
+            store = MeshStore(Path(store_dir), self._model_root)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning(f"Could not open mesh store {store_dir}: {exc}; meshes will be loaded with trimesh")
+            return None
+        logger.info(f"Using mesh store {store_dir} ({len(store)} tag(s))")
+        return store
 
     async def execute(self, requests: list) -> list:
         """Handle a batch of Triton inference requests.
 
-        Each request must supply the following input tensors:
+        Requests are processed concurrently; the returned responses keep the
+        order of *requests*.  Each ``rtwt`` instance is only ever handed one
+        request at a time (see the module docstring).  Each request must supply
+        the following input tensors:
+
+        * ``STENCIL_SIZE`` — stencil radius passed to the upstream model.
+
+        ``BATCH_SIZE`` (``int32[1]``) optionally sets the batch size passed to
+        the upstream model; without it the tuned value for the mesh and
+        domain is used (see ``_resolve_batch_size``).
+
+        and describe the scene either as a USD layer:
 
         * ``USD_LAYER``    — serialised USD layer (bytes) describing the scene.
         * ``PRIM_PATH``    — path to the inference prim within that layer.
-        * ``STENCIL_SIZE`` — stencil radius passed to the upstream model.
-        * ``BATCH_SIZE``   — batch size passed to the upstream model.
+
+        or, bypassing USD entirely, as typed parameters:
+
+        * ``STREAM_VELOCITY`` (``float32[1]``), ``MODEL_TAG`` (``string[1]``),
+          ``DOMAIN_ORIGIN`` / ``DOMAIN_SPACING`` (``float32[3]``) and
+          ``DOMAIN_EXTENT_MIN`` / ``DOMAIN_EXTENT_MAX`` (``int32[3]``).
+
+        ``SPARSE_TOLERANCE`` (``float32[1]``) optionally overrides
+        ``RTWT_SPARSE_TOLERANCE`` for freestream-aware sparse encoding, and
+        ``PRECISION`` (``string[1]``: ``float32``, ``float16`` or
+        ``quantized16``) overrides ``RTWT_PRECISION``.
+
+        ``SLICE_AXIS`` (``int32[1]``, 0–2) with ``SLICE_POSITION``
+        (``float32[1]``, world units) and optionally ``SLICE_THICKNESS``
+        (``int32[1]``, voxel layers) restricts inference to a thin slab
+        around that plane; ``EXTENT_MIN`` / ``EXTENT_MAX`` then describe the
+        slab.
+
+        ``CLIENT_ID`` (``string[1]``) and ``PRIORITY`` (``string[1]``:
+        ``interactive`` or ``precache``) place computations in the fair
+        scheduler (see ``scheduler.py``); a saturated scheduler rejects the
+        request at once with an ``ERROR_MESSAGE``.  Only ``rtwt_progressive``
+        schedules; ``rtwt`` accepts and ignores both inputs.
+
+        ``DEADLINE_MS`` (``int64[1]``, Unix epoch milliseconds) is checked
+        before preprocessing, before each upstream call and before encoding;
+        a request past it is abandoned with an ``ERROR_MESSAGE``.
 
         Each response contains:
 
         * ``nvdb_velocity``           — NanoVDB ``vec3f`` grid (velocity vectors).
         * ``nvdb_velocity_magnitude`` — NanoVDB ``float`` grid (speed).
         * ``nvdb_pressure``           — NanoVDB ``float`` grid (pressure).
+        * ``surface_pressure``        — per-face pressure (``float32[F]``), only when requested.
+        * ``surface_wall_shear_stress`` — per-face wall shear stress (``float32[F, 3]``), only when requested.
         * ``EXTENT_MIN`` / ``EXTENT_MAX`` — IJK domain bounds (``int32[3]``).
         * ``ERROR_MESSAGE``           — empty on success; error text on failure.
+
+        In decoupled mode (the ``rtwt_progressive`` model) responses are sent
+        through each request's response sender instead, see
+        ``_execute_progressive``.
         """
-        responses = []
+        if self._decoupled:
+            await asyncio.gather(*(self._execute_progressive(request) for request in requests))
+            return None
+        return list(await asyncio.gather(*(self._execute_request(request) for request in requests)))
 
-        for request in requests:
-            try:
-                usd_string = _extract_str(request, "USD_LAYER")
-                prim_path = _extract_str(request, "PRIM_PATH")
-                stencil_size = _extract_int(request, "STENCIL_SIZE")
-                batch_size = _extract_int(request, "BATCH_SIZE")
-
-                stage = _load_stage_from_string(usd_string)
-                stream_velocity, model_tag, origin, spacing, extent_min, extent_max = \
-                    self._extract_params_from_stage(stage, prim_path)
-
-                mesh_tensors = self._get_mesh_tensors(model_tag)
-                point_cloud, dims = self._build_point_cloud(origin, spacing, extent_min, extent_max)
-
-                logger.info("=" * 60)
-                logger.info(f"Model tag: {model_tag}")
-                logger.info(f"Stream velocity: {stream_velocity} m/s")
-                logger.info(f"Stencil size: {stencil_size}")
-                logger.info(f"Batch size: {batch_size}")
-                logger.info(f"Point cloud dims: {tuple(int(v) for v in dims)} ({point_cloud.shape[0]:,} samples)")
-
-                infer_request = pb_utils.InferenceRequest(
-                    model_name="model",
-                    requested_output_names=_UPSTREAM_OUTPUTS,
-                    inputs=[
-                        pb_utils.Tensor("vertices", mesh_tensors["vertices"]),
-                        pb_utils.Tensor("faces", mesh_tensors["faces"]),
-                        pb_utils.Tensor("centers", mesh_tensors["centers"]),
-                        pb_utils.Tensor("surface_normals", mesh_tensors["surface_normals"]),
-                        pb_utils.Tensor("surface_areas", mesh_tensors["surface_areas"]),
-                        pb_utils.Tensor("STREAM_VELOCITY", np.array([stream_velocity], dtype=np.float32)),
-                        pb_utils.Tensor("STENCIL_SIZE", np.array([stencil_size], dtype=np.int32)),
-                        pb_utils.Tensor("POINT_CLOUD", point_cloud),
-                        pb_utils.Tensor("INFERENCE_MODE", np.array(["volume_custom"], dtype=np.object_)),
-                        pb_utils.Tensor("BATCH_SIZE", np.array([batch_size], dtype=np.int32)),
-                    ],
+    async def _execute_request(self, request):
+        """Run the full pipeline for a single request and return its response."""
+        start = time.perf_counter()
+        labels = ("unknown", "unknown")
+        try:
+            cache_key, *config = await self._parse_request(request)
+            labels = _metric_labels(config[0])
+            cached = await self._run_cpu(self._result_cache.get, cache_key)
+            if cached is not None:
+                stream_velocity, model_tag = config[0][:2]
+                logger.info(f"Result cache HIT for {model_tag} @ {stream_velocity} m/s ({self._result_cache.stats()})")
+                self._metrics.observe_request("cache_hit", time.perf_counter() - start, *labels, _nbytes(cached))
+                return _make_response(cached)
+
+            # No other request is in flight on this rtwt instance to coalesce with (see ``_single_flight``).
+            buffers = await self._compute_buffers(cache_key, *config)
+            self._metrics.observe_request("computed", time.perf_counter() - start, *labels, _nbytes(buffers))
+            return _make_response(buffers)
+
+        except RequestCancelled as exc:
+            logger.info(str(exc))
+            self._metrics.observe_request("cancelled", time.perf_counter() - start, *labels)
+            return _error_response(str(exc))
+
+        except DeadlineExceeded as exc:
+            logger.warning(str(exc))
+            self._metrics.observe_request("expired", time.perf_counter() - start, *labels)
+            return _error_response(str(exc))
+
+        except UpstreamModelError as exc:
+            logger.error(f"Upstream model error: {exc}")
+            self._metrics.observe_request("error", time.perf_counter() - start, *labels)
+            return _error_response(str(exc))
+
+        except Exception as exc:
+            traceback.print_exc()
+            logger.error(f"Inference error: {exc}")
+            self._metrics.observe_request("error", time.perf_counter() - start, *labels)
+            return _error_response(str(exc))
+
+    async def _execute_progressive(self, request) -> None:
+        """Stream coarse-to-fine responses for a single request (decoupled mode).
+
+        One response is sent per factor in ``_progressive_factors``, coarsest
+        first, each computed and returned on a grid subsampled by that factor
+        (see ``_compute_buffers``).  The full-resolution result follows as the
+        final response.  ``REFINEMENT_FACTOR`` tells the client which one it
+        received (``1`` is final).  A cached configuration is answered with
+        the final response straight away.  A request for a configuration
+        already being computed is coalesced with it and receives the same
+        previews and final result (see ``_single_flight``).
+        """
+        sender = request.get_response_sender()
+        start = time.perf_counter()
+        labels = ("unknown", "unknown")
+        try:
+            cache_key, *config = await self._parse_request(request)
+            labels = _metric_labels(config[0])
+            buffers = await self._run_cpu(self._result_cache.get, cache_key)
+            outcome = "cache_hit" if buffers is not None else "computed"
+            if buffers is None:
+                buffers = await self._single_flight(
+                    cache_key,
+                    functools.partial(self._compute_progressive, cache_key, config, _extract_client(request)),
+                    on_preview=lambda factor, coarse: sender.send(_make_response(coarse, refinement_factor=factor)),
                 )
+            response = _make_response(buffers, refinement_factor=1)
+            self._metrics.observe_request(outcome, time.perf_counter() - start, *labels, _nbytes(buffers))
 
-                logger.info("Sending inference request to 'model'")
-                result = await infer_request.async_exec()
-                if result.has_error():
-                    raise pb_utils.TritonModelException(result.error().message())
-
-                voxel_size = wp.vec3f(float(spacing[0]), float(spacing[1]), float(spacing[2]))
-                origin_ijk = wp.vec3i(int(extent_min[0]), int(extent_min[1]), int(extent_min[2]))
-
-                outputs = [pb_utils.Tensor("ERROR_MESSAGE", np.array([""], dtype=np.object_))]
-                upstream_error = pb_utils.get_output_tensor_by_name(result, "ERROR_MESSAGE")
-                if upstream_error is not None:
-                    err_value = upstream_error.as_numpy().ravel()[0].decode("utf-8")
-                    if err_value:
-                        outputs[0] = pb_utils.Tensor("ERROR_MESSAGE", np.array([err_value], dtype=np.object_))
-                        responses.append(pb_utils.InferenceResponse(output_tensors=outputs))
-                        logger.error(f"Upstream model error: {err_value}")
-                        continue
-
-                velocity = pb_utils.get_output_tensor_by_name(result, "velocity").as_numpy()
-                pressure = pb_utils.get_output_tensor_by_name(result, "pressure").as_numpy()
-                if velocity.ndim == 3 and velocity.shape[0] == 1:
-                    velocity = velocity.squeeze(0)
-                if pressure.ndim == 3 and pressure.shape[0] == 1:
-                    pressure = pressure.squeeze(0)
-                if pressure.ndim == 2 and pressure.shape[1] == 1:
-                    pressure = pressure.squeeze(1)
-                velocity_magnitude = np.linalg.norm(velocity, axis=1).astype(np.float32, copy=False)
-
-                outputs.append(
-                    pb_utils.Tensor(
-                        _NANOVDB_OUTPUTS["velocity"],
-                        _to_nanovdb_buffer(
-                            velocity,
-                            dims=dims,
-                            origin=origin_ijk,
-                            voxel_size=voxel_size,
-                            bg_value=wp.vec3f(0.0, 0.0, 0.0),
-                        ),
-                    )
+        except SchedulerSaturated as exc:
+            logger.warning(str(exc))
+            self._metrics.observe_request("rejected", time.perf_counter() - start, *labels)
+            response = _error_response(str(exc))
+
+        except RequestCancelled as exc:
+            logger.info(str(exc))
+            self._metrics.observe_request("cancelled", time.perf_counter() - start, *labels)
+            response = _error_response(str(exc))
+
+        except DeadlineExceeded as exc:
+            logger.warning(str(exc))
+            self._metrics.observe_request("expired", time.perf_counter() - start, *labels)
+            response = _error_response(str(exc))
+
+        except UpstreamModelError as exc:
+            logger.error(f"Upstream model error: {exc}")
+            self._metrics.observe_request("error", time.perf_counter() - start, *labels)
+            response = _error_response(str(exc))
+
+        except Exception as exc:
+            traceback.print_exc()
+            logger.error(f"Inference error: {exc}")
+            self._metrics.observe_request("error", time.perf_counter() - start, *labels)
+            response = _error_response(str(exc))
+
+        sender.send(response, flags=pb_utils.TRITONSERVER_RESPONSE_COMPLETE_FINAL)
+
+    async def _compute_progressive(self, cache_key: str, config: tuple, client: tuple[str, str], publish):
+        """Compute the previews and final result of one configuration under one scheduler slot.
+
+        Each preview is handed to ``publish(factor, buffers)`` as soon as it
+        is ready; *config* holds the arguments of ``_compute_buffers`` after
+        the cache key and *client* is ``(CLIENT_ID, PRIORITY)``.
+        """
+        async with self._scheduler.admit(*client):
+            # Surface-only requests are cheap already and have no coarse grid to preview.
+            factors = self._progressive_factors if _has_volume_outputs(config[3]) else []
+            for factor in factors:
+                publish(factor, await self._compute_buffers(None, *config, refinement_factor=factor))
+            return await self._compute_buffers(cache_key, *config)
+
+    async def _parse_request(self, request) -> tuple:
+        """Extract and validate the inputs of *request*.
+
+        Returns ``(cache_key, params, stencil_size, batch_size,
+        requested_outputs, sparse_tolerance, precision, deadline)``;
+        everything after the cache key matches the arguments of
+        ``_compute_buffers``.  Raises ``DeadlineExceeded`` if the request's
+        deadline has already passed.
+        """
+        deadline = _extract_deadline(request)
+        _check_deadline(deadline, "preprocessing")
+        stencil_size = _extract_int(request, "STENCIL_SIZE")
+        batch_size = _extract_optional(request, "BATCH_SIZE")
+        batch_size = None if batch_size is None else int(batch_size[0])
+
+        params = _extract_direct_params(request)
+        if params is None:
+            if pb_utils.get_input_tensor_by_name(request, "USD_LAYER") is None:
+                raise ValueError("Request must supply either USD_LAYER and PRIM_PATH or STREAM_VELOCITY")
+            usd_string = _extract_str(request, "USD_LAYER")
+            prim_path = _extract_str(request, "PRIM_PATH")
+            start = time.perf_counter()
+            params = await self._run_cpu(self._parse_params, usd_string, prim_path)
+            self._metrics.observe_stage("usd_parse", time.perf_counter() - start, *_metric_labels(params))
+
+        slice_plane = _extract_slice(request)
+        if slice_plane is not None:
+            params = _slice_params(params, *slice_plane)
+            axis, position, _thickness = slice_plane
+            logger.info(
+                f"Slice mode: {'XYZ'[axis]} = {position} -> layers {params[4][axis]}..{params[5][axis]}"
+            )
+
+        requested_outputs = select_outputs(request.requested_output_names(), self._output_names)
+        sparse_tolerance = _extract_optional(request, "SPARSE_TOLERANCE")
+        sparse_tolerance = self._sparse_tolerance if sparse_tolerance is None else float(sparse_tolerance[0])
+        precision = _extract_optional(request, "PRECISION")
+        precision = self._precision if precision is None else precision[0].decode("utf-8")
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unsupported PRECISION '{precision}'; expected one of {', '.join(PRECISIONS)}")
+        cache_key = await self._run_cpu(
+            self._result_cache_key, params, stencil_size, requested_outputs, sparse_tolerance, precision
+        )
+        return cache_key, params, stencil_size, batch_size, requested_outputs, sparse_tolerance, precision, deadline
+
+    async def _single_flight(self, key: str, compute, on_preview=None) -> dict[str, np.ndarray]:
+        """Run ``await compute()`` at most once per *key* at a time.
+
+        A request whose *key* is already in flight awaits the first request's
+        future and receives the same output buffers instead of repeating the
+        upstream inference; it is counted in ``rtwt_coalesced_requests_total``.
+        An error raised by the first request is re-raised in every waiter, so
+        each still gets its ``ERROR_MESSAGE``, except ``DeadlineExceeded``
+        (``RequestCancelled`` included) and ``SchedulerSaturated``: the first
+        request's deadline, cancellation and scheduler quota say nothing about
+        a waiter's, so a waiter then runs its own *compute*.
+
+        With *on_preview*, *compute* is awaited as ``compute(publish)`` and
+        every ``publish(factor, buffers)`` call is passed on to the
+        *on_preview* of the first request and of each waiter, including the
+        previews published before the waiter joined.
+
+        Requests only overlap within an instance on the decoupled
+        ``rtwt_progressive`` model.  Each ``rtwt`` instance serves one request
+        at a time, so identical requests handled by different ``rtwt``
+        instances are not coalesced; the second one is served from the result
+        cache only if the first has finished by the time it starts.
+        """
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self._metrics.count_coalesced()
+            logger.info(f"Coalesced with the in-flight computation of {key}")
+            if on_preview is not None:
+                flight.subscribe(on_preview)
+            try:
+                return await asyncio.shield(flight.future)
+            except (DeadlineExceeded, SchedulerSaturated) as exc:
+                logger.info(f"Coalesced computation abandoned ({exc}); computing it for this request")
+                return await self._single_flight(key, compute, on_preview)
+            finally:
+                flight.unsubscribe(on_preview)
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the exception as retrieved so a failure nobody else awaited is not reported as unhandled.
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        flight = self._inflight[key] = _Flight(future)
+        try:
+            if on_preview is None:
+                buffers = await compute()
+            else:
+                flight.subscribe(on_preview)
+                buffers = await compute(flight.publish)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(buffers)
+            return buffers
+        finally:
+            del self._inflight[key]
+
+    async def _compute_buffers(
+        self,
+        cache_key: str,
+        params: tuple,
+        stencil_size: int,
+        batch_size: int | None,
+        requested_outputs: list[str],
+        sparse_tolerance: float,
+        precision: str,
+        deadline: _Deadline | None = None,
+        refinement_factor: int = 1,
+    ) -> dict[str, np.ndarray]:
+        """Run inference and NanoVDB encoding for one configuration.
+
+        ``nvdb_*`` outputs go through the volume pipeline; surface outputs
+        need only one upstream ``surface`` call and are returned as per-face
+        ``float32`` arrays.  The result is stored in the result cache under *cache_key* unless it
+        is ``None``.  A *refinement_factor* above 1 evaluates the upstream
+        model only on every ``refinement_factor``-th voxel along each axis,
+        for progressive previews (which leave out surface outputs), and
+        returns that coarse grid as it is: its voxel size is the domain
+        spacing times *refinement_factor* and ``EXTENT_MIN`` / ``EXTENT_MAX``
+        are in its index space, widened to cover the requested domain.  With
+        ``RTWT_CULL_INTERIOR=1``, full-resolution requests skip the voxels
+        inside the car body (see ``_get_interior_mask``).  Work is abandoned
+        with ``DeadlineExceeded`` once *deadline* passes (``RequestCancelled``
+        once the client cancels);
+        it is checked before every upstream call and before encoding.
+        """
+        stream_velocity, model_tag, origin, spacing, extent_min, extent_max = params
+        dims = _domain_dims(extent_min, extent_max)
+        domain = domain_label(dims) if refinement_factor == 1 else f"{domain_label(dims)}/{refinement_factor}"
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+        mesh_tensors = await self._run_cpu(self._get_mesh_tensors, model_tag)
+        timings["mesh_load"] = time.perf_counter() - start
+        if batch_size is None:
+            batch_size = await self._resolve_batch_size(
+                model_tag, mesh_tensors, stream_velocity, stencil_size, origin, spacing, extent_min, dims
+            )
+
+        logger.info("=" * 60)
+        logger.info(f"Model tag: {model_tag}")
+        logger.info(f"Stream velocity: {stream_velocity} m/s")
+        logger.info(f"Stencil size: {stencil_size}")
+        logger.info(f"Batch size: {batch_size}")
+
+        logger.info(f"Requested outputs: {', '.join(requested_outputs)}")
+
+        buffers = {}
+        if _has_volume_outputs(requested_outputs):
+            upstream_fields = sorted({_UPSTREAM_FIELDS[name] for name in requested_outputs if name in _UPSTREAM_FIELDS})
+            interior = None
+            if refinement_factor > 1:
+                # Switch to the coarse lattice (every refinement_factor-th voxel), rounded outwards; everything
+                # below, encoding and the returned extents included, then works on the coarse grid.
+                spacing = spacing * refinement_factor
+                extent_min = np.floor_divide(extent_min, refinement_factor)
+                extent_max = -np.floor_divide(-extent_max, refinement_factor)
+                dims = _domain_dims(extent_min, extent_max)
+                logger.info(f"Refinement factor: {refinement_factor} (coarse dims {tuple(int(v) for v in dims)})")
+                fields = await self._infer_volume(
+                    mesh_tensors,
+                    stream_velocity,
+                    stencil_size,
+                    batch_size,
+                    origin,
+                    spacing,
+                    extent_min,
+                    dims,
+                    upstream_fields,
+                    timings,
+                    deadline=deadline,
                 )
-                outputs.append(
-                    pb_utils.Tensor(
-                        _NANOVDB_OUTPUTS["velocity_magnitude"],
-                        _to_nanovdb_buffer(
-                            velocity_magnitude,
-                            dims=dims,
-                            origin=origin_ijk,
-                            voxel_size=voxel_size,
-                            bg_value=0.0,
-                        ),
+            else:
+                if self._cull_interior:
+                    start = time.perf_counter()
+                    interior = await self._run_cpu(
+                        self._get_interior_mask, model_tag, mesh_tensors, origin, spacing, extent_min, dims
                     )
+                    timings["occupancy"] = time.perf_counter() - start
+                fields = await self._infer_volume(
+                    mesh_tensors,
+                    stream_velocity,
+                    stencil_size,
+                    batch_size,
+                    origin,
+                    spacing,
+                    extent_min,
+                    dims,
+                    upstream_fields,
+                    timings,
+                    interior,
+                    deadline,
                 )
-                outputs.append(
-                    pb_utils.Tensor(
-                        _NANOVDB_OUTPUTS["pressure"],
-                        _to_nanovdb_buffer(
-                            pressure,
-                            dims=dims,
-                            origin=origin_ijk,
-                            voxel_size=voxel_size,
-                            bg_value=0.0,
-                        ),
-                    )
+
+            _check_deadline(deadline, "NanoVDB encoding")
+            nvdb_buffers = await self._run_cpu(
+                _encode_nanovdb_outputs,
+                fields,
+                requested_outputs,
+                dims,
+                spacing,
+                extent_min,
+                self._warp_device,
+                stream_velocity,
+                sparse_tolerance,
+                precision,
+                timings,
+                interior,
+            )
+            logger.info(
+                f"NanoVDB conversion complete ({precision}): "
+                + ", ".join(
+                    f"{name}~{buffer.shape[0] / (1024 * 1024):,.1f} MB" for name, buffer in nvdb_buffers.items()
                 )
+            )
+            buffers.update(nvdb_buffers)
 
-                outputs.append(pb_utils.Tensor("EXTENT_MIN", extent_min))
-                outputs.append(pb_utils.Tensor("EXTENT_MAX", extent_max))
+        surface_fields = sorted(SURFACE_OUTPUTS[name] for name in requested_outputs if name in SURFACE_OUTPUTS)
+        if surface_fields and refinement_factor == 1:
+            fields = await self._infer_surface(
+                mesh_tensors, stream_velocity, stencil_size, batch_size, surface_fields, timings, deadline
+            )
+            for name, upstream_name in SURFACE_OUTPUTS.items():
+                if upstream_name in fields:
+                    buffers[name] = fields[upstream_name]
+            logger.info(f"Surface inference complete ({len(mesh_tensors['faces']):,} faces)")
 
-                logger.info(
-                    "NanoVDB conversion complete: "
-                    + ", ".join(
-                        f"{tensor.name()}~{tensor.shape()[0] / (1024 * 1024):,.1f} MB"
-                        for tensor in outputs
-                        if tensor.name() not in ("ERROR_MESSAGE", "EXTENT_MIN", "EXTENT_MAX")
-                    )
-                )
-                responses.append(pb_utils.InferenceResponse(output_tensors=outputs))
-
-            except Exception as exc:
-                traceback.print_exc()
-                logger.error(f"Inference error: {exc}")
-                responses.append(
-                    pb_utils.InferenceResponse(
-                        output_tensors=[
-                            pb_utils.Tensor("ERROR_MESSAGE", np.array([str(exc)], dtype=np.object_))
-                        ]
-                    )
-                )
+        buffers["EXTENT_MIN"] = extent_min
+        buffers["EXTENT_MAX"] = extent_max
+        if cache_key is not None:
+            await self._run_cpu(self._result_cache.put, cache_key, buffers)
+            logger.info(f"Result cache MISS stored ({self._result_cache.stats()})")
+
+        for stage, seconds in timings.items():
+            self._metrics.observe_stage(stage, seconds, model_tag, domain)
+        self._metrics.update_mesh_cache(len(self._mesh_cache), self._mesh_cache.nbytes)
+        self._metrics.update_warp_memory(self._warp_device)
+        return buffers
+
+    async def _resolve_batch_size(
+        self,
+        model_tag: str,
+        mesh_tensors: dict[str, np.ndarray],
+        stream_velocity: float,
+        stencil_size: int,
+        origin: np.ndarray,
+        spacing: np.ndarray,
+        extent_min: np.ndarray,
+        dims: wp.vec3i,
+    ) -> int:
+        """Return the upstream batch size for a request that did not send ``BATCH_SIZE``.
+
+        A tuned profile for (*model_tag*, domain) wins.  Otherwise, with
+        ``RTWT_AUTOTUNE=1``, a calibration sweep is run (once per pair, even
+        for concurrent requests) and persisted; domains smaller than the
+        largest candidate are not worth calibrating.  Everything else uses
+        ``_DEFAULT_BATCH_SIZE``.
+        """
+        key = profile_key(model_tag, domain_label(dims))
+        tuned = self._batch_profiles.get(key)
+        if tuned is not None:
+            return tuned
+        num_points = int(dims[0]) * int(dims[1]) * int(dims[2])
+        if not self._autotune or num_points < self._autotune_candidates[-1]:
+            return _DEFAULT_BATCH_SIZE
+        return await self._single_flight(
+            f"autotune:{key}",
+            functools.partial(
+                self._calibrate_batch_size,
+                key,
+                mesh_tensors,
+                stream_velocity,
+                stencil_size,
+                origin,
+                spacing,
+                extent_min,
+                dims,
+            ),
+        )
 
-        return responses
+    async def _calibrate_batch_size(
+        self,
+        key: str,
+        mesh_tensors: dict[str, np.ndarray],
+        stream_velocity: float,
+        stencil_size: int,
+        origin: np.ndarray,
+        spacing: np.ndarray,
+        extent_min: np.ndarray,
+        dims: wp.vec3i,
+    ) -> int:
+        """Sweep the candidate batch sizes on the first points of the domain and persist the fastest."""
+        num_points = self._autotune_candidates[-1]
+        points = await self._run_cpu(_build_point_slab, origin, spacing, extent_min, dims, 0, num_points)
+        timings = {"upstream_wait": 0.0, "upstream": 0.0}
+
+        async def run(batch_size: int) -> None:
+            await self._infer_points(
+                mesh_tensors, stream_velocity, stencil_size, batch_size, points, ["pressure"], timings
+            )
+
+        def fits() -> bool:
+            device = wp.get_device(self._warp_device)
+            return not device.is_cuda or device.free_memory >= self._autotune_min_free_bytes
+
+        logger.info(f"Calibrating batch size for {key} on {num_points:,} points")
+        start = time.perf_counter()
+        trials = await sweep(run, self._autotune_candidates, num_points, fits)
+        batch_size = select_batch_size(trials)
+        logger.info(
+            f"Calibration took {time.perf_counter() - start:.1f} s: "
+            + ", ".join(f"{b}: {'n/a' if t is None else f'{t:,.0f} pts/s'}" for b, t in trials)
+        )
+        if batch_size is None:
+            logger.warning(f"No batch size candidate fit for {key}; using {_DEFAULT_BATCH_SIZE}")
+            return _DEFAULT_BATCH_SIZE
+        await self._run_cpu(self._batch_profiles.put, key, batch_size, trials)
+        logger.info(f"Tuned batch size for {key}: {batch_size}")
+        return batch_size
+
+    async def _run_cpu(self, func, *args):
+        """Run a blocking, CPU-heavy callable on the worker pool without stalling the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._cpu_pool, functools.partial(func, *args))
 
     def finalize(self) -> None:
         """Called by Triton when the model is being unloaded."""
+        self._cpu_pool.shutdown(wait=False)
         logger.info("Finalized")
 
+    def _parse_params(
+        self, usd_string: str, prim_path: str
+    ) -> tuple[float, str, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the inference parameters for a serialised layer and prim path.
+
+        Results are memoised in ``_param_cache`` keyed by a SHA-256 of the
+        layer text and *prim_path*, so repeated requests for the same layer
+        (pre-caching, slider scrubbing) skip USD parsing and composition.
+        """
+        h = hashlib.sha256(usd_string.encode("utf-8"))
+        h.update(b"\0")
+        h.update(prim_path.encode("utf-8"))
+        key = h.hexdigest()
+
+        params = self._param_cache.get(key)
+        if params is None:
+            stage = _load_stage_from_string(usd_string, self._base_layer)
+            params = self._extract_params_from_stage(stage, prim_path)
+            self._param_cache.put(key, params)
+            logger.info(f"Parameter cache MISS ({self._param_cache.stats()})")
+        else:
+            logger.info(f"Parameter cache HIT ({self._param_cache.stats()})")
+        return params
+
     def _extract_params_from_stage(
         self, stage: Usd.Stage, prim_path: str
     ) -> tuple[float, str, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
@@ -280,27 +1403,100 @@ class TritonPythonModel:
         logger.info(f"Extracted from USD: model_tag={model_tag}, stream_velocity={stream_velocity}")
         return stream_velocity, model_tag, origin, spacing, extent_min, extent_max
 
+    def _result_cache_key(
+        self, params: tuple, stencil_size: int, requested_outputs: list[str], sparse_tolerance: float, precision: str
+    ) -> str:
+        """Return the result cache key for a fully specified inference configuration.
+
+        *params* is the ``(stream_velocity, model_tag, origin, spacing,
+        extent_min, extent_max)`` tuple; *sparse_tolerance* and *precision*
+        are part of the key because they change the encoded buffers.  The mesh is identified by the content
+        hash of its file rather than by the tag alone, so replacing a mesh
+        under the same tag never serves stale results.
+        """
+        stream_velocity, model_tag, origin, spacing, extent_min, extent_max = params
+        h = hashlib.sha256()
+        for part in (
+            model_tag,
+            self._get_mesh_hash(model_tag),
+            repr(float(stream_velocity)),
+            repr(origin.tolist()),
+            repr(spacing.tolist()),
+            repr(extent_min.tolist()),
+            repr(extent_max.tolist()),
+            str(stencil_size),
+            ",".join(requested_outputs),
+            repr(float(sparse_tolerance)),
+            precision,
+        ):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _get_mesh_hash(self, model_tag: str) -> str:
+        """Return (and cache) the SHA-256 of the mesh file for *model_tag*, without parsing it.
+
+        The hash recorded in the mesh store is used when the tag is served
+        from there, so the source file is not read at all.
+        """
+        if self._mesh_store is not None and (sha256 := self._mesh_store.sha256(model_tag)) is not None:
+            return sha256
+        mesh_path = self._resolve_model_path(model_tag)
+        if mesh_path not in self._mesh_hashes:
+            self._mesh_hashes[mesh_path] = file_sha256(mesh_path)
+        return self._mesh_hashes[mesh_path]
+
     def _get_mesh_tensors(self, model_tag: str) -> dict[str, np.ndarray]:
         """Load and cache the surface mesh for *model_tag*.
 
         Returns a dict with keys ``vertices``, ``faces``, ``centers``,
         ``surface_normals``, and ``surface_areas`` as ``float32`` / ``int32``
         NumPy arrays, ready to be passed directly to the upstream Triton model.
-        Meshes are kept in ``_mesh_cache`` so repeated requests for the same
+        Tags present in the mesh store are memory-mapped from their bundle;
+        anything else is loaded with trimesh.  Either way the tensors are kept
+        in the byte-budgeted ``_mesh_cache`` so repeated requests for the same
         tag skip disk I/O.
         """
-        mesh_path = self._resolve_model_path(model_tag)
-        if mesh_path not in self._mesh_cache:
+        tensors = self._mesh_cache.get(model_tag)
+        if tensors is not None:
+            return tensors
+        if self._mesh_store is not None and (tensors := self._mesh_store.open(model_tag)) is not None:
+            logger.info(f"Mapped mesh bundle for {model_tag}")
+        else:
+            mesh_path = self._resolve_model_path(model_tag)
             logger.info(f"Loading mesh: {mesh_path}")
-            mesh = trimesh.load_mesh(str(mesh_path), process=False)
-            self._mesh_cache[mesh_path] = {
-                "vertices": np.asarray(mesh.vertices, dtype=np.float32),
-                "faces": np.asarray(mesh.faces, dtype=np.int32),
-                "centers": np.asarray(mesh.triangles_center, dtype=np.float32),
-                "surface_normals": np.asarray(mesh.face_normals, dtype=np.float32),
-                "surface_areas": np.asarray(mesh.area_faces, dtype=np.float32),
-            }
-        return self._mesh_cache[mesh_path]
+            tensors = compute_mesh_tensors(mesh_path)
+        self._mesh_cache.put(model_tag, tensors)
+        return tensors
+
+    def _get_interior_mask(
+        self,
+        model_tag: str,
+        mesh_tensors: dict[str, np.ndarray],
+        origin: np.ndarray,
+        spacing: np.ndarray,
+        extent_min: np.ndarray,
+        dims: wp.vec3i,
+    ) -> np.ndarray:
+        """Return (and cache) the flat mask of voxels strictly inside the mesh for *model_tag*.
+
+        Masks are keyed by mesh content hash and grid definition, so one is
+        computed per car and domain (or slice) and reused for every velocity.
+        """
+        key = (
+            self._get_mesh_hash(model_tag),
+            np.asarray(origin, dtype=np.float32).tobytes(),
+            np.asarray(spacing, dtype=np.float32).tobytes(),
+            np.asarray(extent_min, dtype=np.int32).tobytes(),
+            tuple(int(n) for n in dims),
+        )
+        mask = self._occupancy_cache.get(key)
+        if mask is None:
+            mask = interior_mask(
+                mesh_tensors["vertices"], mesh_tensors["faces"], origin, spacing, extent_min, tuple(dims)
+            )
+            self._occupancy_cache.put(key, mask)
+        return mask
 
     def _resolve_model_path(self, model_tag: str) -> Path:
         """Resolve *model_tag* to an absolute mesh path under ``_model_root``.
@@ -317,33 +1513,134 @@ class TritonPythonModel:
             raise FileNotFoundError(f"Model mesh not found for tag '{model_tag}' at {candidate}")
         return candidate
 
-    def _build_point_cloud(
-        self, origin: np.ndarray, spacing: np.ndarray, extent_min: np.ndarray, extent_max: np.ndarray
-    ) -> tuple[np.ndarray, wp.vec3i]:
-        """Build a dense point-cloud over the voxel domain.
+    async def _infer_volume(
+        self,
+        mesh_tensors: dict[str, np.ndarray],
+        stream_velocity: float,
+        stencil_size: int,
+        batch_size: int,
+        origin: np.ndarray,
+        spacing: np.ndarray,
+        extent_min: np.ndarray,
+        dims: wp.vec3i,
+        upstream_fields: list[str],
+        timings: dict[str, float] | None = None,
+        interior: np.ndarray | None = None,
+        deadline: _Deadline | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Run the upstream model over the whole voxel domain, one slab at a time.
+
+        The dense point-cloud is never materialised: IJK slabs of
+        ``batch_size * _chunk_batches`` points are generated lazily on the
+        worker pool, sent to ``model`` as individual requests, and their
+        results written straight into preallocated buffers in Fortran
+        (IJK-major) order.  Only the fields in *upstream_fields*
+        (``velocity`` → ``(N, 3)``, ``pressure`` → ``(N,)``) are requested
+        and returned.  When *timings* is given, the time spent building
+        slabs (``point_cloud``), waiting for an upstream slot
+        (``upstream_wait``) and in upstream calls (``upstream``) is summed
+        into it.  Voxels flagged in the flat *interior* mask are not sent
+        upstream and read back as zeros; slabs lying wholly inside the body
+        are skipped.  *deadline* is checked before every upstream call.
+        """
+        if timings is None:
+            timings = {}
+        for stage in ("point_cloud", "upstream_wait", "upstream"):
+            timings.setdefault(stage, 0.0)
+        num_points = int(dims[0]) * int(dims[1]) * int(dims[2])
+        slab_size = num_points if self._chunk_batches <= 0 else max(batch_size, 1) * self._chunk_batches
+        num_slabs = -(-num_points // slab_size)
+        logger.info(
+            f"Point cloud dims: {tuple(int(v) for v in dims)} ({num_points:,} samples, {num_slabs} slab(s))"
+        )
+
+        if interior is not None:
+            logger.info(f"Culled {int(np.count_nonzero(interior)):,} interior samples")
+
+        allocate = np.empty if interior is None else np.zeros
+        fields = {
+            name: allocate((num_points, 3) if name == "velocity" else num_points, dtype=np.float32)
+            for name in upstream_fields
+        }
+        for start in range(0, num_points, slab_size):
+            stop = min(start + slab_size, num_points)
+            slab_start = time.perf_counter()
+            index = None
+            if interior is not None:
+                index = start + np.flatnonzero(~interior[start:stop])
+                if index.size == 0:
+                    continue
+            points = await self._run_cpu(_build_point_slab, origin, spacing, extent_min, dims, start, stop, index)
+            timings["point_cloud"] += time.perf_counter() - slab_start
+            logger.info(f"Sending inference request to 'model' (points {start:,}-{stop:,}, {len(points):,} sent)")
+            slab_fields = await self._infer_points(
+                mesh_tensors, stream_velocity, stencil_size, batch_size, points, upstream_fields, timings, deadline
+            )
+            for name, values in slab_fields.items():
+                if index is None:
+                    fields[name][start:stop] = values
+                else:
+                    fields[name][index] = values
+        return fields
+
+    async def _infer_surface(
+        self,
+        mesh_tensors: dict[str, np.ndarray],
+        stream_velocity: float,
+        stencil_size: int,
+        batch_size: int,
+        upstream_fields: list[str],
+        timings: dict[str, float],
+        deadline: _Deadline | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Predict per-face *upstream_fields* on the surface mesh with one upstream ``surface`` call.
+
+        Returned arrays are aligned with ``mesh_tensors["faces"]``: scalars
+        have shape ``(F,)`` and vectors ``(F, 3)``.  Slot wait and call time
+        are added to *timings* under ``upstream_wait`` and
+        ``upstream_surface``.  Raises ``DeadlineExceeded`` if *deadline*
+        passes while waiting for an upstream slot.
+        """
+        infer_request = _make_upstream_request(
+            mesh_tensors, stream_velocity, stencil_size, batch_size, None, upstream_fields
+        )
+        start = time.perf_counter()
+        async with self._upstream_slots:
+            acquired = time.perf_counter()
+            _check_deadline(deadline, "the upstream call")
+            result = await infer_request.async_exec()
+        timings["upstream_wait"] = timings.get("upstream_wait", 0.0) + acquired - start
+        timings["upstream_surface"] = time.perf_counter() - acquired
+        return _read_upstream_fields(result, upstream_fields)
+
+    async def _infer_points(
+        self,
+        mesh_tensors: dict[str, np.ndarray],
+        stream_velocity: float,
+        stencil_size: int,
+        batch_size: int,
+        point_cloud: np.ndarray,
+        upstream_fields: list[str],
+        timings: dict[str, float],
+        deadline: _Deadline | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Send one point-cloud slab to the upstream model.
 
-        Generates world-space XYZ coordinates for every voxel centre in the
-        IJK range ``[extent_min, extent_max]`` (inclusive) using the grid
-        *origin* and *spacing*.  Returns ``(point_cloud, dims)`` where
-        ``point_cloud`` has shape ``(N, 3)`` in Fortran (IJK-major) order and
-        ``dims`` is the corresponding ``wp.vec3i`` voxel count.
+        Only *upstream_fields* (plus ``ERROR_MESSAGE``) are requested.  Returns
+        a dict with ``velocity`` of shape ``(N, 3)`` and/or ``pressure`` of
+        shape ``(N,)``.  Raises ``UpstreamModelError`` if the upstream model
+        reports an error.  Slot wait and call time are added to *timings*.
+        *deadline* is checked once an upstream slot is acquired, so work
+        queued behind other calls is dropped once it has expired.
         """
-        ii = np.arange(extent_min[0], extent_max[0] + 1, dtype=np.float32)
-        jj = np.arange(extent_min[1], extent_max[1] + 1, dtype=np.float32)
-        kk = np.arange(extent_min[2], extent_max[2] + 1, dtype=np.float32)
-        gi, gj, gk = np.meshgrid(ii, jj, kk, indexing="ij")
-        point_cloud = np.stack(
-            [
-                origin[0] + gi * spacing[0],
-                origin[1] + gj * spacing[1],
-                origin[2] + gk * spacing[2],
-            ],
-            axis=-1,
-        ).reshape(-1, 3, order="F")
-
-        dims = wp.vec3i(
-            int(extent_max[0] - extent_min[0] + 1),
-            int(extent_max[1] - extent_min[1] + 1),
-            int(extent_max[2] - extent_min[2] + 1),
+        infer_request = _make_upstream_request(
+            mesh_tensors, stream_velocity, stencil_size, batch_size, point_cloud, upstream_fields
         )
-        return np.asarray(point_cloud, dtype=np.float32), dims
+        start = time.perf_counter()
+        async with self._upstream_slots:
+            acquired = time.perf_counter()
+            _check_deadline(deadline, "the upstream call")
+            result = await infer_request.async_exec()
+        timings["upstream_wait"] += acquired - start
+        timings["upstream"] += time.perf_counter() - acquired
+        return _read_upstream_fields(result, upstream_fields)
@@ -0,0 +1,76 @@
+"""Output selection for ``rtwt`` requests.
+
+The ``nvdb_*`` grids come from the volume pipeline; the per-face surface
+outputs need an extra upstream ``surface`` call, so they are only computed
+for clients that ask for them.  Triton complicates "asking": when a client
+names no outputs, the model is handed every output of its config, surface
+outputs included.  :func:`select_outputs` therefore reads a request for
+every declared output as a request without a preference.
+
+The surface outputs also rely on the upstream model accepting
+``INFERENCE_MODE`` and returning the fields in :data:`SURFACE_OUTPUTS`;
+:func:`check_upstream_config` checks its ``config.pbtxt`` for them at start-up.
+"""
+
+import re
+from collections.abc import Iterable
+
+NANOVDB_OUTPUTS = {
+    "velocity": "nvdb_velocity",
+    "velocity_magnitude": "nvdb_velocity_magnitude",
+    "pressure": "nvdb_pressure",
+}
+# Per-face surface outputs and the upstream field each is read from; they come
+# from a single ``INFERENCE_MODE = "surface"`` call on the mesh tensors.
+SURFACE_OUTPUTS = {
+    "surface_pressure": "pressure_surface",
+    "surface_wall_shear_stress": "wall_shear_stress",
+}
+
+# Tensors ``rtwt`` relies on in the upstream model, by ``config.pbtxt`` list.
+UPSTREAM_TENSORS = {
+    "input": ("INFERENCE_MODE",),
+    "output": ("velocity", "pressure", *SURFACE_OUTPUTS.values()),
+}
+
+
+def select_outputs(requested: Iterable[str], declared: Iterable[str]) -> list[str]:
+    """Return the sorted ``nvdb_*`` and surface outputs to compute for a request.
+
+    *requested* are the output names Triton hands the model for the request
+    and *declared* every output of the model config.  A request that names
+    none of the outputs above, or every declared output (which is what a
+    client naming none looks like), gets every ``nvdb_*`` output and no
+    surface output.
+    """
+    requested = set(requested)
+    if requested >= set(declared):
+        requested = set()
+    names = {name for name in requested if name in NANOVDB_OUTPUTS.values() or name in SURFACE_OUTPUTS}
+    return sorted(names or NANOVDB_OUTPUTS.values())
+
+
+def check_upstream_config(config: str) -> tuple[list[str], list[str]]:
+    """Check the text of the upstream model's ``config.pbtxt`` for :data:`UPSTREAM_TENSORS`.
+
+    Returns ``(missing, unchecked)``: the tensors a declared ``input`` or
+    ``output`` list lacks, e.g. ``"output wall_shear_stress"``, and the lists
+    the config leaves out entirely for Triton to auto-complete, which cannot
+    be checked here.
+    """
+    declared: dict[str, set[str]] = {}
+    for match in re.finditer(r"^(input|output)\s*:?\s*[\[{]", config, re.MULTILINE):
+        depth = 0
+        for end in range(match.end() - 1, len(config)):
+            depth += {"[": 1, "{": 1, "]": -1, "}": -1}.get(config[end], 0)
+            if depth == 0:
+                break
+        names = re.findall(r'\bname\s*:\s*"([^"]+)"', config[match.end() : end])
+        declared.setdefault(match.group(1), set()).update(names)
+    missing, unchecked = [], []
+    for kind, names in UPSTREAM_TENSORS.items():
+        if kind not in declared:
+            unchecked.append(kind)
+            continue
+        missing += [f"{kind} {name}" for name in names if name not in declared[kind]]
+    return missing, unchecked
@@ -0,0 +1,164 @@
+"""Admission control and fair scheduling of ``rtwt_progressive`` requests across clients.
+
+Every Kit instance of a deployment shares one ``rtwt_progressive`` model
+instance, whose decoupled ``execute`` calls run side by side, so a bulk
+pre-cache from one client could otherwise fill the upstream queue ahead of
+another client's interactive requests.  ``rtwt`` needs no scheduler of its
+own: each of its instances serves one request at a time, and Triton's
+priority queue (see its ``config.pbtxt``) orders and bounds the requests
+waiting for one.  :class:`FairScheduler` admits at
+most ``max_active`` computations at a time, and at most
+``client_max_active`` per ``CLIENT_ID``.  Requests over those limits wait in
+a queue that is served in this order:
+
+1. ``interactive`` before ``precache`` (the ``PRIORITY`` input);
+2. across clients, the one admitted least recently first (round robin);
+3. within a client, oldest first.
+
+A request that cannot start at once is rejected straight away when the queue
+already holds ``max_queue`` requests of its priority or higher, or
+``client_max_queue`` from its client, rather than queueing behind work it
+would time out on.
+
+Only computations are scheduled: result-cache hits and requests coalesced
+onto an in-flight computation never take a slot.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import time
+from collections import defaultdict
+
+PRIORITIES = ("interactive", "precache")
+DEFAULT_CLIENT_ID = "anonymous"
+
+
+class SchedulerSaturated(RuntimeError):
+    """Raised when a request is rejected because the scheduler's queue limits are reached."""
+
+
+class _Waiter:
+    __slots__ = ("client_id", "priority", "seq", "future")
+
+    def __init__(self, client_id: str, priority: str, seq: int, future: asyncio.Future):
+        self.client_id = client_id
+        self.priority = priority
+        self.seq = seq
+        self.future = future
+
+
+class FairScheduler:
+    """Per-client concurrency quotas, bounded queues and priority ordering for ``rtwt_progressive`` computations.
+
+    *metrics* is an ``RtwtMetrics`` instance that receives queue depths and
+    wait times.  The scheduler must only be used from the model's event loop.
+    """
+
+    def __init__(
+        self,
+        max_active: int,
+        client_max_active: int,
+        max_queue: int,
+        client_max_queue: int,
+        metrics=None,
+    ):
+        self._max_active = max(max_active, 1)
+        self._client_max_active = max(client_max_active, 1)
+        self._max_queue = max(max_queue, 0)
+        self._client_max_queue = max(client_max_queue, 0)
+        self._metrics = metrics
+        self._active: dict[str, int] = defaultdict(int)
+        self._total_active = 0
+        self._queue: list[_Waiter] = []
+        self._last_admitted: dict[str, int] = {}
+        self._seq = itertools.count()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self._max_active} active ({self._client_max_active} per client), "
+            f"{self._max_queue} queued ({self._client_max_queue} per client)"
+        )
+
+    @contextlib.asynccontextmanager
+    async def admit(self, client_id: str, priority: str):
+        """Wait for a computation slot for *client_id* and hold it for the ``async with`` body.
+
+        Raises ``ValueError`` for an unknown *priority* and
+        ``SchedulerSaturated`` when the request can neither start nor be
+        queued.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unsupported PRIORITY '{priority}'; expected one of {', '.join(PRIORITIES)}")
+        waiter = _Waiter(client_id, priority, next(self._seq), asyncio.get_running_loop().create_future())
+        self._queue.append(waiter)
+        self._dispatch()
+        if not waiter.future.done():
+            self._reject_if_saturated(waiter)
+
+        start = time.perf_counter()
+        self._publish()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(client_id)
+            else:
+                self._queue.remove(waiter)
+                self._publish()
+            raise
+        if self._metrics is not None:
+            self._metrics.observe_queue_wait(priority, time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release(client_id)
+
+    def _reject_if_saturated(self, waiter: _Waiter) -> None:
+        # Lower-priority requests do not count against the queue limit, so pre-cache traffic cannot fill
+        # the queue and turn interactive requests away.
+        rank = PRIORITIES.index(waiter.priority)
+        queued = sum(1 for other in self._queue if PRIORITIES.index(other.priority) <= rank) - 1
+        client_queued = sum(1 for other in self._queue if other.client_id == waiter.client_id) - 1
+        if queued >= self._max_queue:
+            reason = f"{queued} requests of priority '{waiter.priority}' or higher are queued (limit {self._max_queue})"
+        elif client_queued >= self._client_max_queue:
+            reason = (
+                f"client '{waiter.client_id}' has {client_queued} queued requests (limit {self._client_max_queue})"
+            )
+        else:
+            return
+        self._queue.remove(waiter)
+        raise SchedulerSaturated(f"rtwt is saturated: {reason}; retry later")
+
+    def _release(self, client_id: str) -> None:
+        self._active[client_id] -= 1
+        if not self._active[client_id]:
+            del self._active[client_id]
+        self._total_active -= 1
+        self._dispatch()
+        self._publish()
+
+    def _dispatch(self) -> None:
+        """Grant slots to the best eligible waiters while capacity remains."""
+        while self._total_active < self._max_active:
+            eligible = [w for w in self._queue if self._active.get(w.client_id, 0) < self._client_max_active]
+            if not eligible:
+                return
+            waiter = min(
+                eligible,
+                key=lambda w: (PRIORITIES.index(w.priority), self._last_admitted.get(w.client_id, -1), w.seq),
+            )
+            self._queue.remove(waiter)
+            self._active[waiter.client_id] += 1
+            self._total_active += 1
+            self._last_admitted[waiter.client_id] = next(self._seq)
+            waiter.future.set_result(None)
+
+    def _publish(self) -> None:
+        if self._metrics is None:
+            return
+        depths = {priority: 0 for priority in PRIORITIES}
+        for waiter in self._queue:
+            depths[waiter.priority] += 1
+        self._metrics.update_scheduler(depths, self._total_active)
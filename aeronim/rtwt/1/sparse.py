@@ -0,0 +1,155 @@
+"""Freestream-aware sparse NanoVDB encoding for the ``rtwt`` model.
+
+Far from the car most of the wind-tunnel box carries the undisturbed
+freestream, so storing it voxel by voxel is wasted bandwidth.  The helpers
+here mark every NanoVDB leaf tile (8x8x8 voxels) that holds at least one
+voxel deviating from the freestream by more than a tolerance, allocate only
+those tiles, and use the freestream value as the grid background so that
+samplers reading inactive regions still see the expected value.
+
+Tile allocation is only supported by Warp on CUDA devices.
+"""
+
+import numpy as np
+import warp as wp
+
+_TILE_SIZE = wp.constant(8)
+
+
+@wp.func
+def _mark_tile(
+    tid: int,
+    dims: wp.vec3i,
+    origin: wp.vec3i,
+    tile_min: wp.vec3i,
+    tile_dims: wp.vec3i,
+    tile_flags: wp.array(dtype=wp.int32),
+):
+    # Voxels are stored in Fortran (IJK-major) order, see ``_build_point_slab``.
+    i = tid % dims[0]
+    j = (tid // dims[0]) % dims[1]
+    k = tid // (dims[0] * dims[1])
+    # Index from the floored first tile so the dividend is never negative: Warp's ``//`` truncates toward zero.
+    ti = (origin[0] - tile_min[0] * _TILE_SIZE + i) // _TILE_SIZE
+    tj = (origin[1] - tile_min[1] * _TILE_SIZE + j) // _TILE_SIZE
+    tk = (origin[2] - tile_min[2] * _TILE_SIZE + k) // _TILE_SIZE
+    tile_flags[ti + tile_dims[0] * (tj + tile_dims[1] * tk)] = 1
+
+
+@wp.kernel
+def _mark_active_tiles_vec3(
+    values: wp.array(dtype=wp.vec3f),
+    bg_value: wp.vec3f,
+    tolerance: float,
+    dims: wp.vec3i,
+    origin: wp.vec3i,
+    tile_min: wp.vec3i,
+    tile_dims: wp.vec3i,
+    tile_flags: wp.array(dtype=wp.int32),
+):
+    tid = wp.tid()
+    if wp.length(values[tid] - bg_value) > tolerance:
+        _mark_tile(tid, dims, origin, tile_min, tile_dims, tile_flags)
+
+
+@wp.kernel
+def _mark_active_tiles_float(
+    values: wp.array(dtype=wp.float32),
+    bg_value: float,
+    tolerance: float,
+    dims: wp.vec3i,
+    origin: wp.vec3i,
+    tile_min: wp.vec3i,
+    tile_dims: wp.vec3i,
+    tile_flags: wp.array(dtype=wp.int32),
+):
+    tid = wp.tid()
+    if wp.abs(values[tid] - bg_value) > tolerance:
+        _mark_tile(tid, dims, origin, tile_min, tile_dims, tile_flags)
+
+
+@wp.kernel
+def _store_vec3(volume: wp.uint64, values: wp.array(dtype=wp.vec3f), dims: wp.vec3i, origin: wp.vec3i):
+    tid = wp.tid()
+    i = tid % dims[0]
+    j = (tid // dims[0]) % dims[1]
+    k = tid // (dims[0] * dims[1])
+    # Stores into unallocated tiles are ignored by Warp, so pruned voxels keep the background.
+    wp.volume_store(volume, origin[0] + i, origin[1] + j, origin[2] + k, values[tid])
+
+
+@wp.kernel
+def _store_float(volume: wp.uint64, values: wp.array(dtype=wp.float32), dims: wp.vec3i, origin: wp.vec3i):
+    tid = wp.tid()
+    i = tid % dims[0]
+    j = (tid // dims[0]) % dims[1]
+    k = tid // (dims[0] * dims[1])
+    wp.volume_store(volume, origin[0] + i, origin[1] + j, origin[2] + k, values[tid])
+
+
+def to_sparse_nanovdb_buffer(
+    wp_array: wp.array,
+    dims: wp.vec3i,
+    origin: wp.vec3i,
+    voxel_size: wp.vec3f,
+    bg_value,
+    tolerance: float,
+    device: str,
+) -> tuple[np.ndarray, int]:
+    """Encode *wp_array* as a NanoVDB grid that only allocates tiles deviating from *bg_value*.
+
+    A tile stays active if any of its voxels differs from *bg_value* by more
+    than *tolerance* (Euclidean distance for ``vec3f`` arrays, absolute
+    difference for ``float32`` arrays).  Returns the flat ``uint8`` buffer
+    and the number of allocated voxels.
+    """
+    num_points = int(dims[0]) * int(dims[1]) * int(dims[2])
+    tile_points = wp.array(
+        _active_tiles(wp_array, dims, origin, bg_value, tolerance, device), dtype=wp.vec3i, device=device
+    )
+
+    volume = wp.Volume.allocate_by_tiles(
+        tile_points,
+        voxel_size=[float(voxel_size[0]), float(voxel_size[1]), float(voxel_size[2])],
+        bg_value=bg_value,
+        device=device,
+    )
+    wp.launch(
+        _store_vec3 if wp_array.dtype == wp.vec3f else _store_float,
+        dim=num_points,
+        inputs=[volume.id, wp_array, dims, origin],
+        device=device,
+    )
+    return volume.array().numpy(), volume.get_voxel_count()
+
+
+def _active_tiles(
+    wp_array: wp.array, dims: wp.vec3i, origin: wp.vec3i, bg_value, tolerance: float, device: str
+) -> np.ndarray:
+    """Return the ``(N, 3)`` ``int32`` index-space origins of the tiles holding a voxel deviating from *bg_value*."""
+    num_points = int(dims[0]) * int(dims[1]) * int(dims[2])
+    origin_np = np.array([int(origin[0]), int(origin[1]), int(origin[2])], dtype=np.int32)
+    dims_np = np.array([int(dims[0]), int(dims[1]), int(dims[2])], dtype=np.int32)
+    tile_min_np = origin_np // _TILE_SIZE
+    tile_dims_np = (origin_np + dims_np - 1) // _TILE_SIZE - tile_min_np + 1
+    tile_min = wp.vec3i(*tile_min_np.tolist())
+    tile_dims = wp.vec3i(*tile_dims_np.tolist())
+
+    vector = wp_array.dtype == wp.vec3f
+    tile_flags = wp.zeros(int(np.prod(tile_dims_np)), dtype=wp.int32, device=device)
+    wp.launch(
+        _mark_active_tiles_vec3 if vector else _mark_active_tiles_float,
+        dim=num_points,
+        inputs=[wp_array, bg_value, float(tolerance), dims, origin, tile_min, tile_dims],
+        outputs=[tile_flags],
+        device=device,
+    )
+
+    active = np.flatnonzero(tile_flags.numpy())
+    if active.size == 0:
+        # NanoVDB needs at least one leaf; keep the first tile of the domain.
+        active = np.zeros(1, dtype=np.int64)
+    ti = active % tile_dims_np[0]
+    tj = (active // tile_dims_np[0]) % tile_dims_np[1]
+    tk = active // (tile_dims_np[0] * tile_dims_np[1])
+    return ((np.stack([ti, tj, tk], axis=1) + tile_min_np) * _TILE_SIZE).astype(np.int32)
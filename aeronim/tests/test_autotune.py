@@ -0,0 +1,98 @@
+"""Tests for the batch-size autotuning of the ``rtwt`` model."""
+
+import asyncio
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "rtwt"))
+autotune = importlib.import_module("1.autotune")
+
+
+def _sweep(run, candidates, num_points=1000, fits=None):
+    return asyncio.run(autotune.sweep(run, candidates, num_points, fits))
+
+
+def test_sweep_runs_candidates_smallest_first_after_an_untimed_warm_up():
+    calls = []
+
+    async def run(batch_size):
+        calls.append(batch_size)
+
+    trials = _sweep(run, [64, 16, 0, 32, 16])
+
+    assert calls == [16, 16, 32, 64]
+    assert [batch_size for batch_size, _throughput in trials] == [16, 32, 64]
+    assert all(throughput > 0 for _batch_size, throughput in trials)
+    assert _sweep(run, []) == []
+
+
+def test_sweep_stops_at_the_first_candidate_that_does_not_fit():
+    async def run(batch_size):
+        if batch_size >= 64:
+            raise MemoryError
+
+    trials = _sweep(run, [16, 32, 64, 128])
+    assert [batch_size for batch_size, _throughput in trials] == [16, 32, 64]
+    assert trials[-1][1] is None
+
+    # Leaving too little memory free counts as not fitting as well.
+    free = iter([True, False, True])
+    trials = _sweep(lambda _batch_size: asyncio.sleep(0), [16, 32, 64], fits=lambda: next(free))
+    assert [throughput is None for _batch_size, throughput in trials] == [False, True]
+
+
+def test_sweep_reraises_a_warm_up_failure():
+    async def run(_batch_size):
+        raise RuntimeError("upstream model unavailable")
+
+    with pytest.raises(RuntimeError):
+        _sweep(run, [16, 32])
+
+
+def test_select_prefers_the_smallest_batch_size_that_is_about_as_fast():
+    assert autotune.select_batch_size([(16, 50.0), (32, 98.0), (64, 100.0), (128, None)]) == 32
+    assert autotune.select_batch_size([(16, 50.0), (32, 80.0), (64, 100.0)]) == 64
+    assert autotune.select_batch_size([(16, None)]) is None
+    assert autotune.select_batch_size([]) is None
+
+
+def test_profiles_persist_and_reload(tmp_path):
+    path = tmp_path / "profiles" / "batch_sizes.json"
+    key = autotune.profile_key("low_res/detailed_car_510/aero_suv_low.ply", "domain")
+    profiles = autotune.BatchSizeProfiles(path)
+    profiles.put(key, 32, [(16, 50.04), (32, 98.0), (64, None)])
+
+    data = json.loads(path.read_text())
+    assert data["version"] == 1
+    assert data["profiles"][key]["trials"] == [[16, 50.0], [32, 98.0], [64, None]]
+    assert [p.name for p in path.parent.iterdir()] == [path.name]
+
+    reloaded = autotune.BatchSizeProfiles(path)
+    assert len(reloaded) == 1 and reloaded.get(key) == 32
+    assert reloaded.get("other@domain") is None
+
+
+def test_profiles_written_by_another_instance_are_kept(tmp_path):
+    path = tmp_path / "batch_sizes.json"
+    first = autotune.BatchSizeProfiles(path)
+    second = autotune.BatchSizeProfiles(path)
+    first.put("a@b", 16, [(16, 1.0)])
+    second.put("c@d", 32, [(32, 1.0)])
+
+    reloaded = autotune.BatchSizeProfiles(path)
+    assert (reloaded.get("a@b"), reloaded.get("c@d")) == (16, 32)
+
+
+@pytest.mark.parametrize("content", ["not json", json.dumps({"version": 0, "profiles": {"a@b": {"batch_size": 1}}})])
+def test_unreadable_or_incompatible_profiles_are_ignored(tmp_path, content):
+    path = tmp_path / "batch_sizes.json"
+    path.write_text(content)
+    profiles = autotune.BatchSizeProfiles(path)
+    assert len(profiles) == 0
+
+    profiles.put("a@b", 16, [(16, 1.0)])
+    assert autotune.BatchSizeProfiles(path).get("a@b") == 16
@@ -0,0 +1,81 @@
+"""Tests for the parameter and result caches of the ``rtwt`` model."""
+
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("loguru")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "rtwt"))
+cache = importlib.import_module("1.cache")
+
+
+def _buffers(nbytes: int, fill: int) -> dict[str, np.ndarray]:
+    return {"nvdb_pressure": np.full(nbytes, fill, dtype=np.uint8), "EXTENT_MIN": np.zeros(0, dtype=np.int32)}
+
+
+def test_lru_evicts_least_recently_used_first():
+    evicted = []
+    lru = cache.LRUCache(max_entries=2, on_evict=lambda key, _value: evicted.append(key))
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1  # "b" is now the least recently used entry
+    lru.put("c", 3)
+
+    assert evicted == ["b"]
+    assert "b" not in lru and lru.get("a") == 1 and lru.get("c") == 3
+    assert (lru.hits, lru.misses) == (3, 0)
+
+
+def test_lru_byte_budget_and_replacement():
+    evicted = []
+    lru = cache.LRUCache(max_bytes=10, sizeof=len, on_evict=lambda key, _value: evicted.append(key))
+    lru.put("a", b"1234")
+    lru.put("b", b"1234")
+    lru.put("a", b"123456")  # replacing an entry refreshes it and updates its size
+    assert lru.nbytes == 10 and evicted == []
+
+    lru.put("c", b"1")
+    assert evicted == ["b"]
+    assert lru.nbytes == 7
+    assert lru.get("b") is None and lru.misses == 1
+
+
+def test_result_cache_spills_evictions_and_promotes_them_back(tmp_path):
+    results = cache.ResultCache(max_bytes=100, spill_dir=tmp_path, max_spill_bytes=1 << 20)
+    results.put("first", _buffers(80, 1))
+    results.put("second", _buffers(80, 2))  # pushes "first" out of memory onto disk
+
+    assert [path.name for path in tmp_path.glob("*.npz")] == ["first.npz"]
+    promoted = results.get("first")
+    assert promoted is not None and results.disk_hits == 1
+    np.testing.assert_array_equal(promoted["nvdb_pressure"], np.full(80, 1, dtype=np.uint8))
+    # Promoting "first" evicted "second", which is now spilled as well.
+    assert sorted(path.name for path in tmp_path.glob("*.npz")) == ["first.npz", "second.npz"]
+    assert results.get("missing") is None
+
+
+def test_result_cache_trims_spill_dir_least_recently_used_first(tmp_path):
+    with (tmp_path / "probe").open("wb") as f:
+        np.savez(f, **_buffers(80, 0))
+    entry_bytes = (tmp_path / "probe").stat().st_size
+    (tmp_path / "probe").unlink()
+
+    results = cache.ResultCache(max_bytes=100, spill_dir=tmp_path, max_spill_bytes=2 * entry_bytes)
+    for key in ("a", "b", "c"):
+        results.put(key, _buffers(80, 0))  # spills "a", then "b"
+    os.utime(tmp_path / "a.npz", (1, 1))
+    # The disk hit marks "a.npz" as recently used; promoting it spills "c" and the trim drops "b.npz".
+    assert results.get("a") is not None
+
+    assert sorted(path.name for path in tmp_path.glob("*.npz")) == ["a.npz", "c.npz"]
+
+
+def test_result_cache_ignores_unreadable_spill_entries(tmp_path):
+    (tmp_path / "broken.npz").write_bytes(b"not an npz file")
+    results = cache.ResultCache(max_bytes=100, spill_dir=tmp_path, max_spill_bytes=1 << 20)
+    assert results.get("broken") is None
@@ -0,0 +1,65 @@
+"""Tests for the reduced-precision payloads of the ``rtwt`` model and the Kit decoder mirroring them."""
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_ROOT / "aeronim" / "rtwt"))
+encoding = importlib.import_module("1.encoding")
+
+_spec = importlib.util.spec_from_file_location(
+    "kit_encoding", _ROOT / "source" / "extensions" / "omni.rtwt.inference" / "python" / "encoding.py"
+)
+kit_encoding = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(kit_encoding)
+
+_GRID = ((5, 4, 3), (-2, 0, 7), (0.5, 0.5, 0.25))
+
+
+@pytest.mark.parametrize("components", [1, 3])
+@pytest.mark.parametrize("precision, atol", [("float16", 1e-2), ("quantized16", 50.0 / 65535)])
+def test_round_trip_through_server_and_kit_decoders(components, precision, atol):
+    rng = np.random.default_rng(0)
+    shape = (60,) if components == 1 else (60, 3)
+    values = rng.uniform(-25.0, 25.0, size=shape).astype(np.float32)
+
+    buffer = encoding.encode_dense(values, precision, *_GRID)
+    assert buffer.dtype == np.uint8
+    assert encoding.is_encoded(buffer) and kit_encoding.is_encoded(buffer)
+
+    for decoder in (encoding.decode_dense, kit_encoding.decode_dense):
+        decoded, dims, origin, voxel_size = decoder(buffer)
+        assert decoded.shape == shape and decoded.dtype == np.float32
+        np.testing.assert_allclose(decoded, values, atol=atol)
+        assert (dims, origin, voxel_size) == _GRID
+
+
+def test_quantized_constant_field_is_exact():
+    values = np.full(8, 3.5, dtype=np.float32)
+    decoded, *_grid = encoding.decode_dense(encoding.encode_dense(values, "quantized16", *_GRID))
+    np.testing.assert_array_equal(decoded, values)
+
+
+def test_nanovdb_buffers_and_float32_are_not_payloads():
+    assert not encoding.is_encoded(np.zeros(128, dtype=np.uint8))
+    with pytest.raises(ValueError):
+        encoding.encode_dense(np.zeros(4, dtype=np.float32), "float32", *_GRID)
+    with pytest.raises(ValueError):
+        kit_encoding.decode_dense(np.zeros(128, dtype=np.uint8))
+
+
+def test_kit_decodes_only_reduced_precision_nanovdb_outputs(monkeypatch):
+    monkeypatch.setattr(kit_encoding, "to_nanovdb", lambda buffer, device: ("grid", device))
+    payload = encoding.encode_dense(np.zeros(8, dtype=np.float32), "float16", *_GRID)
+    grid = np.zeros(128, dtype=np.uint8)
+    extent = np.zeros(3, dtype=np.int32)
+
+    decoded = kit_encoding.decode_outputs({"nvdb_pressure": payload, "nvdb_velocity": grid, "EXTENT_MIN": extent}, "cpu")
+    assert decoded["nvdb_pressure"] == ("grid", "cpu")
+    assert decoded["nvdb_velocity"] is grid and decoded["EXTENT_MIN"] is extent
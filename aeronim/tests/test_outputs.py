@@ -0,0 +1,77 @@
+"""Tests for the output selection of the ``rtwt`` model."""
+
+import importlib
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+_RTWT = Path(__file__).resolve().parents[1] / "rtwt"
+sys.path.insert(0, str(_RTWT))
+outputs = importlib.import_module("1.outputs")
+
+_NANOVDB = ["nvdb_pressure", "nvdb_velocity", "nvdb_velocity_magnitude"]
+
+
+def _declared_outputs(model: str) -> list[str]:
+    """Output names of a model config, read from its ``output [...]`` block."""
+    config = (_RTWT.parent / model / "config.pbtxt").read_text()
+    block = config[config.index("\noutput [") : config.index("\n]", config.index("\noutput ["))]
+    return re.findall(r'name: "(\w+)"', block)
+
+
+@pytest.mark.parametrize("model", ["rtwt", "rtwt_progressive"])
+def test_request_naming_no_outputs_gets_nanovdb_only(model):
+    declared = _declared_outputs(model)
+    assert set(outputs.SURFACE_OUTPUTS) <= set(declared)
+
+    assert outputs.select_outputs([], declared) == _NANOVDB
+    # Triton hands the model every declared output when the client names none.
+    assert outputs.select_outputs(declared, declared) == _NANOVDB
+
+
+def test_surface_outputs_only_when_named():
+    declared = _declared_outputs("rtwt")
+
+    assert outputs.select_outputs(["surface_pressure", "ERROR_MESSAGE"], declared) == ["surface_pressure"]
+    assert outputs.select_outputs(["nvdb_velocity", "surface_wall_shear_stress", "EXTENT_MIN"], declared) == [
+        "nvdb_velocity",
+        "surface_wall_shear_stress",
+    ]
+    assert outputs.select_outputs(["EXTENT_MIN", "EXTENT_MAX", "ERROR_MESSAGE"], declared) == _NANOVDB
+
+
+_UPSTREAM_CONFIG = """
+name: "model"
+backend: "python"
+input [
+  { name: "POINT_CLOUD", data_type: TYPE_FP32, dims: [-1, 3], optional: true },
+  { name: "INFERENCE_MODE", data_type: TYPE_STRING, dims: [1] }
+]
+output [
+  { name: "velocity", data_type: TYPE_FP32, dims: [-1, 3] },
+  { name: "pressure", data_type: TYPE_FP32, dims: [-1, 1] },
+  { name: "pressure_surface", data_type: TYPE_FP32, dims: [-1, 1] },
+  { name: "wall_shear_stress", data_type: TYPE_FP32, dims: [-1, 3] }
+]
+instance_group [{ name: "gpu", kind: KIND_GPU }]
+"""
+
+
+def test_upstream_config_with_every_tensor_passes():
+    assert outputs.check_upstream_config(_UPSTREAM_CONFIG) == ([], [])
+    # The repeated-field form of the lists is read the same way.
+    repeated = 'input { name: "INFERENCE_MODE" dims: [1] }\n' + "\n".join(
+        f'output {{ name: "{name}" dims: [-1] }}' for name in outputs.UPSTREAM_TENSORS["output"]
+    )
+    assert outputs.check_upstream_config(repeated) == ([], [])
+
+
+def test_upstream_config_missing_tensors_are_reported():
+    config = _UPSTREAM_CONFIG.replace('"INFERENCE_MODE"', '"MODE"').replace('"wall_shear_stress"', '"wss"')
+    assert outputs.check_upstream_config(config) == (["input INFERENCE_MODE", "output wall_shear_stress"], [])
+
+
+def test_auto_completed_upstream_config_cannot_be_checked():
+    assert outputs.check_upstream_config('name: "model"\nbackend: "python"\n') == ([], ["input", "output"])
@@ -0,0 +1,37 @@
+"""Tests for the sparse NanoVDB tile selection of the ``rtwt`` model."""
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+wp = pytest.importorskip("warp")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "rtwt"))
+sparse = importlib.import_module("1.sparse")
+
+
+def _reference_tiles(values: np.ndarray, origin, bg_value: float, tolerance: float) -> set[tuple[int, int, int]]:
+    """Tile origins holding a deviating voxel, computed with numpy's flooring division."""
+    i, j, k = np.nonzero(np.abs(values - bg_value) > tolerance)
+    tiles = (np.stack([i, j, k], axis=1) + np.asarray(origin)) // 8 * 8
+    return {tuple(tile) for tile in tiles.tolist()}
+
+
+@pytest.mark.parametrize("origin", [(-20, -13, -8), (-9, 3, -1), (5, 8, 16)])
+def test_active_tiles_match_numpy_reference(origin):
+    wp.init()
+    dims = (37, 22, 19)
+    rng = np.random.default_rng(0)
+    values = np.zeros(dims, dtype=np.float32)
+    # Deviating voxels on both sides of index zero and on the domain corners.
+    for voxel in rng.integers(0, dims, size=(40, 3)).tolist() + [[0, 0, 0], [dims[0] - 1, dims[1] - 1, dims[2] - 1]]:
+        values[tuple(voxel)] = 1.0
+
+    # Voxels are passed in Fortran (IJK-major) order like the model does.
+    wp_array = wp.array(values.ravel(order="F"), dtype=wp.float32, device="cpu")
+    tiles = sparse._active_tiles(wp_array, wp.vec3i(*dims), wp.vec3i(*origin), 0.0, 0.5, "cpu")
+
+    assert {tuple(tile) for tile in tiles.tolist()} == _reference_tiles(values, origin, 0.0, 0.5)
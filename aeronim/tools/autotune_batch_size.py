@@ -0,0 +1,105 @@
+"""Run the ``rtwt`` batch-size calibration sweep against a stand-in upstream model.
+
+The stand-in replaces the DoMINO ``model`` with a cost and memory model, so
+the sweep and selection logic of ``aeronim/rtwt/1/autotune.py`` can be
+exercised (and its parameters explored) without a GPU.  Each simulated call
+of ``--points`` points takes::
+
+    ceil(points / batch) * (overhead + batch * point_cost * (1 + batch / knee))
+
+and fails when ``batch * bytes_per_point`` exceeds the device memory, like an
+out-of-memory error from the real model.  With ``--profile`` the selected
+batch size is written to a profile file that ``RTWT_AUTOTUNE_PROFILE`` can
+point at.
+
+Usage::
+
+    python aeronim/tools/autotune_batch_size.py --memory-gib 16 --knee 400000
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "rtwt" / "1"))
+from autotune import DEFAULT_CANDIDATES, BatchSizeProfiles, profile_key, select_batch_size, sweep  # noqa: E402
+
+
+class StandInModel:
+    """Simulated upstream model: sleeps for the modelled call time and tracks memory in use."""
+
+    def __init__(self, overhead_s: float, point_cost_s: float, knee: float, bytes_per_point: float, memory: float):
+        self._overhead_s = overhead_s
+        self._point_cost_s = point_cost_s
+        self._knee = knee
+        self._bytes_per_point = bytes_per_point
+        self._memory = memory
+        self.in_use = 0.0
+
+    def call_seconds(self, num_points: int, batch_size: int) -> float:
+        per_batch = self._overhead_s + batch_size * self._point_cost_s * (1.0 + batch_size / self._knee)
+        return math.ceil(num_points / batch_size) * per_batch
+
+    async def infer(self, num_points: int, batch_size: int) -> None:
+        self.in_use = batch_size * self._bytes_per_point
+        if self.in_use > self._memory:
+            raise MemoryError(f"out of memory at batch size {batch_size}")
+        await asyncio.sleep(self.call_seconds(num_points, batch_size))
+
+    def free_memory(self) -> float:
+        return self._memory - self.in_use
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--points", type=int, default=max(DEFAULT_CANDIDATES), help="Points per calibration call")
+    parser.add_argument(
+        "--candidates",
+        type=lambda value: [int(c) for c in value.split(",")],
+        default=list(DEFAULT_CANDIDATES),
+        help="Comma-separated batch sizes to try",
+    )
+    parser.add_argument("--overhead-ms", type=float, default=20.0, help="Fixed cost per upstream batch")
+    parser.add_argument("--point-cost-us", type=float, default=0.5, help="Cost per point at small batch sizes")
+    parser.add_argument("--knee", type=float, default=400_000, help="Batch size at which per-point cost doubles")
+    parser.add_argument("--bytes-per-point", type=float, default=24 * 1024, help="Device memory per batched point")
+    parser.add_argument("--memory-gib", type=float, default=16.0, help="Device memory of the stand-in GPU")
+    parser.add_argument("--min-free-gib", type=float, default=1.0, help="Same as RTWT_AUTOTUNE_MIN_FREE_BYTES")
+    parser.add_argument("--model-tag", default="low_res/detailed_car_500/aero_suv_low.ply")
+    parser.add_argument("--domain", default="301x81x71", help="Domain label the profile is stored under")
+    parser.add_argument("--profile", type=Path, help="Profile file to write the selected batch size to")
+    args = parser.parse_args()
+
+    model = StandInModel(
+        args.overhead_ms / 1e3,
+        args.point_cost_us / 1e6,
+        args.knee,
+        args.bytes_per_point,
+        args.memory_gib * 1024**3,
+    )
+
+    async def run(batch_size: int) -> None:
+        await model.infer(args.points, batch_size)
+
+    trials = asyncio.run(
+        sweep(run, args.candidates, args.points, lambda: model.free_memory() >= args.min_free_gib * 1024**3)
+    )
+    for batch_size, throughput in trials:
+        result = "does not fit" if throughput is None else f"{throughput:>12,.0f} pts/s"
+        print(f"{batch_size:>9,}  {result}")
+
+    batch_size = select_batch_size(trials)
+    if batch_size is None:
+        print("No candidate fit")
+        sys.exit(1)
+    print(f"Selected batch size: {batch_size:,}")
+    if args.profile is not None:
+        key = profile_key(args.model_tag, args.domain)
+        BatchSizeProfiles(args.profile).put(key, batch_size, trials)
+        print(f"Wrote {key} to {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
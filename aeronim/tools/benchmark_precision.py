@@ -0,0 +1,116 @@
+"""Benchmark the ``rtwt`` output precisions across the Base.usda domain resolutions.
+
+For every domain refinement and precision (``float32``, ``float16``,
+``quantized16``) this reports the encoded bytes per grid, the encode time and
+the maximum absolute error after decoding.  ``float32`` is measured as a
+NanoVDB grid when ``warp`` and ``dav`` are importable and as the raw dense
+``float32`` payload otherwise.
+
+Fields are synthetic (freestream plus a wake disturbance) unless ``--fields``
+points to an ``.npz`` with ``velocity`` ``(N, 3)`` and ``pressure`` ``(N,)``
+arrays sampled on the chosen domain.
+
+Usage::
+
+    python aeronim/tools/benchmark_precision.py --resolutions 2M 14M
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "rtwt" / "1"))
+from encoding import PRECISIONS, decode_dense, encode_dense  # noqa: E402
+
+# Domain refinement variants from stages/Base.usda: (spacing, min extent, max extent).
+_DOMAINS = {
+    "2M": (0.036, (-50, -40, -10), (250, 40, 60)),
+    "14M": (0.018, (-100, -80, -20), (500, 80, 120)),
+    "108M": (0.009, (-200, -160, -40), (1000, 160, 240)),
+}
+
+
+def _synthetic_fields(dims: tuple[int, int, int], spacing: float, extent_min, stream_velocity: float):
+    """Return a freestream velocity / zero pressure field with a Gaussian wake behind the origin."""
+    rng = np.random.default_rng(0)
+    i, j, k = (np.arange(n, dtype=np.float32) for n in dims)
+    x = ((i + extent_min[0]) * spacing)[:, None, None]
+    y = ((j + extent_min[1]) * spacing)[None, :, None]
+    z = ((k + extent_min[2]) * spacing)[None, None, :]
+    wake = np.exp(-((y**2 + (z - 0.7) ** 2) / 0.5) - np.maximum(x - 2.0, 0.0) / 4.0) * (x > 0)
+    wake = wake.transpose(2, 1, 0).reshape(-1).astype(np.float32)  # Fortran (IJK-major) order
+
+    num_points = wake.size
+    velocity = np.zeros((num_points, 3), dtype=np.float32)
+    velocity[:, 0] = stream_velocity * (1.0 - 0.8 * wake)
+    velocity[:, 1:] = stream_velocity * 0.1 * wake[:, None] * rng.standard_normal((num_points, 2), dtype=np.float32)
+    pressure = (-0.5 * 1.225 * stream_velocity**2 * wake).astype(np.float32)
+    return velocity, pressure
+
+
+def _encode_float32(values: np.ndarray, dims, origin, spacing: float) -> np.ndarray:
+    try:
+        import dav
+        import warp as wp
+    except ImportError:
+        return values.reshape(-1).view(np.uint8)
+
+    device = "cuda" if wp.is_cuda_available() else "cpu"
+    if values.ndim == 2:
+        wp_array, bg_value = wp.array(values, dtype=wp.vec3f, device=device), wp.vec3f(0.0, 0.0, 0.0)
+    else:
+        wp_array, bg_value = wp.array(values, dtype=wp.float32, device=device), 0.0
+    field = dav.Field.from_array(wp_array, dav.AssociationType.VERTEX)
+    nvdb_field = field.to_nanovdb(
+        dims=wp.vec3i(*dims),
+        origin=wp.vec3i(*origin),
+        voxel_size=wp.vec3f(spacing, spacing, spacing),
+        bg_value=bg_value,
+        device=device,
+    )
+    return nvdb_field.get_data().array().numpy()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resolutions", nargs="+", choices=list(_DOMAINS), default=list(_DOMAINS))
+    parser.add_argument("--stream-velocity", type=float, default=30.0)
+    parser.add_argument("--fields", type=Path, help="Optional .npz with velocity / pressure arrays")
+    args = parser.parse_args()
+
+    print(f"{'domain':>6} {'grid':>18} {'precision':>11} {'MB':>10} {'encode s':>9} {'max abs err':>12}")
+    for resolution in args.resolutions:
+        spacing, extent_min, extent_max = _DOMAINS[resolution]
+        dims = tuple(hi - lo + 1 for lo, hi in zip(extent_min, extent_max))
+        if args.fields:
+            with np.load(args.fields) as npz:
+                velocity, pressure = npz["velocity"], npz["pressure"]
+        else:
+            velocity, pressure = _synthetic_fields(dims, spacing, extent_min, args.stream_velocity)
+        grids = {
+            "velocity": velocity,
+            "velocity_magnitude": np.linalg.norm(velocity, axis=1).astype(np.float32),
+            "pressure": pressure,
+        }
+
+        for name, values in grids.items():
+            for precision in PRECISIONS:
+                start = time.perf_counter()
+                if precision == "float32":
+                    buffer = _encode_float32(values, dims, extent_min, spacing)
+                    elapsed, error = time.perf_counter() - start, 0.0
+                else:
+                    buffer = encode_dense(values, precision, dims, extent_min, (spacing, spacing, spacing))
+                    elapsed = time.perf_counter() - start
+                    error = float(np.abs(decode_dense(buffer)[0] - values).max())
+                print(
+                    f"{resolution:>6} {name:>18} {precision:>11} {buffer.nbytes / (1024 * 1024):>10.1f} "
+                    f"{elapsed:>9.3f} {error:>12.3e}"
+                )
+
+
+if __name__ == "__main__":
+    main()
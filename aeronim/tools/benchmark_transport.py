@@ -0,0 +1,248 @@
+"""Benchmark HTTP against gRPC for ``rtwt`` results, using a local stand-in Triton server.
+
+The stand-in server speaks the Triton HTTP/REST (with the binary tensor
+extension) and gRPC protocols for a single ``rtwt`` model.  For each request it
+returns dense ``float32`` payloads for every output Base.usda requests
+(``nvdb_velocity``, ``nvdb_velocity_magnitude`` and ``nvdb_pressure``), sized
+for one of its domain resolutions (the ``DOMAIN`` input), which is close to
+the size of the real NanoVDB results.
+
+Every (transport, resolution) pair runs in a fresh client process that keeps
+one long-lived ``tritonclient`` aio client, like the Kit extension does.  Each
+process reports its throughput, its median request latency and its peak
+resident set size.  The ``108M`` payloads take about 2.17 GB per response,
+over gRPC's 2 GiB message limit, so gRPC fails there; the Kit extension
+requests such results over HTTP.
+
+Usage::
+
+    python aeronim/tools/benchmark_transport.py --resolutions 2M 14M --repeats 5
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# Domain refinement variants from stages/Base.usda: (min extent, max extent).
+_DOMAINS = {
+    "2M": ((-50, -40, -10), (250, 40, 60)),
+    "14M": ((-100, -80, -20), (500, 80, 120)),
+    "108M": ((-200, -160, -40), (1000, 160, 240)),
+}
+_TRANSPORTS = ("http", "grpc")
+_MAX_MESSAGE_BYTES = 2**31 - 1
+
+
+def _num_points(resolution: str) -> int:
+    extent_min, extent_max = _DOMAINS[resolution]
+    return int(np.prod([hi - lo + 1 for lo, hi in zip(extent_min, extent_max)]))
+
+
+class _Payloads:
+    """Serialised stand-in outputs per resolution, built on first use."""
+
+    def __init__(self):
+        self._outputs: dict[str, dict[str, tuple[str, list[int], bytes]]] = {}
+
+    def get(self, resolution: str) -> dict[str, tuple[str, list[int], bytes]]:
+        from tritonclient.utils import serialize_byte_tensor
+
+        if resolution not in self._outputs:
+            num_points = _num_points(resolution)
+            extent_min, extent_max = _DOMAINS[resolution]
+            rng = np.random.default_rng(0)
+            velocity = rng.standard_normal(num_points * 3, dtype=np.float32).view(np.uint8)
+            magnitude = rng.standard_normal(num_points, dtype=np.float32).view(np.uint8)
+            pressure = rng.standard_normal(num_points, dtype=np.float32).view(np.uint8)
+            self._outputs[resolution] = {
+                "nvdb_velocity": ("UINT8", [velocity.size], velocity.tobytes()),
+                "nvdb_velocity_magnitude": ("UINT8", [magnitude.size], magnitude.tobytes()),
+                "nvdb_pressure": ("UINT8", [pressure.size], pressure.tobytes()),
+                "EXTENT_MIN": ("INT32", [3], np.array(extent_min, dtype=np.int32).tobytes()),
+                "EXTENT_MAX": ("INT32", [3], np.array(extent_max, dtype=np.int32).tobytes()),
+                "ERROR_MESSAGE": ("BYTES", [1], serialize_byte_tensor(np.array([b""], dtype=np.object_)).tobytes()),
+            }
+        return self._outputs[resolution]
+
+
+async def _serve(http_port: int, grpc_port: int) -> None:
+    """Run the stand-in server until interrupted."""
+    import grpc
+    from aiohttp import web
+    from tritonclient.grpc import service_pb2, service_pb2_grpc
+
+    payloads = _Payloads()
+
+    async def http_live(_request):
+        return web.Response()
+
+    async def http_infer(request):
+        body = await request.read()
+        header_length = int(request.headers.get("Inference-Header-Content-Length", len(body)))
+        header = json.loads(body[:header_length])
+        resolution = "2M"
+        offset = header_length
+        for tensor in header.get("inputs", []):
+            size = tensor.get("parameters", {}).get("binary_data_size", 0)
+            if tensor["name"] == "DOMAIN":
+                resolution = body[offset + 4 : offset + size].decode("utf-8")
+            offset += size
+        outputs = payloads.get(resolution)
+        names = [output["name"] for output in header.get("outputs", [])] or list(outputs)
+        response = {"model_name": "rtwt", "id": header.get("id", ""), "outputs": []}
+        for name in names:
+            datatype, shape, data = outputs[name]
+            response["outputs"].append(
+                {"name": name, "datatype": datatype, "shape": shape, "parameters": {"binary_data_size": len(data)}}
+            )
+        response_header = json.dumps(response).encode("utf-8")
+        return web.Response(
+            body=b"".join([response_header, *(outputs[name][2] for name in names)]),
+            content_type="application/octet-stream",
+            headers={"Inference-Header-Content-Length": str(len(response_header))},
+        )
+
+    class Servicer(service_pb2_grpc.GRPCInferenceServiceServicer):
+        async def ServerLive(self, request, context):
+            return service_pb2.ServerLiveResponse(live=True)
+
+        async def ModelInfer(self, request, context):
+            resolution = "2M"
+            for tensor, raw in zip(request.inputs, request.raw_input_contents):
+                if tensor.name == "DOMAIN":
+                    resolution = raw[4:].decode("utf-8")
+            outputs = payloads.get(resolution)
+            names = [output.name for output in request.outputs] or list(outputs)
+            response = service_pb2.ModelInferResponse(model_name="rtwt", id=request.id)
+            for name in names:
+                datatype, shape, data = outputs[name]
+                response.outputs.add(name=name, datatype=datatype, shape=shape)
+                response.raw_output_contents.append(data)
+            return response
+
+    app = web.Application(client_max_size=_MAX_MESSAGE_BYTES)
+    app.router.add_get("/v2/health/live", http_live)
+    app.router.add_post("/v2/models/rtwt/infer", http_infer)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", http_port).start()
+
+    server = grpc.aio.server(
+        options=[
+            ("grpc.max_send_message_length", _MAX_MESSAGE_BYTES),
+            ("grpc.max_receive_message_length", _MAX_MESSAGE_BYTES),
+        ]
+    )
+    service_pb2_grpc.add_GRPCInferenceServiceServicer_to_server(Servicer(), server)
+    server.add_insecure_port(f"127.0.0.1:{grpc_port}")
+    await server.start()
+    print("ready", flush=True)
+    try:
+        await server.wait_for_termination()
+    finally:
+        await runner.cleanup()
+
+
+async def _run_client(transport: str, url: str, resolution: str, repeats: int) -> dict:
+    """Time *repeats* requests for *resolution* over one client and return the measurements."""
+    if transport == "grpc":
+        from tritonclient.grpc import InferInput, InferRequestedOutput
+        from tritonclient.grpc.aio import InferenceServerClient
+
+        client = InferenceServerClient(
+            url=url,
+            channel_args=[
+                ("grpc.max_send_message_length", _MAX_MESSAGE_BYTES),
+                ("grpc.max_receive_message_length", _MAX_MESSAGE_BYTES),
+            ],
+        )
+    else:
+        from tritonclient.http import InferInput, InferRequestedOutput
+        from tritonclient.http.aio import InferenceServerClient
+
+        client = InferenceServerClient(url=url, conn_limit=8)
+
+    inputs = [InferInput("DOMAIN", [1], "BYTES")]
+    inputs[0].set_data_from_numpy(np.array([resolution], dtype=np.object_))
+    fields = ["nvdb_velocity", "nvdb_velocity_magnitude", "nvdb_pressure"]
+    names = [*fields, "EXTENT_MIN", "EXTENT_MAX", "ERROR_MESSAGE"]
+    outputs = [InferRequestedOutput(name) for name in names]
+
+    latencies, nbytes = [], 0
+    try:
+        for _ in range(repeats + 1):
+            start = time.perf_counter()
+            response = await client.infer(model_name="rtwt", inputs=inputs, outputs=outputs)
+            arrays = [response.as_numpy(name) for name in fields]
+            latencies.append(time.perf_counter() - start)
+            nbytes = sum(array.nbytes for array in arrays)
+    finally:
+        await client.close()
+
+    # The first request includes connection setup, which a long-lived client only pays once.
+    latencies = latencies[1:]
+    return {
+        "mb_per_s": nbytes * len(latencies) / sum(latencies) / (1024 * 1024),
+        "median_s": statistics.median(latencies),
+        "response_mb": nbytes / (1024 * 1024),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resolutions", nargs="+", choices=list(_DOMAINS), default=list(_DOMAINS))
+    parser.add_argument("--transports", nargs="+", choices=_TRANSPORTS, default=list(_TRANSPORTS))
+    parser.add_argument("--repeats", type=int, default=3, help="Timed requests per transport and resolution")
+    parser.add_argument("--http-port", type=int, default=18080)
+    parser.add_argument("--grpc-port", type=int, default=18001)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--client", choices=_TRANSPORTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        asyncio.run(_serve(args.http_port, args.grpc_port))
+        return
+    if args.client:
+        port = args.grpc_port if args.client == "grpc" else args.http_port
+        result = asyncio.run(_run_client(args.client, f"127.0.0.1:{port}", args.resolutions[0], args.repeats))
+        print(json.dumps(result))
+        return
+
+    ports = ["--http-port", str(args.http_port), "--grpc-port", str(args.grpc_port)]
+    server = subprocess.Popen([sys.executable, __file__, "--serve", *ports], stdout=subprocess.PIPE, text=True)
+    try:
+        if server.stdout.readline().strip() != "ready":
+            sys.exit("Stand-in server failed to start")
+        print(f"{'domain':>6} {'transport':>9} {'response MB':>12} {'MB/s':>9} {'median s':>9} {'peak RSS MB':>12}")
+        for resolution in args.resolutions:
+            for transport in args.transports:
+                client = subprocess.run(
+                    [sys.executable, __file__, "--client", transport, "--resolutions", resolution, *ports]
+                    + ["--repeats", str(args.repeats)],
+                    capture_output=True,
+                    text=True,
+                )
+                if client.returncode != 0:
+                    error = (client.stderr.strip().splitlines() or ["failed"])[-1]
+                    print(f"{resolution:>6} {transport:>9}  {error}")
+                    continue
+                result = json.loads(client.stdout)
+                print(
+                    f"{resolution:>6} {transport:>9} {result['response_mb']:>12.1f} {result['mb_per_s']:>9.1f} "
+                    f"{result['median_s']:>9.3f} {result['peak_rss_mb']:>12.1f}"
+                )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Build the memory-mapped mesh store served by the ``rtwt`` model.
+
+Every ``*.ply`` under ``--model-root`` is converted into one bundle holding
+the five mesh tensors the upstream model expects plus the file's SHA-256,
+and an ``index.json`` maps model tags (paths relative to the model root, as
+used by ``omni:rtwt:model:tag``) to bundles.  Meshes with identical content
+share a bundle.  Point ``RTWT_MESH_STORE`` at the output directory to enable
+it; re-run the tool whenever meshes change (stale entries are ignored by the
+model and the mesh is loaded directly).
+
+Usage::
+
+    python aeronim/tools/build_mesh_store.py --model-root data --output data/mesh_store
+"""
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "rtwt"))
+mesh_store = importlib.import_module("1.mesh_store")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model-root", type=Path, required=True, help="Directory that RTWT_MODEL_ROOT points to")
+    parser.add_argument("--output", type=Path, required=True, help="Mesh store directory to (re)write")
+    parser.add_argument("--pattern", default="**/*.ply", help="Glob for mesh files under the model root")
+    args = parser.parse_args()
+
+    model_root = args.model_root.resolve()
+    args.output.mkdir(parents=True, exist_ok=True)
+
+    entries = {}
+    for mesh_path in sorted(model_root.glob(args.pattern)):
+        tag, entry = mesh_store.build_entry(model_root, mesh_path, args.output)
+        entries[tag] = entry
+        print(f"{tag} -> {entry['file']}")
+
+    mesh_store.write_index(args.output, entries)
+    referenced = {entry["file"] for entry in entries.values()}
+    for stale in args.output.glob("*.bin"):
+        if stale.name not in referenced:
+            stale.unlink()
+    print(f"Wrote {len(entries)} mesh(es) ({len(referenced)} bundle(s)) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@
 #   KIT_APP                  — kit app bundle to launch (default: omni.rtwt.webrtc.kit)
 #   NIM_TRITON_IP_ADDRESS    — Triton host (default: localhost; compose sets "aeronim")
 #   NIM_TRITON_HTTP_PORT     — Triton port (default: 8080)
+#   NIM_TRITON_GRPC_PORT     — Triton gRPC port, used for progressive results (default: 8001)
 #   RTWT_OFFLINE_MODE        — if set, run omni.rtwt.inference in offline/cache mode
 #   SenderTimeout            — StreamSDK watchdog in ms (default: 100000)
 #   USER_ID                  — informational only; warns if unset
@@ -68,6 +69,7 @@ ARGS=(
     "--/app/viewport/forceHideFps=true"                            # hide FPS overlay in stream
     "--/exts/omni.kit.benchmark.main/carb_profiling_enabled=false" # no perf tracing overhead
     "--/exts/omni.rtwt.inference/triton_http_url=${NIM_TRITON_IP_ADDRESS:-localhost}:${NIM_TRITON_HTTP_PORT:-8080}"
+    "--/exts/omni.rtwt.inference/triton_grpc_url=${NIM_TRITON_IP_ADDRESS:-localhost}:${NIM_TRITON_GRPC_PORT:-8001}"
     "--/persistent/app/usd/muteUsdDiagnostics=false"               # surface USD composition warnings
 )
 
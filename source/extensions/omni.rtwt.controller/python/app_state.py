@@ -11,6 +11,7 @@
 from logging import getLogger
 
 import omni.timeline
+from carb.settings import get_settings
 from omni.cae.viz.execution_context import ExecutionContext
 from omni.cae.viz.operator import operator
 from omni.cae.schema import viz as cae_viz
@@ -33,7 +34,7 @@ class AppStateOperator:
 
     - Car variant sets (Spoiler / Rims / Mirrors) on CarHero and CarCFD.
     - CAE visualization mode and slice-direction variant sets.
-    - Inference velocity attribute on the Inference prim.
+    - Inference velocity and slice-plane attributes on the Inference prim.
     - Colormap domains and material shader domains derived from the velocity.
     - Streamlines material binding (AnimatedStreaks vs ScalarColor).
     - Slider-driven transforms on all RtwtTransformAPI prims.
@@ -170,8 +171,31 @@ class AppStateOperator:
             else:
                 logger.warning("Streamlines material not found: %s", mat_path)
 
-        # Apply slider-driven transforms via the ROI bounding box.
+        # With slice inference enabled, tell the inference operator in Slice mode which plane is visible
+        # so it can infer only that plane. The axis is read from the composed slice prototype once the
+        # SliceDirection variant above has taken effect (the CAE frame is rotated, so UI direction and
+        # domain axis differ); the position is the same ROI mapping the slice prims are moved with.
+        # Otherwise the attributes are left alone, so scrubbing the slider does not re-run inference.
         roi_prim = usd_utils.get_target_prim(prim, "omni:rtwt:app_state:roi")
+        settings = get_settings()
+        slice_inference = settings.get_as_bool("/exts/omni.rtwt.inference/slice_inference") and not (
+            settings.get_as_bool("/exts/omni.rtwt.inference/offline_mode")
+        )
+        if slice_inference and (inference_prim := stage.GetPrimAtPath("/World/Inference")):
+            slice_axis = "none"
+            if viz_mode == "Slice" and (slice_prim := stage.GetPrimAtPath("/World/CAE/PlanarSlice_Prototype")):
+                slice_mode = slice_prim.GetAttribute("cae:viz:planarSlice:mode").Get()
+                slice_axis = slice_mode if slice_mode in ("x", "y", "z") else "none"
+            with Sdf.ChangeBlock():
+                if slice_axis != "none" and (attr := inference_prim.GetAttribute("omni:rtwt:inference:slicePosition")):
+                    axis_idx = {"x": 0, "y": 1, "z": 2}[slice_axis]
+                    position = float(utils.map_slider_to_roi(roi_prim, slider_value)[axis_idx])
+                    if attr.Get() != position:
+                        attr.Set(position)
+                if (attr := inference_prim.GetAttribute("omni:rtwt:inference:sliceAxis")) and attr.Get() != slice_axis:
+                    attr.Set(slice_axis)
+
+        # Apply slider-driven transforms via the ROI bounding box.
         utils.apply_slider_transforms(stage, roi_prim, slider_value)
 
         # Set viewport resolution scale and control timeline playback.
@@ -24,17 +24,28 @@ def get_rt_stage(stage: Usd.Stage):
     return UsdRt.Stage.Attach(stage_id.ToLongInt())
 
 
-def apply_slider_transforms(stage: Usd.Stage, roi_prim: Usd.Prim, slider_value: int):
-    """Apply slider-driven translations to all prims with RtwtTransformAPI.
+def map_slider_to_roi(roi_prim: Usd.Prim, slider_value: int) -> tuple[float, float, float]:
+    """Map slider_value in [-100, 100] linearly onto each axis of the ROI bounding box.
 
-    slider_value is in [-100, 100] and is mapped linearly to each axis of the
-    ROI bounding box.  Each RtwtTransformAPI instance declares which axis ("x",
-    "y", or "z") it controls and whether the direction should be flipped.
+    Returns the (x, y, z) world-space position; -100 is the ROI minimum and
+    100 its maximum along every axis.
     """
     bounds = usd_utils.get_bounds(roi_prim)
     x_value = bounds.GetMin()[0] + (slider_value + 100) / 200 * (bounds.GetMax()[0] - bounds.GetMin()[0])
     y_value = bounds.GetMin()[1] + (slider_value + 100) / 200 * (bounds.GetMax()[1] - bounds.GetMin()[1])
     z_value = bounds.GetMin()[2] + (slider_value + 100) / 200 * (bounds.GetMax()[2] - bounds.GetMin()[2])
+    return x_value, y_value, z_value
+
+
+def apply_slider_transforms(stage: Usd.Stage, roi_prim: Usd.Prim, slider_value: int):
+    """Apply slider-driven translations to all prims with RtwtTransformAPI.
+
+    slider_value is in [-100, 100] and is mapped linearly to each axis of the
+    ROI bounding box (see map_slider_to_roi).  Each RtwtTransformAPI instance
+    declares which axis ("x", "y", or "z") it controls and whether the
+    direction should be flipped.
+    """
+    x_value, y_value, z_value = map_slider_to_roi(roi_prim, slider_value)
     logger.info("Mapped slider %d to: (%s, %s, %s)", slider_value, x_value, y_value, z_value)
 
     for path in get_rt_stage(stage).GetPrimsWithAppliedAPIName("RtwtTransformAPI"):
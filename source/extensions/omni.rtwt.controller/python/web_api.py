@@ -21,6 +21,7 @@ import carb
 import carb.events
 import carb.eventdispatcher
 from omni.cae.viz import listener
+from omni.rtwt.inference.prefetch import VELOCITIES
 from . import utils
 
 logger = getLogger(__name__)
@@ -79,9 +80,9 @@ def _send_cache_signal(state: str, progress: int, total: int) -> None:
     stream.pump()
 
 
-# Authoritative list of wind speeds the blueprint supports. Kept here so the
-# pre-cache walk and the UI's velocity slider agree on the value set.
-_SUPPORTED_VELOCITIES: list[float] = [float(v) for v in range(25, 101, 25)]
+# Wind speeds the blueprint supports, shared with the inference prefetch so the
+# pre-cache walk, the UI's velocity slider and the prefetch agree on the value set.
+_SUPPORTED_VELOCITIES: tuple[float, ...] = VELOCITIES
 
 
 def _all_cache_states() -> list[dict]:
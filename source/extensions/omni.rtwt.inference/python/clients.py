@@ -0,0 +1,125 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+"""Long-lived Triton clients shared by every inference request of the extension.
+
+Creating a ``tritonclient`` aio client per request pays connection setup (and
+the TLS handshake for a remote NIM) on every inference, which dominates short
+requests such as the pre-cache loop.  :class:`TritonClientPool` keeps one
+client per (transport, URL) instead: the HTTP client's connection pool keeps
+up to ``max_connections`` keep-alive connections open, and the gRPC client
+multiplexes requests over a single channel.
+
+A request that fails with a connection error other than a timeout discards
+its client; the next request creates a fresh one and checks that the server
+is live before using it.  :meth:`TritonClientPool.close` closes every client on extension unload.
+:func:`fetch_metrics` reads Triton's metrics endpoint, which the prefetch uses to wait for an idle server.
+"""
+
+import asyncio
+from logging import getLogger
+
+import aiohttp
+from tritonclient.grpc.aio import InferenceServerClient as GrpcInferenceServerClient
+from tritonclient.http.aio import InferenceServerClient
+from tritonclient.utils import InferenceServerException
+
+logger = getLogger(__name__)
+
+# Errors after which a client's connections are assumed broken.
+CONNECTION_ERRORS = (OSError, aiohttp.ClientConnectionError)
+# Errors of a request sent on a keep-alive connection the server had already closed.  rtwt requests are
+# idempotent, so one retry on a fresh connection is safe; a timeout is not among them, as the server was reached.
+STALE_CONNECTION_ERRORS = (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError)
+# gRPC rejects messages over 4 MiB by default; full-resolution NanoVDB results are hundreds of MB.
+# Protobuf caps a single message at 2 GiB, the largest size that can be allowed.
+GRPC_MAX_MESSAGE_BYTES = 2**31 - 1
+_GRPC_CHANNEL_ARGS = [
+    ("grpc.max_send_message_length", GRPC_MAX_MESSAGE_BYTES),
+    ("grpc.max_receive_message_length", GRPC_MAX_MESSAGE_BYTES),
+]
+
+
+class TritonClientPool:
+    """One ``tritonclient`` aio client per ``(transport, url)``, created on first use."""
+
+    def __init__(self):
+        self._clients: dict[tuple[str, str], tuple[object, asyncio.AbstractEventLoop]] = {}
+        # Keys whose previous client was discarded after a connection error.
+        self._reconnecting: set[tuple[str, str]] = set()
+
+    async def get(self, transport: str, url: str, max_connections: int = 8):
+        """Return the shared client for *url*; *transport* is ``"http"`` or ``"grpc"``.
+
+        *max_connections* bounds the HTTP connection pool and only applies
+        when the client is created.
+        """
+        key = (transport, url)
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(key)
+        if entry is not None and entry[1] is loop:
+            return entry[0]
+        if entry is not None:
+            # aiohttp sessions and gRPC channels are bound to the loop they were created on.
+            self._clients.pop(key)
+            logger.info("Event loop changed; replacing the Triton %s client for %s", transport, url)
+
+        if transport == "grpc":
+            client = GrpcInferenceServerClient(url=url, verbose=False, channel_args=_GRPC_CHANNEL_ARGS)
+        else:
+            client = InferenceServerClient(url=url, verbose=False, conn_limit=max(max_connections, 1))
+        if key in self._reconnecting:
+            try:
+                live = await client.is_server_live()
+            except (InferenceServerException, *CONNECTION_ERRORS) as e:
+                live = False
+                logger.warning("Triton %s health check for %s failed: %s", transport, url, e)
+            if not live:
+                await client.close()
+                raise ConnectionError(f"Triton server at {url} is not live")
+            self._reconnecting.discard(key)
+            logger.info("Reconnected Triton %s client to %s", transport, url)
+        self._clients[key] = (client, loop)
+        return client
+
+    async def discard(self, transport: str, url: str) -> None:
+        """Close the client for *url* after a connection error; the next :meth:`get` reconnects."""
+        key = (transport, url)
+        self._reconnecting.add(key)
+        entry = self._clients.pop(key, None)
+        if entry is not None:
+            await _close_quietly(entry[0])
+
+    async def close(self) -> None:
+        """Close every client."""
+        clients = [client for client, _loop in self._clients.values()]
+        self._clients.clear()
+        self._reconnecting.clear()
+        for client in clients:
+            await _close_quietly(client)
+
+
+async def fetch_metrics(url: str, timeout_s: float = 1.0) -> str | None:
+    """Return the Prometheus text of Triton's metrics endpoint at *url* (``host:port``), or ``None`` if unavailable."""
+    try:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout_s)) as session:
+            async with session.get(f"http://{url}/metrics") as response:
+                response.raise_for_status()
+                return await response.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+        logger.debug("Triton metrics at %s unavailable: %s", url, e)
+        return None
+
+
+async def _close_quietly(client) -> None:
+    try:
+        await client.close()
+    except Exception as e:  # noqa: BLE001 - closing a broken client must not mask the original error
+        logger.debug("Error closing Triton client: %s", e)
@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+"""Decoder for the reduced-precision ``nvdb_*`` payloads returned by the rtwt model.
+
+With ``precision`` set to ``float16`` or ``quantized16`` the rtwt model
+returns dense voxel values behind a small header instead of a NanoVDB grid.
+This mirrors ``aeronim/rtwt/1/encoding.py``; keep the header layout in sync.
+"""
+
+import struct
+
+import numpy as np
+
+PRECISIONS = ("float32", "float16", "quantized16")
+
+_MAGIC = b"RTWTENC1"
+_HEADER = struct.Struct("<8sBB2x3i3i3fff")
+_PRECISION_CODES = {"float16": 1, "quantized16": 2}
+
+
+def is_encoded(buffer: np.ndarray) -> bool:
+    """Return True if *buffer* is a reduced-precision payload rather than a NanoVDB grid."""
+    buffer = buffer.view(np.uint8).reshape(-1)
+    return buffer.size >= _HEADER.size and buffer[: len(_MAGIC)].tobytes() == _MAGIC
+
+
+def decode_dense(buffer: np.ndarray) -> tuple[np.ndarray, tuple, tuple, tuple]:
+    """Decode a reduced-precision payload into ``(values, dims, origin, voxel_size)``."""
+    buffer = np.ascontiguousarray(buffer).view(np.uint8).reshape(-1)
+    magic, code, components, *rest = _HEADER.unpack_from(buffer[: _HEADER.size].tobytes())
+    if magic != _MAGIC:
+        raise ValueError("Not a reduced-precision rtwt payload")
+    dims, origin, voxel_size, (scale, offset) = tuple(rest[0:3]), tuple(rest[3:6]), tuple(rest[6:9]), rest[9:11]
+
+    data = buffer[_HEADER.size :]
+    if code == _PRECISION_CODES["float16"]:
+        values = data.view(np.float16).astype(np.float32)
+    elif code == _PRECISION_CODES["quantized16"]:
+        values = data.view(np.uint16).astype(np.float32) * np.float32(scale) + np.float32(offset)
+    else:
+        raise ValueError(f"Unknown rtwt payload precision code {code}")
+    if components > 1:
+        values = values.reshape(-1, components)
+    return values, dims, origin, voxel_size
+
+
+def to_nanovdb(buffer: np.ndarray, device: str = "cuda") -> np.ndarray:
+    """Rebuild the serialised NanoVDB grid the rtwt model would have returned for *buffer*."""
+    import dav
+    import warp as wp
+
+    values, dims, origin, voxel_size = decode_dense(buffer)
+    if values.ndim == 2:
+        wp_array = wp.array(values, dtype=wp.vec3f, device=device)
+        bg_value = wp.vec3f(0.0, 0.0, 0.0)
+    else:
+        wp_array = wp.array(values, dtype=wp.float32, device=device)
+        bg_value = 0.0
+    field = dav.Field.from_array(wp_array, dav.AssociationType.VERTEX)
+    nvdb_field = field.to_nanovdb(
+        dims=wp.vec3i(*dims), origin=wp.vec3i(*origin), voxel_size=wp.vec3f(*voxel_size), bg_value=bg_value, device=device
+    )
+    return nvdb_field.get_data().array().numpy()
+
+
+def decode_outputs(outputs: dict[str, np.ndarray], device: str = "cuda") -> dict[str, np.ndarray]:
+    """Return *outputs* with every reduced-precision ``nvdb_*`` payload rebuilt into a NanoVDB grid.
+
+    Other arrays, including ``nvdb_*`` outputs that already are NanoVDB
+    grids, are passed through unchanged.
+    """
+    return {
+        name: to_nanovdb(array, device) if name.startswith("nvdb_") and is_encoded(array) else array
+        for name, array in outputs.items()
+    }
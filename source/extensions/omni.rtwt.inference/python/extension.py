@@ -8,6 +8,8 @@
 # without an express license agreement from NVIDIA CORPORATION or
 # its affiliates is strictly prohibited.
 
+import asyncio
+
 import omni.ext
 from omni.cae.viz import Controller, register_module_operators, unregister_module_operators
 
@@ -21,4 +23,10 @@ class Extension(omni.ext.IExt):
 
     def on_shutdown(self):
         unregister_module_operators(inference)
+        loop = asyncio.get_event_loop()
+        if loop.is_running():
+            # Unloaded from within a coroutine: the loop keeps running, so let it finish closing the clients.
+            self._close_task = loop.create_task(inference.close_clients())
+        else:
+            loop.run_until_complete(inference.close_clients())
         Controller.remove_schema_regex(r"^Rtwt")
@@ -8,9 +8,13 @@
 # without an express license agreement from NVIDIA CORPORATION or
 # its affiliates is strictly prohibited.
 
+import asyncio
+import functools
 import hashlib
 import json
 import os
+import socket
+import time
 import uuid
 import zipfile
 from datetime import datetime, timezone
@@ -25,15 +29,41 @@ from omni.cae.data import cache, usd_utils
 from omni.cae.viz.execution_context import ExecutionContext
 from omni.cae.viz.operator import operator
 from omni.cae.schema import cae, viz as cae_viz
-from pxr import Gf, Usd, UsdUtils
+from pxr import Gf, Sdf, Usd, UsdUtils
+from tritonclient.grpc import InferInput as GrpcInferInput, InferRequestedOutput as GrpcInferRequestedOutput
 from tritonclient.http import InferInput, InferRequestedOutput, InferenceServerException
-from tritonclient.http.aio import InferenceServerClient
 from tritonclient.utils import np_to_triton_dtype
 from usdrt import Usd as UsdRT
 from omni.rtwt.delegate import PredictedFieldDelegate
 
+from . import encoding, prefetch
+from .clients import CONNECTION_ERRORS, GRPC_MAX_MESSAGE_BYTES, STALE_CONNECTION_ERRORS, TritonClientPool, fetch_metrics
+
 logger = getLogger(__name__)
 _NANOVDB_OUTPUT_PREFIX = "nvdb_"
+_SLICE_AXES = {"x": 0, "y": 1, "z": 2}
+# Properties the rtwt model reads from the serialised layer: the inference prim's, then those of its
+# ``model`` and ``domain`` dataset selection targets.
+_INFERENCE_PROPERTIES = (
+    "omni:rtwt:inference:velocity",
+    "cae:viz:dataset_selection:model:target",
+    "cae:viz:dataset_selection:domain:target",
+)
+_MODEL_PROPERTIES = ("omni:rtwt:model:tag",)
+_DOMAIN_PROPERTIES = ("cae:vtk:origin", "cae:vtk:spacing", "cae:vtk:minExtent", "cae:vtk:maxExtent")
+# Dense float32 bytes per voxel of each NanoVDB output, and the NanoVDB tree overhead on top of them; used to
+# estimate whether a response fits in a gRPC message.
+_NANOVDB_VOXEL_BYTES = {"nvdb_velocity": 12, "nvdb_velocity_magnitude": 4, "nvdb_pressure": 4}
+_NANOVDB_OVERHEAD = 1.1
+# Shared by every operator instance so connections outlive individual inferences.
+_clients = TritonClientPool()
+# Triton priority levels of the rtwt model's queue (see its config.pbtxt); level 1 is served first.
+_TRITON_PRIORITIES = {"interactive": 1, "precache": 2}
+
+
+async def close_clients() -> None:
+    """Close the pooled Triton clients (called on extension shutdown)."""
+    await _clients.close()
 
 
 @operator()
@@ -45,9 +75,31 @@ class InferenceOperator:
     def __init__(self):
         settings = get_settings()
         self._triton_http_url = settings.get_as_string("/exts/omni.rtwt.inference/triton_http_url") or "localhost:8080"
+        self._triton_grpc_url = settings.get_as_string("/exts/omni.rtwt.inference/triton_grpc_url") or "localhost:8001"
+        self._progressive = settings.get_as_bool("/exts/omni.rtwt.inference/progressive")
+        self._transport = settings.get_as_string("/exts/omni.rtwt.inference/triton_transport") or "http"
+        if self._transport not in ("http", "grpc"):
+            logger.warning("Unsupported triton_transport %r; using http", self._transport)
+            self._transport = "http"
+        if self._progressive:
+            # The decoupled rtwt_progressive model streams its responses, which only gRPC supports.
+            self._transport = "grpc"
         self._triton_timeout = settings.get_as_int("/exts/omni.rtwt.inference/triton_timeout_s") or 600
-        self._triton_batch_size = settings.get_as_int("/exts/omni.rtwt.inference/triton_batch_size") or 128_000
+        self._triton_max_connections = settings.get_as_int("/exts/omni.rtwt.inference/triton_max_connections") or 8
+        # Past this many seconds the rtwt model abandons the request; by default when the client gives up.
+        self._triton_deadline = settings.get_as_int("/exts/omni.rtwt.inference/triton_deadline_s") or self._triton_timeout
+        self._triton_batch_size = settings.get_as_int("/exts/omni.rtwt.inference/triton_batch_size")
+        self._client_id = settings.get_as_string("/exts/omni.rtwt.inference/client_id") or socket.gethostname()
         self._triton_stencil_size = settings.get_as_int("/exts/omni.rtwt.inference/triton_stencil_size") or 1
+        self._send_parameters = settings.get_as_bool("/exts/omni.rtwt.inference/send_parameters")
+        self._sparse_tolerance = settings.get_as_float("/exts/omni.rtwt.inference/sparse_tolerance") or 0.0
+        self._precision = settings.get_as_string("/exts/omni.rtwt.inference/precision") or "float32"
+        if self._precision not in encoding.PRECISIONS:
+            logger.warning("Unsupported precision %r; using float32", self._precision)
+            self._precision = "float32"
+
+        self._slice_inference = settings.get_as_bool("/exts/omni.rtwt.inference/slice_inference")
+        self._slice_thickness = settings.get_as_int("/exts/omni.rtwt.inference/slice_thickness") or 2
 
         self._offline_mode = settings.get_as_bool("/exts/omni.rtwt.inference/offline_mode")
         self._generate_if_missing = settings.get_as_bool("/exts/omni.rtwt.inference/generate_if_missing")
@@ -59,6 +111,38 @@ class InferenceOperator:
         self._offline_cache_dir: Path | None = (
             Path(os.path.normpath(carb.tokens.get_tokens_interface().resolve(raw_dir))) if raw_dir else None
         )
+        if self._offline_mode and self._slice_inference:
+            # The offline cache holds full volumes, which already serve every slice.
+            logger.info("offline_mode=true; slice_inference is ignored")
+            self._slice_inference = False
+
+        # Cache key and result field targets of the result currently shown for each (stage, inference prim), so
+        # slice requests are skipped while the full volume for the same inputs is shown.
+        self._displayed_keys: dict[tuple[int, str], tuple[str, tuple[str, ...]]] = {}
+        # Speculative prefetch of the neighbouring configurations into the memory cache (see prefetch.py).
+        self._prefetch = settings.get_as_bool("/exts/omni.rtwt.inference/prefetch") and not self._offline_mode
+        self._prefetcher = prefetch.Prefetcher(
+            max_concurrent=settings.get_as_int("/exts/omni.rtwt.inference/prefetch_max_concurrent") or 1,
+            budget_bytes=(settings.get_as_int("/exts/omni.rtwt.inference/prefetch_budget_mb") or 1024) * 1024 * 1024,
+            evict=self._evict_cached_outputs,
+        )
+        # Seconds after which the server abandons a prefetch, so an interactive request never waits long behind one.
+        self._prefetch_deadline = settings.get_as_int("/exts/omni.rtwt.inference/prefetch_deadline_s") or 30
+        self._triton_metrics_url = (
+            settings.get_as_string("/exts/omni.rtwt.inference/triton_metrics_url") or "localhost:8002"
+        )
+        self._metrics_warned = False
+        self._model_tags = prefetch.ModelTagResolver()
+
+        # Latest-wins: each interactive request for an inference prim starts a new generation and cancels
+        # the (cache key, task) still in flight for that prim, so superseded results are never stored.
+        self._generations: dict[tuple[int, str], int] = {}
+        self._inflight: dict[tuple[int, str], tuple[str, asyncio.Task]] = {}
+        # Interactive HTTP request still running on the server for each prim, superseded or not (see
+        # ``_infer_http_after_superseded``).
+        self._http_outstanding: dict[tuple[int, str], asyncio.Future] = {}
+        # Compact layer last exported for each (stage, inference prim), with the values it was built from.
+        self._exported_layers: dict[tuple[int, str], tuple[list, str]] = {}
 
     async def exec(self, prim: Usd.Prim, device: str, context: ExecutionContext):
         if prim.HasAPI(cae_viz.DatasetVoxelizationAPI, "domain"):
@@ -67,8 +151,19 @@ class InferenceOperator:
         use_cache = usd_utils.get_attribute(prim, "omni:rtwt:inference_cache:useCache", quiet=True) or False
         pre_caching = usd_utils.get_attribute(prim, "omni:rtwt:inference_cache:preCaching", quiet=True) or False
         requested_outputs = self._get_requested_outputs(prim)
+        slice_plane = self._get_slice_plane(prim) if self._slice_inference else None
 
-        await self._do_inference(prim, use_cache, pre_caching, requested_outputs)
+        await self._do_inference(prim, use_cache, pre_caching, requested_outputs, slice_plane)
+        if self._prefetch and not pre_caching:
+            await self._schedule_prefetch(prim, requested_outputs, slice_plane)
+
+    def _get_slice_plane(self, prim: Usd.Prim) -> tuple[int, float] | None:
+        """Return ``(axis, position)`` of the slice plane to infer, or None to infer the full volume."""
+        axis = usd_utils.get_attribute(prim, "omni:rtwt:inference:sliceAxis", quiet=True) or "none"
+        if axis not in _SLICE_AXES:
+            return None
+        position = float(usd_utils.get_attribute(prim, "omni:rtwt:inference:slicePosition", quiet=True) or 0.0)
+        return _SLICE_AXES[axis], position
 
     def _get_requested_outputs(self, prim: Usd.Prim) -> list[str]:
         """Return output names for which RtwtResultFieldSelectionAPI:<name> is applied
@@ -84,40 +179,73 @@ class InferenceOperator:
             logger.debug("Requesting outputs %s for %s", outputs, prim.GetPath())
         return outputs
 
-    def _make_cache_key(self, prim: Usd.Prim, requested_outputs: list[str]) -> str:
-        """Build a cache key from the RtwtInferenceAppStateAPI attribute values.
+    def _get_app_state(self, prim: Usd.Prim) -> dict[str, object] | None:
+        """Return the RtwtInferenceAppStateAPI attribute values by name, or None if no prim has the API.
 
-        Uses usdrt to locate the prim with RtwtInferenceAppStateAPI applied so
-        the key is cheap to compute (no ExportToString) and changes precisely
-        when inference inputs change.
+        Uses usdrt to locate the prim with RtwtInferenceAppStateAPI applied, so
+        this is cheap enough to run on every execution.
         """
         stage = prim.GetStage()
         stage_id = UsdUtils.StageCache.Get().GetId(stage).ToLongInt()
         stage_rt = UsdRT.Stage.Attach(stage_id)
 
-        h = hashlib.sha256()
-        h.update(str(prim.GetPath()).encode())
-
         _INFERENCE_APP_STATE_API = "RtwtInferenceAppStateAPI"
         app_state_paths = stage_rt.GetPrimsWithAppliedAPIName(_INFERENCE_APP_STATE_API)
-        if app_state_paths:
-            app_state_prim = stage.GetPrimAtPath(str(app_state_paths[0]))
-            if app_state_prim and app_state_prim.IsValid():
-                defn = Usd.SchemaRegistry().FindAppliedAPIPrimDefinition(_INFERENCE_APP_STATE_API)
-                attr_names = sorted(defn.GetPropertyNames()) if defn else []
-                for attr_name in attr_names:
-                    if not defn.GetAttributeDefinition(attr_name):
-                        # Skip properties that aren't attributes, e.g. relationships like the result field selection targets.
-                        continue
-                    val = app_state_prim.GetAttribute(attr_name).Get()
-                    h.update(str(val).encode())
-        else:
-            logger.warning("_make_cache_key: no prim with RtwtInferenceAppStateAPI found")
+        if not app_state_paths:
+            return None
+        app_state: dict[str, object] = {}
+        app_state_prim = stage.GetPrimAtPath(str(app_state_paths[0]))
+        defn = Usd.SchemaRegistry().FindAppliedAPIPrimDefinition(_INFERENCE_APP_STATE_API)
+        if app_state_prim and app_state_prim.IsValid() and defn:
+            for attr_name in sorted(defn.GetPropertyNames()):
+                if not defn.GetAttributeDefinition(attr_name):
+                    # Skip properties that aren't attributes, e.g. relationships such as result field selections.
+                    continue
+                app_state[attr_name] = app_state_prim.GetAttribute(attr_name).Get()
+        return app_state
+
+    def _make_cache_key(
+        self, prim: Usd.Prim, requested_outputs: list[str], app_state: dict[str, object] | None = None
+    ) -> str:
+        """Build a cache key from the RtwtInferenceAppStateAPI attribute values.
+
+        The key is cheap to compute (no ExportToString) and changes precisely
+        when inference inputs change.  Pass *app_state* to key a state other
+        than the current one (see ``_schedule_prefetch``).
+        """
+        if app_state is None:
+            app_state = self._get_app_state(prim)
+            if app_state is None:
+                logger.warning("_make_cache_key: no prim with RtwtInferenceAppStateAPI found")
+
+        h = hashlib.sha256()
+        h.update(str(prim.GetPath()).encode())
+        for attr_name in sorted(app_state or {}):
+            h.update(str(app_state[attr_name]).encode())
 
         for name in sorted(requested_outputs):
             h.update(name.encode())
         return h.hexdigest()[:16]
 
+    def _result_targets(self, prim: Usd.Prim, requested_outputs: list[str]) -> tuple[str, ...]:
+        """Return the target prims of the result fields of *requested_outputs*, which a shown result was written to."""
+        return tuple(
+            f"{name}={path}"
+            for name in sorted(requested_outputs)
+            for path in usd_utils.get_target_paths(prim, f"omni:rtwt:result_field_selection:{name}:target", quiet=True)
+        )
+
+    def _display_slot(self, prim: Usd.Prim) -> tuple[int, str]:
+        """Return the ``_displayed_keys`` slot of *prim*; a reopened stage gets fresh slots."""
+        return UsdUtils.StageCache.Get().GetId(prim.GetStage()).ToLongInt(), str(prim.GetPath())
+
+    def _make_slice_cache_key(self, cache_key: str, slice_plane: tuple[int, float]) -> str:
+        """Derive the cache key of a slice-plane result from the full-volume *cache_key*."""
+        axis, position = slice_plane
+        h = hashlib.sha256(cache_key.encode())
+        h.update(f"slice:{axis}:{position!r}:{self._slice_thickness}".encode())
+        return h.hexdigest()[:16]
+
     def _get_cached_outputs(self, cache_key: str, requested_outputs: list[str]) -> dict[str, np.ndarray] | None:
         """Return cached numpy arrays for all requested outputs, or None on any miss."""
         result: dict[str, np.ndarray] = {}
@@ -140,18 +268,56 @@ class InferenceOperator:
             )
 
     async def _do_inference(
-        self, prim: Usd.Prim, use_cache: bool, pre_caching: bool, requested_outputs: list[str]
+        self,
+        prim: Usd.Prim,
+        use_cache: bool,
+        pre_caching: bool,
+        requested_outputs: list[str],
+        slice_plane: tuple[int, float] | None = None,
     ) -> None:
         prim_path = str(prim.GetPath())
-        cache_key = self._make_cache_key(prim, requested_outputs)
-        if use_cache:
+        full_cache_key = self._make_cache_key(prim, requested_outputs)
+        cache_key = full_cache_key if slice_plane is None else self._make_slice_cache_key(full_cache_key, slice_plane)
+        slot = self._display_slot(prim)
+        generation = None
+        if not pre_caching:
+            if (inflight := self._inflight.get(slot)) is not None and inflight[0] == cache_key:
+                logger.info("Inference for the same inputs already in flight (prim=%s)", prim_path)
+                return
+            generation = self._supersede(slot)
+        # The full volume for the same inputs already contains every slice.  A retargeted result field still
+        # needs the data, so the targets the shown result was written to must match too.
+        targets = self._result_targets(prim, requested_outputs)
+        if not pre_caching and slice_plane is not None and self._displayed_keys.get(slot) == (full_cache_key, targets):
+            logger.info("Full volume for these inputs already shown; skipping the slice (prim=%s)", prim_path)
+            return
+        # Prefetched results are served even when the cache is not enabled for reading.
+        prefetched = generation is not None and self._prefetcher.is_ready(cache_key)
+        if use_cache or prefetched:
             cached_outputs = self._get_cached_outputs(cache_key, requested_outputs)
             if cached_outputs is not None:
                 logger.info("Cache HIT (prim=%s)", prim_path)
+                if prefetched:
+                    self._prefetcher.record(cache_key, hit=True)
                 if not pre_caching:
                     self._store_results_from_arrays(prim, cached_outputs, requested_outputs)
+                    self._displayed_keys[slot] = (cache_key, targets)
                 return
             logger.info("Cache MISS — forwarding to rtwt (prim=%s)", prim_path)
+        if self._prefetch and generation is not None:
+            # Interactive work goes first: stop speculating until this result is shown.
+            self._prefetcher.back_off(keep=cache_key)
+            if self._prefetcher.is_running(cache_key):
+                # The prefetch of this configuration is further along than a new request would be.
+                outputs = await self._latest_only(slot, generation, cache_key, self._prefetcher.wait(cache_key))
+                if self._generations.get(slot) != generation:
+                    return
+                if outputs is not None:
+                    self._prefetcher.record(cache_key, hit=True)
+                    self._store_results_from_arrays(prim, outputs, requested_outputs)
+                    self._displayed_keys[slot] = (cache_key, targets)
+                    return
+            self._prefetcher.record(cache_key, hit=False)
 
         if self._offline_mode:
             if self._offline_cache_dir is None:
@@ -162,8 +328,10 @@ class InferenceOperator:
             disk_outputs = self._read_disk_cache(cache_key, requested_outputs)
             if disk_outputs is not None:
                 logger.info("Offline cache HIT (prim=%s)", prim_path)
+                disk_outputs = encoding.decode_outputs(disk_outputs)
                 if not pre_caching:
                     self._store_results_from_arrays(prim, disk_outputs, requested_outputs)
+                    self._displayed_keys[slot] = (cache_key, targets)
                 self._put_cached_outputs(prim, cache_key, disk_outputs)
                 return
             if not self._generate_if_missing:
@@ -173,33 +341,370 @@ class InferenceOperator:
                 return
             logger.info("Offline cache MISS — forwarding to rtwt (prim=%s)", prim_path)
 
-        usd_string = prim.GetStage().GetRootLayer().ExportToString()
-        request_id = str(uuid.uuid1())
-        client = InferenceServerClient(url=self._triton_http_url, verbose=False)
-        try:
-            response = await client.infer(
-                model_name="rtwt",
-                inputs=self._create_inputs(usd_string, prim_path),
-                outputs=self._create_outputs(requested_outputs),
-                request_id=request_id,
-                timeout=self._triton_timeout,
+        transport = self._select_transport(prim, requested_outputs, slice_plane)
+        infer_input = GrpcInferInput if transport == "grpc" else InferInput
+        if self._send_parameters:
+            inputs = self._create_parameter_inputs(self._extract_inference_params(prim), infer_input)
+        else:
+            inputs = self._create_inputs(self._export_inference_layer(prim), prim_path, infer_input)
+        if slice_plane is not None:
+            inputs += self._create_slice_inputs(slice_plane, infer_input)
+        inputs += self._create_scheduling_inputs(pre_caching, infer_input)
+        if self._progressive and transport == "grpc":
+            await self._latest_only(
+                slot,
+                generation,
+                cache_key,
+                self._do_progressive_inference(prim, inputs, cache_key, pre_caching, requested_outputs),
             )
+            return
+
+        if generation is not None and transport == "http":
+            request = self._infer_http_after_superseded(slot, inputs, requested_outputs)
+        else:
+            request = self._infer(inputs, requested_outputs, transport, pre_caching)
+        try:
+            response = await self._latest_only(slot, generation, cache_key, request)
+            if response is None:
+                return
             if err := response.as_numpy("ERROR_MESSAGE")[0].decode("utf-8"):
                 logger.error("Inference server returned error: %s", err)
             else:
                 numpy_outputs = {name: response.as_numpy(name) for name in [*requested_outputs, "EXTENT_MIN", "EXTENT_MAX"]}
-                if not pre_caching:
-                    self._store_results_from_arrays(prim, numpy_outputs, requested_outputs)
-                self._put_cached_outputs(prim, cache_key, numpy_outputs)
-                if self._offline_mode:
-                    self._write_disk_cache(cache_key, numpy_outputs, prim, requested_outputs)
-                logger.info("Inference successful (prim=%s, outputs=%s, pre_caching=%s)", prim_path, requested_outputs, pre_caching)
+                self._finish_inference(prim, cache_key, numpy_outputs, pre_caching, requested_outputs)
         except InferenceServerException as e:
             logger.error("Inference request failed: %s", e)
-        except OSError as e:
-            logger.error("OS error during inference: %s", e)
+        except CONNECTION_ERRORS as e:
+            logger.error("Connection error during inference: %s", e)
+
+    async def _schedule_prefetch(
+        self, prim: Usd.Prim, requested_outputs: list[str], slice_plane: tuple[int, float] | None
+    ) -> None:
+        """Start prefetching the states next to the current one while the server is idle.
+
+        Nothing is started while an interactive request of this operator is in
+        flight or any ``rtwt`` request, from whichever client, waits in
+        Triton's queue (see ``_server_idle``).
+        """
+        if self._inflight or not requested_outputs:
+            return
+        app_state = self._get_app_state(prim)
+        if not app_state:
+            return
+        params = self._extract_inference_params(prim)
+        model_prim = usd_utils.get_target_prim(prim, "cae:viz:dataset_selection:model:target")
+        jobs = []
+        for state in prefetch.neighbour_states(app_state):
+            cache_key = self._make_cache_key(prim, requested_outputs, state)
+            if slice_plane is not None:
+                cache_key = self._make_slice_cache_key(cache_key, slice_plane)
+            if self._get_cached_outputs(cache_key, requested_outputs) is not None:
+                continue
+            model_tag = self._model_tags.resolve(model_prim, state)
+            if model_tag is None:
+                continue
+            state_params = {
+                **params,
+                "STREAM_VELOCITY": np.array([float(state[prefetch.VELOCITY_ATTR])], dtype=np.float32),
+                "MODEL_TAG": np.array([model_tag], dtype=np.object_),
+            }
+            jobs.append(
+                (
+                    cache_key,
+                    functools.partial(
+                        self._prefetch_state, prim, cache_key, state_params, requested_outputs, slice_plane
+                    ),
+                )
+            )
+        # Checked again after the metrics round trip, during which an interactive request may have started.
+        if jobs and await self._server_idle() and not self._inflight:
+            self._prefetcher.start(jobs)
+
+    async def _server_idle(self) -> bool:
+        """Return whether no ``rtwt`` request waits in Triton's queue, according to its metrics endpoint.
+
+        An unavailable endpoint counts as busy, so prefetching stays off; that is logged once.
+        """
+        metrics = await fetch_metrics(self._triton_metrics_url)
+        pending = None if metrics is None else prefetch.pending_requests(metrics, "rtwt")
+        if pending is None:
+            if not self._metrics_warned:
+                logger.warning("No rtwt queue metrics at %s; prefetch is paused", self._triton_metrics_url)
+                self._metrics_warned = True
+            return False
+        return pending == 0
+
+    async def _prefetch_state(
+        self,
+        prim: Usd.Prim,
+        cache_key: str,
+        params: dict[str, np.ndarray],
+        requested_outputs: list[str],
+        slice_plane: tuple[int, float] | None,
+    ) -> dict[str, np.ndarray] | None:
+        """Infer one neighbouring state at ``precache`` priority into the memory cache and return its outputs.
+
+        The request carries ``prefetch_deadline_s`` instead of ``triton_deadline_s``,
+        so the server drops it soon even when its cancellation cannot reach the
+        server (HTTP).
+        """
+        transport = self._select_transport(prim, requested_outputs, slice_plane)
+        infer_input = GrpcInferInput if transport == "grpc" else InferInput
+        inputs = self._create_parameter_inputs(params, infer_input, self._prefetch_deadline)
+        if slice_plane is not None:
+            inputs += self._create_slice_inputs(slice_plane, infer_input)
+        inputs += self._create_scheduling_inputs(True, infer_input)
+        try:
+            response = await self._infer(
+                inputs, requested_outputs, transport, pre_caching=True, deadline_s=self._prefetch_deadline
+            )
+        except (InferenceServerException, *CONNECTION_ERRORS) as e:
+            logger.info("Prefetch request failed (key=%s): %s", cache_key, e)
+            return None
+        if err := response.as_numpy("ERROR_MESSAGE")[0].decode("utf-8"):
+            logger.info("Prefetch rejected by the inference server (key=%s): %s", cache_key, err)
+            return None
+        outputs = {name: response.as_numpy(name) for name in [*requested_outputs, "EXTENT_MIN", "EXTENT_MAX"]}
+        outputs = encoding.decode_outputs(outputs)
+        self._put_cached_outputs(prim, cache_key, outputs)
+        logger.info("Prefetched (prim=%s, key=%s)", prim.GetPath(), cache_key)
+        return outputs
+
+    def _evict_cached_outputs(self, cache_key: str, output_names: list[str]) -> None:
+        """Drop the memory-cache entries of *cache_key* (a prefetched result over the prefetch budget)."""
+        for output_name in output_names:
+            cache.remove(f"omni.rtwt.inference:inputs:{cache_key}:{output_name}")
+
+    def _supersede(self, slot: tuple[int, str]) -> int:
+        """Start a new request generation for *slot*, cancelling the request still in flight for it.
+
+        Over gRPC the cancellation reaches the rtwt model, which abandons the
+        work; over HTTP see ``_infer_http_after_superseded``.
+        """
+        generation = self._generations.get(slot, 0) + 1
+        self._generations[slot] = generation
+        if (inflight := self._inflight.pop(slot, None)) is not None:
+            inflight[1].cancel()
+        return generation
+
+    async def _latest_only(self, slot: tuple[int, str], generation: int | None, cache_key: str, coro):
+        """Await *coro* as a task that a newer request for *slot* cancels (see ``_supersede``).
+
+        Returns ``None`` if it was cancelled that way.  Pre-cache requests
+        (*generation* ``None``) neither supersede nor get superseded.
+        """
+        if generation is None:
+            return await coro
+        task = asyncio.ensure_future(coro)
+        self._inflight[slot] = (cache_key, task)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if self._generations.get(slot) == generation:
+                raise
+            logger.info("Inference superseded by a newer request; result dropped (prim=%s)", slot[1])
+            return None
         finally:
-            await client.close()
+            if (inflight := self._inflight.get(slot)) is not None and inflight[1] is task:
+                del self._inflight[slot]
+
+    async def _infer_http_after_superseded(
+        self, slot: tuple[int, str], inputs: list[InferInput], requested_outputs: list[str]
+    ):
+        """Send an interactive HTTP request for *slot* once the request it superseded has finished.
+
+        Cancelling a gRPC request cancels it on the server, which stops the
+        rtwt model's work; HTTP has no cancellation, so a superseded HTTP
+        request keeps the server busy until it completes.  It is therefore
+        left to finish in the background (its result is dropped), and the
+        next request for the slot is only sent after it.  A request that is
+        superseded while waiting is never sent, so a burst of edits costs the
+        server the request already running plus the latest one.
+        """
+        if (outstanding := self._http_outstanding.get(slot)) is not None:
+            await asyncio.wait({outstanding})
+        request = asyncio.ensure_future(self._infer(inputs, requested_outputs, "http"))
+        self._http_outstanding[slot] = request
+        request.add_done_callback(functools.partial(self._http_request_done, slot))
+        return await asyncio.shield(request)
+
+    def _http_request_done(self, slot: tuple[int, str], request: asyncio.Future) -> None:
+        if self._http_outstanding.get(slot) is request:
+            del self._http_outstanding[slot]
+        # Mark the exception of a superseded request nobody awaits any more as retrieved.
+        if not request.cancelled():
+            request.exception()
+
+    def _select_transport(
+        self, prim: Usd.Prim, requested_outputs: list[str], slice_plane: tuple[int, float] | None
+    ) -> str:
+        """Return the transport for a request: ``triton_transport``, unless the response would not fit gRPC.
+
+        gRPC messages, including every response of ``rtwt_progressive``, are
+        capped at 2 GiB; a request whose response is estimated to exceed that
+        goes over HTTP to ``rtwt`` instead (so without previews).
+        """
+        if self._transport != "grpc":
+            return self._transport
+        nbytes = self._estimate_response_bytes(prim, requested_outputs, slice_plane)
+        if nbytes <= GRPC_MAX_MESSAGE_BYTES:
+            return "grpc"
+        logger.warning(
+            "Estimated response of %.2f GB exceeds the gRPC message limit; using HTTP (prim=%s, outputs=%s)",
+            nbytes / 1e9,
+            prim.GetPath(),
+            requested_outputs,
+        )
+        return "http"
+
+    def _estimate_response_bytes(
+        self, prim: Usd.Prim, requested_outputs: list[str], slice_plane: tuple[int, float] | None
+    ) -> int:
+        """Estimate the size of the NanoVDB outputs of a request from the domain's dimensions.
+
+        Sparse encoding can only make the result smaller, so the estimate
+        assumes dense grids.  Per-face surface outputs are negligible.
+        """
+        domain_prim = usd_utils.get_target_prim(prim, "cae:viz:dataset_selection:domain:target")
+        extent_min = np.array(domain_prim.GetAttribute("cae:vtk:minExtent").Get(), dtype=np.int64)
+        extent_max = np.array(domain_prim.GetAttribute("cae:vtk:maxExtent").Get(), dtype=np.int64)
+        dims = extent_max - extent_min + 1
+        if slice_plane is not None:
+            dims[slice_plane[0]] = min(int(dims[slice_plane[0]]), self._slice_thickness)
+        # Reduced-precision payloads hold two bytes per component and no tree.
+        scale = _NANOVDB_OVERHEAD if self._precision == "float32" else 0.5
+        voxel_bytes = sum(_NANOVDB_VOXEL_BYTES.get(name, 0) for name in requested_outputs)
+        return int(np.prod(dims) * voxel_bytes * scale)
+
+    async def _infer(
+        self,
+        inputs: list[InferInput],
+        requested_outputs: list[str],
+        transport: str,
+        pre_caching: bool = False,
+        deadline_s: int | None = None,
+    ):
+        """Send one ``rtwt`` request over the pooled client of *transport* (``"http"`` or ``"grpc"``).
+
+        Pre-cache requests are queued at Triton's lower priority level, so
+        interactive requests from any client are served before them.
+        *deadline_s* overrides ``triton_deadline_s`` for the queue timeout.  Over
+        HTTP, a request that hits a dropped keep-alive connection is retried
+        once on a reconnected client, and a timed-out one is not retried at
+        all; gRPC channels reconnect by themselves.
+        """
+        request_id = str(uuid.uuid1())
+        priority = _TRITON_PRIORITIES["precache" if pre_caching else "interactive"]
+        # Triton's per-request ``timeout`` is in microseconds: a request still queued by then is dropped unserved.
+        deadline_s = self._triton_deadline if deadline_s is None else deadline_s
+        queue_timeout_us = deadline_s * 1_000_000 if deadline_s > 0 else None
+        if transport == "grpc":
+            client = await _clients.get("grpc", self._triton_grpc_url)
+            try:
+                return await client.infer(
+                    model_name="rtwt",
+                    inputs=inputs,
+                    outputs=self._create_outputs(requested_outputs, GrpcInferRequestedOutput),
+                    request_id=request_id,
+                    priority=priority,
+                    timeout=queue_timeout_us,
+                    client_timeout=self._triton_timeout,
+                )
+            except CONNECTION_ERRORS:
+                await _clients.discard("grpc", self._triton_grpc_url)
+                raise
+
+        for attempt in (1, 2):
+            client = await _clients.get("http", self._triton_http_url, self._triton_max_connections)
+            try:
+                return await client.infer(
+                    model_name="rtwt",
+                    inputs=inputs,
+                    outputs=self._create_outputs(requested_outputs),
+                    request_id=request_id,
+                    priority=priority,
+                    timeout=queue_timeout_us,
+                )
+            except CONNECTION_ERRORS as e:
+                if isinstance(e, TimeoutError):
+                    # The request reached a slow server; its connection (and those of other requests) is fine.
+                    raise
+                await _clients.discard("http", self._triton_http_url)
+                if attempt == 2 or not isinstance(e, STALE_CONNECTION_ERRORS):
+                    raise
+                logger.info("Connection to %s lost (%s); retrying", self._triton_http_url, e)
+
+    async def _do_progressive_inference(
+        self, prim: Usd.Prim, inputs: list, cache_key: str, pre_caching: bool, requested_outputs: list[str]
+    ) -> None:
+        """Stream coarse-to-fine results from the decoupled ``rtwt_progressive`` model over gRPC.
+
+        Coarse previews (``REFINEMENT_FACTOR`` > 1) are shown as soon as they
+        arrive, unless pre-caching; the final full-resolution response
+        replaces them and is the only one that is cached.  A preview's grids
+        are the coarse grid itself: their voxel size is the domain spacing
+        times the factor and its ``EXTENT_MIN`` / ``EXTENT_MAX`` are in the
+        coarse index space, so the viz scales it onto the domain.
+        """
+        prim_path = str(prim.GetPath())
+        request = {
+            "model_name": "rtwt_progressive",
+            "inputs": inputs,
+            "outputs": self._create_outputs(requested_outputs, GrpcInferRequestedOutput, progressive=True),
+            "request_id": str(uuid.uuid1()),
+        }
+
+        async def request_iterator():
+            yield request
+
+        try:
+            client = await _clients.get("grpc", self._triton_grpc_url)
+            async for response, error in client.stream_infer(request_iterator(), stream_timeout=self._triton_timeout):
+                if error is not None:
+                    logger.error("Progressive inference request failed: %s", error)
+                    return
+                if err := response.as_numpy("ERROR_MESSAGE")[0].decode("utf-8"):
+                    logger.error("Inference server returned error: %s", err)
+                    return
+                numpy_outputs = {name: response.as_numpy(name) for name in [*requested_outputs, "EXTENT_MIN", "EXTENT_MAX"]}
+                refinement_factor = int(response.as_numpy("REFINEMENT_FACTOR")[0])
+                if refinement_factor > 1:
+                    logger.info("Coarse preview received (prim=%s, factor=%d)", prim_path, refinement_factor)
+                    if not pre_caching:
+                        self._store_results_from_arrays(prim, encoding.decode_outputs(numpy_outputs), requested_outputs)
+                    continue
+                self._finish_inference(prim, cache_key, numpy_outputs, pre_caching, requested_outputs)
+                return
+        except InferenceServerException as e:
+            logger.error("Inference request failed: %s", e)
+        except CONNECTION_ERRORS as e:
+            logger.error("Connection error during inference: %s", e)
+            await _clients.discard("grpc", self._triton_grpc_url)
+
+    def _finish_inference(
+        self,
+        prim: Usd.Prim,
+        cache_key: str,
+        outputs: dict[str, np.ndarray],
+        pre_caching: bool,
+        requested_outputs: list[str],
+    ) -> None:
+        """Show and cache the final result of a successful inference request.
+
+        Reduced-precision payloads are decoded here, once, and the memory
+        cache keeps the rebuilt grids; the offline cache keeps the payloads
+        as received.
+        """
+        decoded = encoding.decode_outputs(outputs)
+        if not pre_caching:
+            self._store_results_from_arrays(prim, decoded, requested_outputs)
+            self._displayed_keys[self._display_slot(prim)] = (cache_key, self._result_targets(prim, requested_outputs))
+        self._put_cached_outputs(prim, cache_key, decoded)
+        if self._offline_mode:
+            self._write_disk_cache(cache_key, outputs, prim, requested_outputs)
+        logger.info(
+            "Inference successful (prim=%s, outputs=%s, pre_caching=%s)", prim.GetPath(), requested_outputs, pre_caching
+        )
 
     def _disk_cache_path(self, cache_key: str) -> Path:
         assert self._offline_cache_dir is not None
@@ -241,28 +746,16 @@ class InferenceOperator:
         logger.info("Wrote offline cache entry (prim=%s, key=%s)", prim_path, cache_key)
 
     def _sidecar_payload(self, prim: Usd.Prim, requested_outputs: list[str]) -> dict:
-        stage = prim.GetStage()
-        stage_id = UsdUtils.StageCache.Get().GetId(stage).ToLongInt()
-        stage_rt = UsdRT.Stage.Attach(stage_id)
-        app_state: dict[str, str] = {}
-        _API = "RtwtInferenceAppStateAPI"
-        paths = stage_rt.GetPrimsWithAppliedAPIName(_API)
-        if paths:
-            app_state_prim = stage.GetPrimAtPath(str(paths[0]))
-            defn = Usd.SchemaRegistry().FindAppliedAPIPrimDefinition(_API)
-            if app_state_prim and app_state_prim.IsValid() and defn:
-                for name in sorted(defn.GetPropertyNames()):
-                    if not defn.GetAttributeDefinition(name):
-                        continue
-                    app_state[name] = str(app_state_prim.GetAttribute(name).Get())
+        app_state = self._get_app_state(prim) or {}
         return {
             "prim_path": str(prim.GetPath()),
             "requested_outputs": sorted(requested_outputs),
-            "app_state": app_state,
+            "app_state": {name: str(value) for name, value in app_state.items()},
             "created": datetime.now(timezone.utc).isoformat(),
         }
 
     def _store_results_from_arrays(self, prim: Usd.Prim, outputs: dict[str, np.ndarray], requested_outputs: list[str]) -> None:
+        """Publish *outputs* on the result field targets; ``nvdb_*`` outputs must be decoded NanoVDB grids."""
         logger.info("Storing results for %s: %s", prim.GetPath(), requested_outputs)
         prim_watch = cache.PrimWatch(prim, on="delete")
         result_id = str(uuid.uuid1())
@@ -281,9 +774,11 @@ class InferenceOperator:
                 continue
 
             new_key = f"omni.rtwt.inference:{prim.GetPath()}:{output_name}:{hashlib.md5(result_id.encode()).hexdigest()[:8]}"
-            # nvdb array need to be re-interpreted as uint32 so that the data delegate infrastructure
-            # can pass it through.
-            np_array = np_array.view(np.uint32)
+            if output_name.startswith(_NANOVDB_OUTPUT_PREFIX):
+                # nvdb array need to be re-interpreted as uint32 so that the data delegate infrastructure
+                # can pass it through.
+                np_array = np_array.view(np.uint32)
+            # Other outputs (e.g. the per-face surface_* arrays) are served as they are.
             cache.put_ex(new_key, np_array, prims=[prim_watch], force=True)
             if old_key := PredictedFieldDelegate.set_tag(target_prim, new_key):
                 cache.remove(old_key)
@@ -295,28 +790,153 @@ class InferenceOperator:
                 dims = Gf.Vec3i(int(extent_max[0] - extent_min[0] + 1), int(extent_max[1] - extent_min[1] + 1), int(extent_max[2] - extent_min[2] + 1))
                 nvdb_api.CreateDimsAttr().Set(dims)
 
-    def _create_inputs(self, usd_string: str, prim_path: str) -> list[InferInput]:
+    def _extract_inference_params(self, prim: Usd.Prim) -> dict[str, np.ndarray]:
+        """Read the parameters the rtwt model would otherwise extract from the serialised layer.
+
+        Mirrors the server-side extraction: velocity from the inference prim,
+        the model tag from the ``model`` dataset selection target, and the
+        sampling grid from the ``domain`` dataset selection target.
+        """
+        model_prim = usd_utils.get_target_prim(prim, "cae:viz:dataset_selection:model:target")
+        domain_prim = usd_utils.get_target_prim(prim, "cae:viz:dataset_selection:domain:target")
+        return {
+            "STREAM_VELOCITY": np.array(
+                [float(prim.GetAttribute("omni:rtwt:inference:velocity").Get())], dtype=np.float32
+            ),
+            "MODEL_TAG": np.array([str(model_prim.GetAttribute("omni:rtwt:model:tag").Get())], dtype=np.object_),
+            "DOMAIN_ORIGIN": np.array(domain_prim.GetAttribute("cae:vtk:origin").Get(), dtype=np.float32),
+            "DOMAIN_SPACING": np.array(domain_prim.GetAttribute("cae:vtk:spacing").Get(), dtype=np.float32),
+            "DOMAIN_EXTENT_MIN": np.array(domain_prim.GetAttribute("cae:vtk:minExtent").Get(), dtype=np.int32),
+            "DOMAIN_EXTENT_MAX": np.array(domain_prim.GetAttribute("cae:vtk:maxExtent").Get(), dtype=np.int32),
+        }
+
+    def _export_inference_layer(self, prim: Usd.Prim) -> str:
+        """Serialise a layer holding only what the rtwt model reads for *prim*.
+
+        The composed values of the inference prim's velocity and dataset
+        selections, the model tag and the four domain attributes are flattened
+        onto ``over`` specs, so the layer no longer grows with the authored
+        scene.  The text is cached per (stage, prim) and rebuilt when any of
+        those values changes.
+        """
+        model_prim = usd_utils.get_target_prim(prim, "cae:viz:dataset_selection:model:target")
+        domain_prim = usd_utils.get_target_prim(prim, "cae:viz:dataset_selection:domain:target")
+        sources = ((prim, _INFERENCE_PROPERTIES), (model_prim, _MODEL_PROPERTIES), (domain_prim, _DOMAIN_PROPERTIES))
+        values = []
+        for source, names in sources:
+            for name in names:
+                if relationship := source.GetRelationship(name):
+                    values.append((source.GetPath(), name, None, relationship.GetForwardedTargets()))
+                else:
+                    attribute = source.GetAttribute(name)
+                    values.append((source.GetPath(), name, attribute.GetTypeName(), attribute.Get()))
+
+        slot = self._display_slot(prim)
+        cached = self._exported_layers.get(slot)
+        if cached is not None and cached[0] == values:
+            return cached[1]
+
+        layer = Sdf.Layer.CreateAnonymous(".usda")
+        for path, name, type_name, value in values:
+            prim_spec = Sdf.CreatePrimInLayer(layer, path)
+            if type_name is None:
+                Sdf.RelationshipSpec(prim_spec, name, custom=False).targetPathList.explicitItems = value
+            else:
+                Sdf.AttributeSpec(prim_spec, name, type_name).default = value
+        usd_string = layer.ExportToString()
+        self._exported_layers[slot] = (values, usd_string)
+        logger.info("Exported inference layer (prim=%s, %d bytes)", prim.GetPath(), len(usd_string))
+        return usd_string
+
+    def _create_parameter_inputs(
+        self, params: dict[str, np.ndarray], infer_input=InferInput, deadline_s: int | None = None
+    ) -> list[InferInput]:
+        """Build inputs for the parameter-only fast path, which bypasses USD parsing on the server.
+
+        *infer_input* is the ``InferInput`` class of the transport in use (HTTP or gRPC);
+        *deadline_s* overrides ``triton_deadline_s`` for ``DEADLINE_MS``.
+        """
         inputs = []
+        for name, value in params.items():
+            datatype = "BYTES" if value.dtype == np.object_ else np_to_triton_dtype(value.dtype)
+            inputs.append(infer_input(name, list(value.shape), datatype))
+            inputs[-1].set_data_from_numpy(value)
+        return inputs + self._create_common_inputs(infer_input, deadline_s)
 
-        inputs.append(InferInput("USD_LAYER", [1], "BYTES"))
+    def _create_inputs(self, usd_string: str, prim_path: str, infer_input=InferInput) -> list[InferInput]:
+        inputs = []
+
+        inputs.append(infer_input("USD_LAYER", [1], "BYTES"))
         inputs[-1].set_data_from_numpy(np.array([usd_string], dtype=np.object_))
 
-        inputs.append(InferInput("PRIM_PATH", [1], "BYTES"))
+        inputs.append(infer_input("PRIM_PATH", [1], "BYTES"))
         inputs[-1].set_data_from_numpy(np.array([prim_path], dtype=np.object_))
 
-        inputs.append(InferInput("BATCH_SIZE", [1], np_to_triton_dtype(np.int32)))
-        inputs[-1].set_data_from_numpy(np.array([self._triton_batch_size], dtype=np.int32))
+        return inputs + self._create_common_inputs(infer_input)
+
+    def _create_common_inputs(self, infer_input=InferInput, deadline_s: int | None = None) -> list[InferInput]:
+        inputs = []
+        deadline_s = self._triton_deadline if deadline_s is None else deadline_s
+
+        if self._triton_batch_size > 0:
+            inputs.append(infer_input("BATCH_SIZE", [1], np_to_triton_dtype(np.int32)))
+            inputs[-1].set_data_from_numpy(np.array([self._triton_batch_size], dtype=np.int32))
 
-        inputs.append(InferInput("STENCIL_SIZE", [1], np_to_triton_dtype(np.int32)))
+        inputs.append(infer_input("STENCIL_SIZE", [1], np_to_triton_dtype(np.int32)))
         inputs[-1].set_data_from_numpy(np.array([self._triton_stencil_size], dtype=np.int32))
 
+        if deadline_s > 0:
+            inputs.append(infer_input("DEADLINE_MS", [1], np_to_triton_dtype(np.int64)))
+            deadline_ms = int((time.time() + deadline_s) * 1000)
+            inputs[-1].set_data_from_numpy(np.array([deadline_ms], dtype=np.int64))
+
+        if self._sparse_tolerance > 0.0:
+            inputs.append(infer_input("SPARSE_TOLERANCE", [1], np_to_triton_dtype(np.float32)))
+            inputs[-1].set_data_from_numpy(np.array([self._sparse_tolerance], dtype=np.float32))
+
+        if self._precision != "float32":
+            inputs.append(infer_input("PRECISION", [1], "BYTES"))
+            inputs[-1].set_data_from_numpy(np.array([self._precision], dtype=np.object_))
+
+        return inputs
+
+    def _create_slice_inputs(self, slice_plane: tuple[int, float], infer_input=InferInput) -> list[InferInput]:
+        """Build the inputs that restrict inference to *slice_plane* (``SLICE_AXIS`` / ``SLICE_POSITION``)."""
+        axis, position = slice_plane
+        inputs = []
+
+        inputs.append(infer_input("SLICE_AXIS", [1], np_to_triton_dtype(np.int32)))
+        inputs[-1].set_data_from_numpy(np.array([axis], dtype=np.int32))
+
+        inputs.append(infer_input("SLICE_POSITION", [1], np_to_triton_dtype(np.float32)))
+        inputs[-1].set_data_from_numpy(np.array([position], dtype=np.float32))
+
+        inputs.append(infer_input("SLICE_THICKNESS", [1], np_to_triton_dtype(np.int32)))
+        inputs[-1].set_data_from_numpy(np.array([self._slice_thickness], dtype=np.int32))
+
+        return inputs
+
+    def _create_scheduling_inputs(self, pre_caching: bool, infer_input=InferInput) -> list[InferInput]:
+        """Build the ``CLIENT_ID`` / ``PRIORITY`` inputs read by the ``rtwt_progressive`` scheduler.
+
+        ``rtwt`` requests are prioritised by Triton instead (see ``_infer``).
+        """
+        inputs = []
+
+        inputs.append(infer_input("CLIENT_ID", [1], "BYTES"))
+        inputs[-1].set_data_from_numpy(np.array([self._client_id], dtype=np.object_))
+
+        inputs.append(infer_input("PRIORITY", [1], "BYTES"))
+        inputs[-1].set_data_from_numpy(np.array(["precache" if pre_caching else "interactive"], dtype=np.object_))
+
         return inputs
 
-    def _create_outputs(self, requested_outputs: list[str]) -> list[InferRequestedOutput]:
-        return [InferRequestedOutput(name) for name in requested_outputs] + [
-            InferRequestedOutput("EXTENT_MIN"),
-            InferRequestedOutput("EXTENT_MAX"),
-            InferRequestedOutput("ERROR_MESSAGE"),
+    def _create_outputs(
+        self, requested_outputs: list[str], requested_output=InferRequestedOutput, progressive: bool = False
+    ) -> list[InferRequestedOutput]:
+        extra = ["REFINEMENT_FACTOR"] if progressive else []
+        return [
+            requested_output(name) for name in [*requested_outputs, *extra, "EXTENT_MIN", "EXTENT_MAX", "ERROR_MESSAGE"]
         ]
 
 
@@ -0,0 +1,233 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+"""Speculative prefetch of the inference configurations next to the one on screen.
+
+After a configuration is displayed, the next click is almost always one step
+away from it: the adjacent wind speed, or one toggle of spoiler, rims or
+mirrors.  :func:`neighbour_states` lists those states, most likely first, and
+:class:`Prefetcher` runs their inferences in the background into the memory
+cache.  At most ``max_concurrent`` prefetches run at once, completed results
+beyond ``budget_bytes`` are evicted oldest first, and :meth:`Prefetcher.back_off`
+cancels everything the moment an interactive request needs Triton.  Prefetches
+only start while Triton's queue for ``rtwt`` is empty, as read from its
+metrics endpoint by :func:`pending_requests`.
+
+Car toggles change the mesh, so a neighbour's model tag comes from the
+``model`` prim under other variant selections; :class:`ModelTagResolver`
+reads it from a private, masked stage so the live stage is never edited.
+"""
+
+import asyncio
+import re
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from logging import getLogger
+
+import numpy as np
+from pxr import Sdf, Usd
+
+logger = getLogger(__name__)
+
+VELOCITY_ATTR = "omni:rtwt:app_state:velocity"
+# Wind speeds the blueprint supports (the UI slider values); omni.rtwt.controller reads them from here.
+VELOCITIES = tuple(float(v) for v in range(25, 101, 25))
+# App-state toggles, their allowed tokens (see RtwtInferenceAppStateAPI) and the car variant set each selects.
+TOGGLES = {
+    "omni:rtwt:app_state:spoiler": (("On", "Off"), "Spoiler"),
+    "omni:rtwt:app_state:rims": (("Standard", "Aero"), "Rims"),
+    "omni:rtwt:app_state:mirrors": (("On", "Off"), "Mirrors"),
+}
+# Triton's gauge of the requests waiting in a model's queue, one sample per model version.
+_PENDING_REQUESTS = re.compile(r"^nv_inference_pending_request_count\{([^}]*)\}\s+(\S+)", re.MULTILINE)
+
+
+def neighbour_states(app_state: dict[str, object]) -> list[dict[str, object]]:
+    """Return the app states one click away from *app_state*: adjacent velocities first, then single toggles."""
+    states = []
+    velocity = float(app_state.get(VELOCITY_ATTR, VELOCITIES[0]))
+    lower = [v for v in VELOCITIES if v < velocity]
+    higher = [v for v in VELOCITIES if v > velocity]
+    for neighbour in (higher[:1] + lower[-1:]):
+        states.append({**app_state, VELOCITY_ATTR: neighbour})
+    for name, (tokens, _variant_set) in TOGGLES.items():
+        if app_state.get(name) in tokens:
+            states.append({**app_state, name: next(token for token in tokens if token != app_state[name])})
+    return states
+
+
+def pending_requests(metrics: str, model: str) -> int | None:
+    """Return the requests for *model* waiting in Triton's queue, read from its Prometheus *metrics* text.
+
+    Versions are summed; ``None`` if the gauge is not reported for *model*.
+    """
+    counts = [
+        float(value)
+        for labels, value in _PENDING_REQUESTS.findall(metrics)
+        if f'model="{model}"' in labels.split(",")
+    ]
+    return int(sum(counts)) if counts else None
+
+
+class ModelTagResolver:
+    """Model tags of a ``model`` prim under other car variant selections.
+
+    A masked stage over the live stage's root layer composes only the model
+    prim; selections are authored on its own session layer, so nothing is
+    written to the shared root layer.  Tags are memoised per selection.
+    """
+
+    def __init__(self):
+        self._stages: dict[tuple[str, str], Usd.Stage] = {}
+        self._tags: dict[tuple, str | None] = {}
+
+    def resolve(self, model_prim: Usd.Prim, app_state: dict[str, object]) -> str | None:
+        """Return the ``omni:rtwt:model:tag`` of *model_prim* with the variants *app_state* selects."""
+        selections = dict(model_prim.GetVariantSets().GetAllVariantSelections())
+        for name, (_tokens, variant_set) in TOGGLES.items():
+            if name in app_state:
+                selections[variant_set] = str(app_state[name])
+        root_layer = model_prim.GetStage().GetRootLayer()
+        key = (root_layer.identifier, str(model_prim.GetPath()), tuple(sorted(selections.items())))
+        if key in self._tags:
+            return self._tags[key]
+
+        probe = self._stages.get(key[:2])
+        if probe is None:
+            probe = Usd.Stage.OpenMasked(
+                root_layer,
+                Sdf.Layer.CreateAnonymous(".usda"),
+                Usd.StagePopulationMask([model_prim.GetPath()]),
+                load=Usd.Stage.LoadNone,
+            )
+            probe.SetEditTarget(probe.GetSessionLayer())
+            self._stages[key[:2]] = probe
+        prim = probe.GetPrimAtPath(model_prim.GetPath())
+        tag = None
+        if prim:
+            # Selections of nested variant sets are authored too, whether or not their parent variant is selected yet.
+            with Sdf.ChangeBlock():
+                for variant_set, selection in selections.items():
+                    prim.GetVariantSet(variant_set).SetVariantSelection(selection)
+            tag = prim.GetAttribute("omni:rtwt:model:tag").Get()
+        self._tags[key] = None if tag is None else str(tag)
+        return self._tags[key]
+
+
+class Prefetcher:
+    """Background prefetch jobs with bounded concurrency, a memory budget and hit-rate accounting.
+
+    A job is an awaitable factory that stores one configuration's outputs in
+    the memory cache and returns them (``None`` on failure).  *evict* is
+    called with a job's cache key and output names to drop results that no
+    longer fit the budget.  Must be used from Kit's event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        budget_bytes: int,
+        evict: Callable[[str, list[str]], None],
+    ):
+        self._max_concurrent = max(max_concurrent, 1)
+        self._budget_bytes = budget_bytes
+        self._evict = evict
+        self._queue: list[tuple[str, Callable[[], Awaitable[dict[str, np.ndarray] | None]]]] = []
+        self._running: dict[str, asyncio.Task] = {}
+        # Prefetched results not yet used by an interactive request, oldest first: key -> (bytes, output names).
+        self._ready: OrderedDict[str, tuple[int, list[str]]] = OrderedDict()
+        self._ready_bytes = 0
+        self.stats = {"issued": 0, "completed": 0, "failed": 0, "cancelled": 0, "evicted": 0}
+        self._hits = 0
+        self._lookups = 0
+
+    def is_ready(self, key: str) -> bool:
+        """Return whether a prefetched result for *key* is waiting in the memory cache."""
+        return key in self._ready
+
+    def is_running(self, key: str) -> bool:
+        """Return whether a prefetch for *key* is still computing."""
+        return key in self._running
+
+    async def wait(self, key: str) -> dict[str, np.ndarray] | None:
+        """Wait for the running prefetch of *key* and return its outputs (``None`` if it failed or was cancelled).
+
+        Cancelling the caller does not cancel the prefetch.
+        """
+        task = self._running.get(key)
+        if task is None:
+            return None
+        await asyncio.wait({task})
+        if task.cancelled() or task.exception() is not None:
+            return None
+        return task.result()
+
+    def start(self, jobs: list[tuple[str, Callable[[], Awaitable[dict[str, np.ndarray] | None]]]]) -> None:
+        """Replace the queued jobs with *jobs* (most likely first) and start as many as allowed."""
+        self._queue = [(key, job) for key, job in jobs if key not in self._ready and key not in self._running]
+        self._pump()
+
+    def back_off(self, keep: str | None = None) -> None:
+        """Drop queued jobs and cancel running ones, except the one for *keep*."""
+        self._queue.clear()
+        for key, task in list(self._running.items()):
+            if key != keep:
+                task.cancel()
+
+    def record(self, key: str, hit: bool) -> None:
+        """Count an interactive request for *key* that was served by a prefetch (*hit*) or needs Triton.
+
+        Either way a prefetched result for *key* is handed over to the cache
+        and no longer counts against the budget.
+        """
+        self._lookups += 1
+        self._hits += hit
+        if (entry := self._ready.pop(key, None)) is not None:
+            self._ready_bytes -= entry[0]
+        late = " (prefetch still running)" if key in self._running else ""
+        logger.info(
+            "Prefetch %s%s: hit rate %d/%d (%.0f%%), %s, %.1f MB held",
+            "HIT" if hit else "MISS",
+            late,
+            self._hits,
+            self._lookups,
+            100.0 * self._hits / self._lookups,
+            ", ".join(f"{name} {count}" for name, count in self.stats.items()),
+            self._ready_bytes / (1024 * 1024),
+        )
+
+    def _pump(self) -> None:
+        while self._queue and len(self._running) < self._max_concurrent:
+            key, job = self._queue.pop(0)
+            task = asyncio.ensure_future(job())
+            self._running[key] = task
+            self.stats["issued"] += 1
+            task.add_done_callback(lambda task, key=key: self._finished(key, task))
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        del self._running[key]
+        if task.cancelled():
+            self.stats["cancelled"] += 1
+        elif task.exception() is not None or task.result() is None:
+            self.stats["failed"] += 1
+            if task.exception() is not None:
+                logger.warning("Prefetch failed (key=%s): %s", key, task.exception())
+        else:
+            outputs = task.result()
+            nbytes = sum(array.nbytes for array in outputs.values())
+            self._ready[key] = (nbytes, list(outputs))
+            self._ready_bytes += nbytes
+            self.stats["completed"] += 1
+            while self._ready_bytes > self._budget_bytes and self._ready:
+                old_key, (old_bytes, names) = self._ready.popitem(last=False)
+                self._ready_bytes -= old_bytes
+                self._evict(old_key, names)
+                self.stats["evicted"] += 1
+        self._pump()
@@ -0,0 +1,133 @@
+"""Tests for the neighbour enumeration, model tag lookup and scheduling of the Kit prefetcher."""
+
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+Usd = pytest.importorskip("pxr.Usd")
+
+_EXTENSION = Path(__file__).resolve().parents[1]
+_ROOT = _EXTENSION.parents[2]
+_spec = importlib.util.spec_from_file_location("prefetch", _EXTENSION / "python" / "prefetch.py")
+prefetch = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(prefetch)
+
+_VELOCITY = prefetch.VELOCITY_ATTR
+_SPOILER = "omni:rtwt:app_state:spoiler"
+_RIMS = "omni:rtwt:app_state:rims"
+_MIRRORS = "omni:rtwt:app_state:mirrors"
+_STATE = {_VELOCITY: 50.0, _SPOILER: "On", _RIMS: "Standard", _MIRRORS: "On"}
+
+
+def _changes(states: list[dict[str, object]], base: dict[str, object]) -> list[dict[str, object]]:
+    """What each neighbour state changes relative to *base*."""
+    return [{name: value for name, value in state.items() if base.get(name) != value} for state in states]
+
+
+def test_neighbours_are_adjacent_velocities_then_toggles():
+    assert _changes(prefetch.neighbour_states(_STATE), _STATE) == [
+        {_VELOCITY: 75.0},
+        {_VELOCITY: 25.0},
+        {_SPOILER: "Off"},
+        {_RIMS: "Aero"},
+        {_MIRRORS: "Off"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "velocity, neighbours",
+    [(25.0, [50.0]), (100.0, [75.0]), (60.0, [75.0, 50.0]), (10.0, [25.0]), (120.0, [100.0])],
+)
+def test_velocity_neighbours_stop_at_the_slider_range(velocity, neighbours):
+    state = {_VELOCITY: velocity}
+    assert [neighbour[_VELOCITY] for neighbour in prefetch.neighbour_states(state)] == neighbours
+
+
+def test_missing_or_unknown_toggles_have_no_neighbours():
+    # Without a velocity the slider's lowest value is assumed, so only the next one up is a neighbour.
+    state = {_SPOILER: "Maybe", _RIMS: "Aero"}
+    assert _changes(prefetch.neighbour_states(state), state) == [{_VELOCITY: 50.0}, {_RIMS: "Standard"}]
+
+
+def test_pending_requests_are_read_from_triton_metrics():
+    metrics = "\n".join(
+        [
+            "# TYPE nv_inference_pending_request_count gauge",
+            'nv_inference_pending_request_count{model="rtwt",version="1"} 2',
+            'nv_inference_pending_request_count{model="rtwt",version="2"} 1',
+            'nv_inference_pending_request_count{model="rtwt_progressive",version="1"} 5',
+            'nv_inference_queue_duration_us{model="rtwt",version="1"} 1200',
+        ]
+    )
+    assert prefetch.pending_requests(metrics, "rtwt") == 3
+    assert prefetch.pending_requests(metrics, "rtwt_progressive") == 5
+    assert prefetch.pending_requests(metrics, "model") is None
+
+
+def test_waiting_for_a_prefetch_returns_its_outputs_unless_it_was_cancelled():
+    async def run():
+        release = asyncio.Event()
+
+        async def job():
+            await release.wait()
+            return {"velocity": prefetch.np.zeros(4, dtype=prefetch.np.float32)}
+
+        prefetcher = prefetch.Prefetcher(max_concurrent=2, budget_bytes=1024, evict=lambda _key, _names: None)
+        prefetcher.start([("a", job), ("b", job)])
+        assert prefetcher.is_running("a") and not prefetcher.is_ready("a")
+
+        # A cancelled waiter leaves the prefetch running.
+        waiter = asyncio.ensure_future(prefetcher.wait("a"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        assert prefetcher.is_running("a")
+
+        waiters = [asyncio.ensure_future(prefetcher.wait(key)) for key in ("a", "b")]
+        await asyncio.sleep(0)
+        prefetcher.back_off(keep="a")
+        release.set()
+        outputs, cancelled = await asyncio.gather(*waiters)
+        assert list(outputs) == ["velocity"] and cancelled is None
+        assert prefetcher.is_ready("a") and not prefetcher.is_running("a")
+        assert await prefetcher.wait("a") is None
+
+    asyncio.run(run())
+
+
+@pytest.fixture
+def car():
+    stage = Usd.Stage.Open(str(_ROOT / "stages" / "Base.usda"), load=Usd.Stage.LoadNone)
+    yield stage.GetPrimAtPath("/World/CarCFD")  # the stage must outlive the prim handle
+
+
+def test_model_tags_follow_variant_selections_without_editing_the_stage(car):
+    selections = car.GetVariantSets().GetAllVariantSelections()
+    live_tag = car.GetAttribute("omni:rtwt:model:tag").Get()
+    resolver = prefetch.ModelTagResolver()
+
+    assert resolver.resolve(car, _STATE) == live_tag
+    neighbours = prefetch.neighbour_states(_STATE)
+    tags = {
+        next(iter(change.items())): resolver.resolve(car, state)
+        for change, state in zip(_changes(neighbours, _STATE), neighbours)
+    }
+    # Velocity neighbours keep the car; each toggle picks another model.
+    assert tags[(_VELOCITY, 75.0)] == tags[(_VELOCITY, 25.0)] == live_tag
+    toggled = [tags[(_SPOILER, "Off")], tags[(_RIMS, "Aero")], tags[(_MIRRORS, "Off")]]
+    assert all(toggled) and len({live_tag, *toggled}) == 4
+
+    assert car.GetVariantSets().GetAllVariantSelections() == selections
+    assert car.GetAttribute("omni:rtwt:model:tag").Get() == live_tag
+    assert not car.GetStage().GetRootLayer().dirty
+
+
+def test_model_tags_are_memoised_per_selection(car):
+    resolver = prefetch.ModelTagResolver()
+    tag = resolver.resolve(car, {**_STATE, _RIMS: "Aero"})
+    # Velocity does not select a variant, so another velocity maps to the same entry.
+    assert resolver.resolve(car, {**_STATE, _RIMS: "Aero", _VELOCITY: 100.0}) == tag
+    assert len(resolver._tags) == 1 and len(resolver._stages) == 1